@@ -380,7 +380,7 @@ def main():
                     current_prices = {}
                 
                 # Update portfolio value
-                portfolio_value = paper_trader.get_portfolio_value(current_prices)
+                portfolio_value = paper_trader.mark_to_market(current_prices)
                 paper_trader.current_capital = portfolio_value
                 
                 # Display paper trading performance
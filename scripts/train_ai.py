@@ -324,6 +324,16 @@ class AIHistoricalTrainer:
         self.predictive_model.save_model(model_file)
         logger.info(f"  ✓ Model saved to {model_file}")
         
+        # Save the consolidated state the strategy restores from
+        from src.ai_modules.state_store import AI_STATE_FILE, write_ai_state
+        state_file = os.path.join(data_dir, AI_STATE_FILE)
+        write_ai_state(state_file, {
+            'patterns': self.pattern_recognizer.get_state(),
+            'sentiment': self.sentiment_analyzer.get_state(),
+            'model': self.predictive_model.get_state()
+        })
+        logger.info(f"  ✓ AI state saved to {state_file}")
+        
         # Save training stats
         stats_file = os.path.join(data_dir, 'training_stats.json')
         with open(stats_file, 'w') as f:
@@ -15,6 +15,62 @@ import json
 import os
 
 
+# Candlestick patterns scored by score_candlestick_patterns, bullish first
+PATTERN_NAMES = (
+    'hammer', 'bullish_engulfing', 'morning_star',
+    'shooting_star', 'bearish_engulfing', 'evening_star'
+)
+PATTERN_CONFIDENCE = np.array([0.7, 0.8, 0.85, 0.7, 0.8, 0.85])
+
+
+def score_candlestick_patterns(ohlc: np.ndarray) -> np.ndarray:
+    """
+    Vectorized candlestick pattern detection for many symbols at once.
+    
+    Applies the same rules as the PatternRecognizer._is_* checks using
+    array masks, so N symbols cost one pass instead of N Python loops.
+    
+    Args:
+        ohlc: Array of shape (N, 3, 4) with the last three candles per
+            symbol (oldest first) as open, high, low, close
+    
+    Returns:
+        (N, 6) array of confidence scores in PATTERN_NAMES order
+        (0 where the pattern is not present)
+    """
+    o = ohlc[..., 0]
+    h = ohlc[..., 1]
+    l = ohlc[..., 2]
+    c = ohlc[..., 3]
+    
+    body = np.abs(c - o)
+    upper_shadow = h - np.maximum(o, c)
+    lower_shadow = np.minimum(o, c) - l
+    bullish = c > o
+    bearish = c < o
+    
+    # Single-candle patterns on the current candle
+    cur_body = body[:, 2]
+    hammer = (lower_shadow[:, 2] > 2 * cur_body) & (upper_shadow[:, 2] < cur_body * 0.3) & (cur_body > 0)
+    shooting_star = (upper_shadow[:, 2] > 2 * cur_body) & (lower_shadow[:, 2] < cur_body * 0.3) & (cur_body > 0)
+    
+    # Engulfing: current vs previous candle
+    bullish_engulfing = bearish[:, 1] & bullish[:, 2] & (o[:, 2] < c[:, 1]) & (c[:, 2] > o[:, 1])
+    bearish_engulfing = bullish[:, 1] & bearish[:, 2] & (o[:, 2] > c[:, 1]) & (c[:, 2] < o[:, 1])
+    
+    # Stars: three-candle reversals
+    second_small = body[:, 1] < body[:, 0] * 0.3
+    first_mid = (o[:, 0] + c[:, 0]) / 2
+    morning_star = bearish[:, 0] & second_small & bullish[:, 2] & (c[:, 2] > first_mid)
+    evening_star = bullish[:, 0] & second_small & bearish[:, 2] & (c[:, 2] < first_mid)
+    
+    hits = np.stack(
+        [hammer, bullish_engulfing, morning_star, shooting_star, bearish_engulfing, evening_star],
+        axis=1
+    )
+    return hits * PATTERN_CONFIDENCE
+
+
 class PatternRecognizer:
     """
     AI-powered pattern recognition for technical analysis.
@@ -76,7 +132,7 @@ class PatternRecognizer:
         if symbol not in self.price_history or len(self.price_history[symbol]) < 3:
             return {}
         
-        history = list(self.price_history[symbol])
+        history = self.price_history[symbol]  # deque: end indexing is O(1)
         patterns = {}
         
         # Get last 3 candles
@@ -114,6 +170,21 @@ class PatternRecognizer:
         
         return patterns
     
+    def get_recent_ohlc(self, symbol: str) -> Optional[np.ndarray]:
+        """
+        Last three candles as a (3, 4) open/high/low/close array (oldest first).
+        
+        Returns:
+            Array for score_candlestick_patterns, or None with < 3 candles
+        """
+        history = self.price_history.get(symbol)
+        if not history or len(history) < 3:
+            return None
+        return np.array([
+            [candle['open'], candle['high'], candle['low'], candle['close']]
+            for candle in (history[-3], history[-2], history[-1])
+        ])
+    
     def _is_hammer(self, candle: Dict) -> bool:
         """Check if candle is a hammer pattern."""
         body = abs(candle['close'] - candle['open'])
@@ -353,6 +424,18 @@ class PatternRecognizer:
             return self.pattern_success_rates[pattern_type]['rate']
         return 0.5  # Default 50% confidence for unknown patterns
     
+    def get_state(self) -> Dict:
+        """Copy of the learned pattern statistics, safe to persist off-thread."""
+        return {
+            'pattern_success_rates': {
+                pattern: dict(stats) for pattern, stats in self.pattern_success_rates.items()
+            }
+        }
+    
+    def set_state(self, state: Dict):
+        """Restore learned pattern statistics from get_state()."""
+        self.pattern_success_rates = state.get('pattern_success_rates', {})
+    
     def save_patterns(self, filepath: str):
         """Save learned patterns to file."""
         try:
@@ -460,6 +460,18 @@ class PredictiveModel:
         
         return 1.0
     
+    def get_state(self) -> Dict:
+        """Copy of model parameters and accuracy stats, safe to persist off-thread."""
+        return {
+            'model_params': {symbol: dict(params) for symbol, params in self.model_params.items()},
+            'accuracy_stats': dict(self.accuracy_stats)
+        }
+    
+    def set_state(self, state: Dict):
+        """Restore model parameters and accuracy stats from get_state()."""
+        self.model_params = state.get('model_params', {})
+        self.accuracy_stats = state.get('accuracy_stats', self.accuracy_stats)
+    
     def save_model(self, filepath: str):
         """Save model parameters and predictions."""
         try:
@@ -353,6 +353,19 @@ class SentimentAnalyzer:
         
         return 1.0
     
+    def get_state(self) -> Dict:
+        """Copy of the sentiment history, safe to persist off-thread."""
+        return {
+            'sentiment_history': {
+                symbol: list(history) for symbol, history in self.sentiment_history.items()
+            }
+        }
+    
+    def set_state(self, state: Dict):
+        """Restore sentiment history from get_state()."""
+        for symbol, history in state.get('sentiment_history', {}).items():
+            self.sentiment_history[symbol] = deque(history, maxlen=20)
+    
     def save_sentiment_data(self, filepath: str):
         """Save sentiment history to file."""
         try:
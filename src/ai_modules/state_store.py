@@ -0,0 +1,33 @@
+"""
+AI State Store
+
+Consolidated on-disk AI state shared by the live strategy and the
+historical trainer, so both write the file the strategy restores from.
+"""
+import os
+import pickle
+from typing import Dict
+
+
+# Consolidated AI state file inside the AI data directory
+AI_STATE_FILE = 'ai_state.pkl'
+
+# Write buffer for the AI state pickle
+AI_STATE_BUFFER = 128 * 1024
+
+
+def write_ai_state(path: str, state: Dict):
+    """
+    Atomically pickle an AI state snapshot and fsync it.
+    
+    Args:
+        path: Destination file (normally <ai_data_dir>/ai_state.pkl)
+        state: Dict with 'patterns', 'sentiment' and 'model' parts, each
+            from the module's get_state()
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb', buffering=AI_STATE_BUFFER) as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -62,6 +62,7 @@ class TradingPsychologyGuard:
         self.daily_trades = 0
         self.daily_start_capital = 0
         self.current_capital = 0
+        self._daily_pnl_pct = 0.0  # Cached; refreshed whenever capital changes
         
         # Track consecutive results
         self.consecutive_wins = 0
@@ -89,6 +90,7 @@ class TradingPsychologyGuard:
         self.daily_trades = 0
         self.daily_start_capital = starting_capital
         self.current_capital = starting_capital
+        self._daily_pnl_pct = 0.0
         self.consecutive_wins = 0
         self.consecutive_losses = 0
         self.recent_trades.clear()
@@ -102,6 +104,10 @@ class TradingPsychologyGuard:
     def update_capital(self, new_capital: float):
         """Update current capital after trades."""
         self.current_capital = new_capital
+        self._daily_pnl_pct = (
+            (new_capital - self.daily_start_capital) / self.daily_start_capital
+            if self.daily_start_capital > 0 else 0.0
+        )
     
     def should_allow_trade(self, symbol: str, signal: str, 
                           ai_confidence: float) -> Dict[str, any]:
@@ -146,16 +152,14 @@ class TradingPsychologyGuard:
                 }
         
         # 4. Check daily drawdown (prevents catastrophic losses)
-        if self.daily_start_capital > 0:
-            daily_pnl_pct = (self.current_capital - self.daily_start_capital) / self.daily_start_capital
-            if daily_pnl_pct < -self.max_drawdown_pct:
-                self.current_state = EmotionalState.FEARFUL
-                return {
-                    'allowed': False,
-                    'reason': f"Max daily drawdown reached ({daily_pnl_pct:.2%}). Stopping to preserve capital.",
-                    'adjustment': 0.0,
-                    'emotional_state': self.current_state.value
-                }
+        if self._daily_pnl_pct < -self.max_drawdown_pct:
+            self.current_state = EmotionalState.FEARFUL
+            return {
+                'allowed': False,
+                'reason': f"Max daily drawdown reached ({self._daily_pnl_pct:.2%}). Stopping to preserve capital.",
+                'adjustment': 0.0,
+                'emotional_state': self.current_state.value
+            }
         
         # 5. FOMO prevention - signal must persist
         signal_key = f"{symbol}_{signal}"
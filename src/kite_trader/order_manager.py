@@ -7,17 +7,32 @@ Features:
 - Execution confirmation
 - Order history and failure tracking
 """
+import sys
 import time
+import asyncio
 import logging
-from typing import Dict, Optional, List
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, Optional, List, Tuple, ValuesView
 from datetime import datetime
 from enum import Enum
 
 from ..utils.error_handler import (
     OrderError, OrderRejectedError, OrderTimeoutError,
-    retry_with_backoff
+    retry_with_backoff, classify_error
 )
 
+# Placement retry budget (previously enforced by @retry_with_backoff)
+PLACE_ORDER_MAX_RETRIES = 2
+PLACE_ORDER_INITIAL_DELAY = 0.5
+
+# Interned broker status strings; statuses are interned at ingest in
+# _get_order_status so comparisons reduce to identity checks
+_COMPLETE = sys.intern('COMPLETE')
+_UNKNOWN = sys.intern('UNKNOWN')
+_TERMINAL_FAILURE_STATUSES = (sys.intern('REJECTED'), sys.intern('CANCELLED'))
+_PENDING_STATUSES = (sys.intern('PENDING'), sys.intern('OPEN'), sys.intern('TRIGGER PENDING'))
+
 
 class OrderStatus(Enum):
     """Order status enumeration."""
@@ -65,10 +80,11 @@ class OrderManager:
         
         # Order tracking
         self.active_orders: Dict[str, Dict] = {}  # order_id -> order_info
-        self.order_history: List[Dict] = []
-        self.failed_orders: List[Dict] = []
+        # Bounded so long-running sessions don't grow memory without limit
+        self.order_history: Deque[Dict] = deque(maxlen=10_000)
+        self.failed_orders: Deque[Dict] = deque(maxlen=1000)
     
-    def place_and_verify_order(
+    async def place_and_verify_order(
         self,
         symbol: str,
         transaction_type: str,
@@ -81,6 +97,11 @@ class OrderManager:
         """
         Place order and verify execution.
         
+        Coroutine: broker calls run in the default executor and waits use
+        asyncio.sleep, so orders gathered on one loop (as
+        KiteTrader.place_orders does) are placed and verified concurrently.
+        Synchronous callers outside a running loop can use asyncio.run().
+        
         Args:
             symbol: Trading symbol
             transaction_type: BUY or SELL
@@ -101,6 +122,7 @@ class OrderManager:
             }
         
         Raises:
+            OrderError: If the order could not be placed within the retry budget
             OrderRejectedError: If order is rejected
             OrderTimeoutError: If order doesn't complete within timeout
         """
@@ -109,14 +131,35 @@ class OrderManager:
             f"{quantity} {symbol} @ {price or 'MARKET'}"
         )
         
-        # Place order
-        order_id = self._place_order(
-            symbol, transaction_type, quantity,
-            order_type, product, price, trigger_price
-        )
+        # Place order, retrying transient failures with exponential backoff
+        loop = asyncio.get_running_loop()
+        delay = PLACE_ORDER_INITIAL_DELAY
+        for attempt in range(PLACE_ORDER_MAX_RETRIES + 1):
+            order_id, error = await loop.run_in_executor(
+                None, self._place_order,
+                symbol, transaction_type, quantity,
+                order_type, product, price, trigger_price
+            )
+            if order_id or error is None:
+                break
+            
+            is_retryable, error_category = classify_error(error)
+            if not is_retryable or attempt == PLACE_ORDER_MAX_RETRIES:
+                self.logger.error(
+                    f"Giving up placing order for {symbol} "
+                    f"({error_category}) after {attempt + 1} attempt(s): {error}"
+                )
+                break
+            
+            self.logger.warning(
+                f"Order placement failed (attempt {attempt + 1}/{PLACE_ORDER_MAX_RETRIES + 1}), "
+                f"retrying in {delay:.1f}s. Error: {error}"
+            )
+            await asyncio.sleep(delay)
+            delay *= 2
         
         if not order_id:
-            raise OrderError(f"Failed to place order for {symbol}")
+            raise OrderError(f"Failed to place order for {symbol}: {error}")
         
         # Track order
         order_info = {
@@ -134,7 +177,7 @@ class OrderManager:
         
         # Wait for order completion
         try:
-            result = self._wait_for_order_completion(order_id)
+            result = await self._wait_for_order_completion(order_id)
             self.order_history.append({**order_info, **result})
             return result
         
@@ -154,7 +197,6 @@ class OrderManager:
             if order_id in self.active_orders:
                 del self.active_orders[order_id]
     
-    @retry_with_backoff(max_retries=2, initial_delay=0.5)
     def _place_order(
         self,
         symbol: str,
@@ -164,8 +206,14 @@ class OrderManager:
         product: str,
         price: Optional[float],
         trigger_price: Optional[float]
-    ) -> Optional[str]:
-        """Place order with retry logic - calls Kite API directly."""
+    ) -> Tuple[Optional[str], Optional[Exception]]:
+        """
+        Place a single order - calls Kite API directly.
+        
+        Returns:
+            (order_id, None) on success or (None, error) on failure; retries
+            are decided by the caller.
+        """
         try:
             # Call Kite API directly to avoid circular dependency
             order_params = {
@@ -187,15 +235,18 @@ class OrderManager:
             # Use the underlying kite connection directly
             order_id = self.kite.kite.place_order(**order_params)
             self.logger.info(f"Order placed via API: {order_id}")
-            return order_id
+            return order_id, None
         except Exception as e:
             self.logger.error(f"Error placing order: {e}")
-            raise
+            return None, e
     
-    def _wait_for_order_completion(self, order_id: str) -> Dict:
+    async def _wait_for_order_completion(self, order_id: str) -> Dict:
         """
         Poll order status until completion or timeout.
         
+        The blocking broker call runs in the default executor and the wait
+        between polls uses asyncio.sleep, so no thread is pinned per order.
+        
         Returns:
             Order result dict
         
@@ -203,6 +254,7 @@ class OrderManager:
             OrderTimeoutError: If order doesn't complete
             OrderRejectedError: If order is rejected
         """
+        loop = asyncio.get_running_loop()
         start_time = time.time()
         attempts = 0
         
@@ -214,17 +266,19 @@ class OrderManager:
                 )
             
             # Get order status
-            order_status = self._get_order_status(order_id)
+            order_status = await loop.run_in_executor(
+                None, self._get_order_status, order_id
+            )
             
             if not order_status:
                 attempts += 1
-                time.sleep(self.poll_interval)
+                await asyncio.sleep(self.poll_interval)
                 continue
             
-            status = order_status.get('status', 'UNKNOWN')
+            status = order_status.get('status', _UNKNOWN)
             
             # Order complete
-            if status == 'COMPLETE':
+            if status is _COMPLETE:
                 self.logger.info(
                     f"Order {order_id} completed: "
                     f"{order_status.get('filled_quantity', 0)} @ "
@@ -239,22 +293,22 @@ class OrderManager:
                 }
             
             # Order rejected
-            elif status in ['REJECTED', 'CANCELLED']:
+            elif status in _TERMINAL_FAILURE_STATUSES:
                 error_msg = order_status.get('status_message', 'Unknown reason')
                 raise OrderRejectedError(
                     f"Order {order_id} {status}: {error_msg}"
                 )
             
             # Order still pending/open
-            elif status in ['PENDING', 'OPEN', 'TRIGGER PENDING']:
+            elif status in _PENDING_STATUSES:
                 self.logger.debug(f"Order {order_id} status: {status}")
                 attempts += 1
-                time.sleep(self.poll_interval)
+                await asyncio.sleep(self.poll_interval)
             
             else:
                 self.logger.warning(f"Unknown order status: {status}")
                 attempts += 1
-                time.sleep(self.poll_interval)
+                await asyncio.sleep(self.poll_interval)
         
         # Max attempts reached
         raise OrderTimeoutError(
@@ -274,6 +328,7 @@ class OrderManager:
             orders = self.kite.kite.orders()
             for order in orders:
                 if order.get('order_id') == order_id:
+                    order['status'] = sys.intern(order.get('status') or _UNKNOWN)
                     return order
             
             self.logger.warning(f"Order {order_id} not found in orders list")
@@ -302,9 +357,15 @@ class OrderManager:
             self.logger.error(f"Failed to cancel order {order_id}: {e}")
             return False
     
-    def get_active_orders(self) -> List[Dict]:
-        """Get list of currently active orders."""
-        return list(self.active_orders.values())
+    def get_active_orders(self) -> ValuesView[Dict]:
+        """
+        Get a live view of currently active orders.
+        
+        The view is not copied, so it reflects orders being added or removed
+        while iterating. Call list(...) on the result if a stable snapshot
+        is needed.
+        """
+        return self.active_orders.values()
     
     def get_order_history(self, limit: int = 50) -> List[Dict]:
         """
@@ -316,11 +377,12 @@ class OrderManager:
         Returns:
             List of recent orders
         """
-        return self.order_history[-limit:]
+        start = max(0, len(self.order_history) - limit)
+        return list(islice(self.order_history, start, None))
     
     def get_failed_orders(self) -> List[Dict]:
         """Get list of failed orders."""
-        return self.failed_orders
+        return list(self.failed_orders)
     
     def get_stats(self) -> Dict:
         """
@@ -5,12 +5,37 @@ Ensures tracked positions match broker's actual positions.
 Detects and alerts on discrepancies.
 """
 import logging
-from typing import Dict, List, Tuple
+from collections import deque
+from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
 from ..utils.error_handler import PositionMismatchError, retry_with_backoff
 
 
+CRITICAL_DISCREPANCY_TYPES = ('QUANTITY_MISMATCH', 'MISSING_IN_BROKER', 'MISSING_IN_SYSTEM')
+
+
+@dataclass(slots=True)
+class Discrepancy:
+    """A single mismatch between tracked and broker positions."""
+    symbol: str
+    type: str
+    tracked_quantity: int = 0
+    broker_quantity: int = 0
+    tracked_price: float = 0.0
+    broker_price: float = 0.0
+    difference: int = 0
+    difference_pct: float = 0.0
+    timestamp: str = ''
+    
+    def to_dict(self) -> Dict:
+        """Convert to a plain dict for results and serialization."""
+        return asdict(self)
+
+
 class PositionReconciler:
     """
     Reconciles positions between trading system and broker.
@@ -22,22 +47,41 @@ class PositionReconciler:
     - Realized P&L tracking
     """
     
-    def __init__(self, kite_trader, tolerance: float = 0.01):
+    def __init__(self, kite_trader, tolerance: float = 0.01,
+                 cross_check_orders: bool = False,
+                 positions_provider: Optional[Callable[[], List[Dict]]] = None):
         """
         Initialize position reconciler.
         
         Args:
             kite_trader: KiteTrader instance
             tolerance: Price tolerance for matching (1% default)
+            cross_check_orders: Also fetch orders and holdings (concurrently
+                with positions) and include them in the result
+            positions_provider: Callable returning net broker positions; lets
+                the reconciler share an existing snapshot instead of calling
+                get_positions() itself
         """
         self.kite = kite_trader
         self.tolerance = tolerance
+        self.cross_check_orders = cross_check_orders
+        self.positions_provider = positions_provider
         self.logger = logging.getLogger(__name__)
         
         # Tracking
         self.last_sync_time = None
-        self.discrepancies_found = []
+        self.discrepancies_found = deque(maxlen=1000)  # Bounded history
+        
+        # Broker payload fingerprint -> (symbol index, quantity signature);
+        # reused while the broker reports the same positions between syncs
+        self._broker_dict_cache: Tuple[int, Dict[str, Dict], frozenset] = (0, {}, frozenset())
         self.sync_count = 0
+        
+        # Adaptive polling: callers should wait next_interval seconds before
+        # the next reconcile. Shrinks on discrepancies/activity, grows when quiet.
+        self.next_interval: float = 5.0
+        self.min_interval = 1.0
+        self.max_interval = 60.0
     
     @retry_with_backoff(max_retries=2)
     def reconcile_positions(self, tracked_positions: Dict[str, Dict]) -> Dict:
@@ -66,12 +110,19 @@ class PositionReconciler:
             }
         """
         self.logger.info("Starting position reconciliation...")
+        # One timestamp shared by every discrepancy from this reconcile cycle
+        now_iso = datetime.now().isoformat()
         
-        # Fetch broker positions
-        broker_positions = self._fetch_broker_positions()
+        # Fetch broker positions (plus orders/holdings when cross-checking)
+        broker_orders, broker_holdings = None, None
+        if self.cross_check_orders:
+            broker_positions, broker_orders, broker_holdings = self._fetch_broker_state()
+        else:
+            broker_positions = self._fetch_broker_positions()
         
         if not broker_positions:
             self.logger.warning("No broker positions fetched, skipping reconciliation")
+            self._adjust_interval(has_discrepancies=False)
             return {
                 'status': 'SKIPPED',
                 'matched': 0,
@@ -81,98 +132,115 @@ class PositionReconciler:
             }
         
         # Convert broker positions to dict for easy lookup
-        broker_pos_dict = {
-            pos['tradingsymbol']: pos 
-            for pos in broker_positions 
-            if pos.get('quantity', 0) != 0
-        }
+        broker_pos_dict, broker_sig = self._index_broker_positions(broker_positions)
         
-        # Find discrepancies
-        discrepancies = []
-        matched_count = 0
+        # Steady state: identical (symbol, quantity) sets on both sides means
+        # nothing is missing and quantities agree, so only prices need checking
+        tracked_sig = frozenset(
+            (symbol, pos.get('quantity', 0)) for symbol, pos in tracked_positions.items()
+        )
+        quantities_match = tracked_sig == broker_sig
         
-        # Check tracked positions exist in broker
-        for symbol, tracked_pos in tracked_positions.items():
-            broker_pos = broker_pos_dict.get(symbol)
-            
-            if not broker_pos:
-                # Position exists in system but not in broker
-                discrepancy = {
-                    'symbol': symbol,
-                    'type': 'MISSING_IN_BROKER',
-                    'tracked_quantity': tracked_pos.get('quantity', 0),
-                    'broker_quantity': 0,
-                    'tracked_price': tracked_pos.get('average_price', 0),
-                    'broker_price': 0,
-                    'timestamp': datetime.now().isoformat()
-                }
-                discrepancies.append(discrepancy)
-                self.logger.error(
-                    f"Position mismatch: {symbol} exists in system ({tracked_pos['quantity']}) "
-                    f"but not in broker"
-                )
-                continue
-            
-            # Compare quantities
-            tracked_qty = tracked_pos.get('quantity', 0)
-            broker_qty = broker_pos.get('quantity', 0)
+        # Partition symbols in one pass of set operations
+        tracked_syms = tracked_positions.keys()
+        if quantities_match:
+            missing_in_broker = missing_in_system = ()
+            common = tracked_syms
+        else:
+            broker_syms = broker_pos_dict.keys()
+            missing_in_broker = tracked_syms - broker_syms
+            missing_in_system = broker_syms - tracked_syms
+            common = tracked_syms & broker_syms
+        
+        # Positions that exist in system but not in broker
+        discrepancies = [
+            Discrepancy(
+                symbol=symbol,
+                type='MISSING_IN_BROKER',
+                tracked_quantity=tracked_positions[symbol].get('quantity', 0),
+                tracked_price=tracked_positions[symbol].get('average_price', 0),
+                timestamp=now_iso
+            )
+            for symbol in missing_in_broker
+        ]
+        for disc in discrepancies:
+            self.logger.error(
+                "Position mismatch: %s exists in system (%s) but not in broker",
+                disc.symbol, disc.tracked_quantity
+            )
+        
+        # Compare quantity, then average price, for symbols on both sides
+        matched_count = 0
+        debug_on = self.logger.isEnabledFor(logging.DEBUG)
+        for symbol in common:
+            tracked_pos = tracked_positions[symbol]
+            broker_pos = broker_pos_dict[symbol]
             
-            if tracked_qty != broker_qty:
-                discrepancy = {
-                    'symbol': symbol,
-                    'type': 'QUANTITY_MISMATCH',
-                    'tracked_quantity': tracked_qty,
-                    'broker_quantity': broker_qty,
-                    'difference': broker_qty - tracked_qty,
-                    'timestamp': datetime.now().isoformat()
-                }
-                discrepancies.append(discrepancy)
-                self.logger.error(
-                    f"Quantity mismatch: {symbol} - "
-                    f"tracked: {tracked_qty}, broker: {broker_qty}"
-                )
-                continue
+            if not quantities_match:
+                tracked_qty = tracked_pos.get('quantity', 0)
+                broker_qty = broker_pos.get('quantity', 0)
+                
+                if tracked_qty != broker_qty:
+                    discrepancies.append(Discrepancy(
+                        symbol=symbol,
+                        type='QUANTITY_MISMATCH',
+                        tracked_quantity=tracked_qty,
+                        broker_quantity=broker_qty,
+                        difference=broker_qty - tracked_qty,
+                        timestamp=now_iso
+                    ))
+                    self.logger.error(
+                        "Quantity mismatch: %s - tracked: %s, broker: %s",
+                        symbol, tracked_qty, broker_qty
+                    )
+                    continue
             
-            # Compare average prices (with tolerance)
             tracked_price = tracked_pos.get('average_price', 0)
             broker_price = broker_pos.get('average_price', 0)
             
+            # Unknown average price (e.g. freshly opened position): the
+            # quantity already matched and there is no price to compare
+            if tracked_price <= 0 or broker_price <= 0:
+                matched_count += 1
+                continue
+            
             if not self._prices_match(tracked_price, broker_price):
-                discrepancy = {
-                    'symbol': symbol,
-                    'type': 'PRICE_MISMATCH',
-                    'tracked_price': tracked_price,
-                    'broker_price': broker_price,
-                    'difference_pct': ((broker_price - tracked_price) / tracked_price * 100) if tracked_price > 0 else 0,
-                    'timestamp': datetime.now().isoformat()
-                }
-                discrepancies.append(discrepancy)
+                discrepancies.append(Discrepancy(
+                    symbol=symbol,
+                    type='PRICE_MISMATCH',
+                    tracked_price=tracked_price,
+                    broker_price=broker_price,
+                    difference_pct=(broker_price - tracked_price) / tracked_price * 100,
+                    timestamp=now_iso
+                ))
                 self.logger.warning(
-                    f"Price mismatch: {symbol} - "
-                    f"tracked: ₹{tracked_price:.2f}, broker: ₹{broker_price:.2f}"
+                    "Price mismatch: %s - tracked: ₹%.2f, broker: ₹%.2f",
+                    symbol, tracked_price, broker_price
                 )
                 continue
             
             # Positions match
             matched_count += 1
-            self.logger.debug(f"Position matched: {symbol}")
+            if debug_on:
+                self.logger.debug("Position matched: %s", symbol)
         
-        # Check for positions in broker but not in system
-        for symbol, broker_pos in broker_pos_dict.items():
-            if symbol not in tracked_positions:
-                discrepancy = {
-                    'symbol': symbol,
-                    'type': 'MISSING_IN_SYSTEM',
-                    'tracked_quantity': 0,
-                    'broker_quantity': broker_pos.get('quantity', 0),
-                    'broker_price': broker_pos.get('average_price', 0),
-                    'timestamp': datetime.now().isoformat()
-                }
-                discrepancies.append(discrepancy)
-                self.logger.error(
-                    f"Position mismatch: {symbol} exists in broker ({broker_pos['quantity']}) "
-                    f"but not in system"
-                )
+        # Positions that exist in broker but not in system
+        system_missing = [
+            Discrepancy(
+                symbol=symbol,
+                type='MISSING_IN_SYSTEM',
+                broker_quantity=broker_pos_dict[symbol].get('quantity', 0),
+                broker_price=broker_pos_dict[symbol].get('average_price', 0),
+                timestamp=now_iso
+            )
+            for symbol in missing_in_system
+        ]
+        for disc in system_missing:
+            self.logger.error(
+                "Position mismatch: %s exists in broker (%s) but not in system",
+                disc.symbol, disc.broker_quantity
+            )
+        discrepancies.extend(system_missing)
         
         # Store discrepancies
         if discrepancies:
@@ -186,10 +254,13 @@ class PositionReconciler:
             'status': 'OK' if not discrepancies else 'MISMATCH',
             'matched': matched_count,
             'mismatched': len(discrepancies),
-            'discrepancies': discrepancies,
+            'discrepancies': [disc.to_dict() for disc in discrepancies],
             'broker_positions': broker_positions,
             'sync_time': self.last_sync_time.isoformat()
         }
+        if self.cross_check_orders:
+            result['broker_orders'] = broker_orders
+            result['broker_holdings'] = broker_holdings
         
         # Log summary and determine if trading should halt
         should_halt = False
@@ -197,9 +268,10 @@ class PositionReconciler:
         
         if discrepancies:
             # Check for critical discrepancies that require halting
-            for disc in discrepancies:
-                if disc['type'] in ['QUANTITY_MISMATCH', 'MISSING_IN_BROKER', 'MISSING_IN_SYSTEM']:
-                    critical_discrepancies.append(disc)
+            critical_discrepancies = [
+                disc for disc in result['discrepancies']
+                if disc['type'] in CRITICAL_DISCREPANCY_TYPES
+            ]
             
             if critical_discrepancies:
                 should_halt = True
@@ -223,11 +295,25 @@ class PositionReconciler:
         
         result['should_halt'] = should_halt
         result['critical_discrepancies'] = critical_discrepancies
+        self._adjust_interval(has_discrepancies=bool(discrepancies))
         return result
     
+    def _adjust_interval(self, has_discrepancies: bool):
+        """Halve the polling interval after discrepancies, back off by 1.5x otherwise."""
+        if has_discrepancies:
+            self.next_interval = max(self.min_interval, self.next_interval / 2)
+        else:
+            self.next_interval = min(self.max_interval, self.next_interval * 1.5)
+    
+    def notify_activity(self):
+        """Signal trading activity (e.g. an order was placed) so the next sync runs soon."""
+        self.next_interval = self.min_interval
+    
     def _fetch_broker_positions(self) -> List[Dict]:
         """Fetch current positions from broker."""
         try:
+            if self.positions_provider:
+                return self.positions_provider()
             positions = self.kite.get_positions()
             # Return net positions (day + overnight)
             return positions.get('net', [])
@@ -235,6 +321,47 @@ class PositionReconciler:
             self.logger.error(f"Error fetching broker positions: {e}")
             return []
     
+    def _index_broker_positions(self, broker_positions: List[Dict]) -> Tuple[Dict[str, Dict], frozenset]:
+        """
+        Build the symbol -> position index and (symbol, quantity) signature.
+        
+        Both are cached against a fingerprint of the fields reconciliation
+        reads, so an unchanged broker payload skips the rebuild.
+        """
+        fingerprint = hash(tuple(
+            (pos['tradingsymbol'], pos.get('quantity', 0), pos.get('average_price', 0))
+            for pos in broker_positions
+        ))
+        cached_fingerprint, cached_dict, cached_sig = self._broker_dict_cache
+        if fingerprint == cached_fingerprint and cached_dict:
+            return cached_dict, cached_sig
+        
+        broker_pos_dict = {
+            pos['tradingsymbol']: pos 
+            for pos in broker_positions 
+            if pos.get('quantity', 0) != 0
+        }
+        broker_sig = frozenset(
+            (symbol, pos.get('quantity', 0)) for symbol, pos in broker_pos_dict.items()
+        )
+        self._broker_dict_cache = (fingerprint, broker_pos_dict, broker_sig)
+        return broker_pos_dict, broker_sig
+    
+    def _fetch_broker_state(self) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """
+        Fetch positions, orders and holdings from broker concurrently.
+        
+        Wall time is roughly that of the slowest call rather than the sum.
+        
+        Returns:
+            (net positions, orders, holdings)
+        """
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            f_pos = executor.submit(self._fetch_broker_positions)
+            f_ord = executor.submit(self.kite.get_orders)
+            f_hold = executor.submit(self.kite.get_holdings)
+            return f_pos.result(), f_ord.result(), f_hold.result()
+    
     def _prices_match(self, price1: float, price2: float) -> bool:
         """
         Check if two prices match within tolerance.
@@ -246,11 +373,9 @@ class PositionReconciler:
         Returns:
             True if prices match within tolerance
         """
-        if price1 == 0 or price2 == 0:
-            return price1 == price2
-        
-        diff_pct = abs(price1 - price2) / price1
-        return diff_pct <= self.tolerance
+        # Multiplicative bound: no division, and a zero price only
+        # matches another zero price
+        return abs(price1 - price2) <= self.tolerance * abs(price1)
     
     def get_stats(self) -> Dict:
         """Get reconciliation statistics."""
@@ -258,7 +383,11 @@ class PositionReconciler:
             'total_syncs': self.sync_count,
             'last_sync': self.last_sync_time.isoformat() if self.last_sync_time else None,
             'total_discrepancies': len(self.discrepancies_found),
-            'recent_discrepancies': self.discrepancies_found[-10:] if self.discrepancies_found else []
+            'next_interval': self.next_interval,
+            'recent_discrepancies': [
+                disc.to_dict()
+                for disc in list(islice(reversed(self.discrepancies_found), 10))[::-1]
+            ]
         }
     
     def clear_discrepancies(self):
@@ -0,0 +1,167 @@
+"""
+Quote Request Batcher
+
+Coalesces concurrent quote/LTP requests into a single broker call.
+
+Features:
+- Requests arriving within a short window share one API call
+- Symbols are de-duplicated across callers
+- Short TTL cache so repeated lookups within a tick hit memory
+- Merged batches are split to respect Kite's per-call instrument limit
+"""
+import time
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+# Kite's quote/ltp endpoints accept at most 500 instruments per call
+MAX_KEYS_PER_CALL = 500
+
+
+class _Batch:
+    """Instrument keys collected during one flush window and their results."""
+    
+    def __init__(self):
+        self.keys: Set[str] = set()
+        self.done = threading.Event()
+        self.results: Dict[str, Dict] = {}
+        self.error: Optional[Exception] = None
+
+
+class QuoteBatcher:
+    """
+    Batches per-symbol quote requests from many callers into one request.
+    
+    The first caller that needs uncached data opens a batch and fetches every
+    key collected in it; other callers that join the batch just wait for the
+    shared result. The leader only waits out the flush window when another
+    fetch is already in flight, so a lone caller is never delayed. No
+    background thread is needed.
+    """
+    
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], Dict[str, Dict]],
+        flush_interval_ms: float = 50.0,
+        cache_ttl: float = 0.5,
+        wait_timeout: float = 10.0
+    ):
+        """
+        Initialize quote batcher.
+        
+        Args:
+            fetch: Broker call taking instrument keys ("NSE:SYMBOL") and
+                returning a dict keyed by the same instrument keys
+            flush_interval_ms: Window for coalescing requests
+            cache_ttl: Seconds a fetched quote is served from memory
+            wait_timeout: Maximum seconds a caller waits for a shared batch
+        """
+        self.fetch = fetch
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.cache_ttl = cache_ttl
+        self.wait_timeout = wait_timeout
+        self.logger = logging.getLogger(__name__)
+        
+        self.lock = threading.Lock()
+        self._cache: Dict[str, tuple] = {}  # key -> (quote, fetched_at)
+        self._pending: Optional[_Batch] = None
+        self._inflight = 0  # fetches currently running
+        
+        # Stats
+        self.total_requests = 0
+        self.api_calls = 0
+    
+    def get(self, keys: Iterable[str], use_cache: bool = True) -> Dict[str, Dict]:
+        """
+        Get quotes for instrument keys, batching with concurrent callers.
+        
+        Args:
+            keys: Instrument keys, e.g. ["NSE:RELIANCE", "NSE:TCS"]
+            use_cache: False to skip cached quotes (e.g. for order pricing)
+        
+        Returns:
+            Dict of instrument key -> quote data (missing keys are omitted)
+        
+        Raises:
+            Exception: Whatever the broker call raised for this batch
+        """
+        keys = list(dict.fromkeys(keys))
+        now = time.monotonic()
+        results: Dict[str, Dict] = {}
+        missing: List[str] = []
+        
+        with self.lock:
+            self.total_requests += 1
+            for key in keys:
+                cached = self._cache.get(key) if use_cache else None
+                if cached and now - cached[1] < self.cache_ttl:
+                    results[key] = cached[0]
+                else:
+                    missing.append(key)
+            
+            if not missing:
+                return results
+            
+            batch = self._pending
+            is_leader = batch is None
+            if is_leader:
+                batch = self._pending = _Batch()
+            batch.keys.update(missing)
+            # Only worth waiting for company if other callers are active
+            coalesce = is_leader and self._inflight > 0
+        
+        if is_leader:
+            self._flush(batch, coalesce)
+        elif not batch.done.wait(self.wait_timeout):
+            raise TimeoutError("Timed out waiting for batched quote request")
+        
+        if batch.error is not None:
+            raise batch.error
+        
+        for key in missing:
+            if key in batch.results:
+                results[key] = batch.results[key]
+        return results
+    
+    def _flush(self, batch: _Batch, coalesce: bool):
+        """Fetch the whole batch in <=500-key calls, first waiting out the window if coalescing."""
+        if coalesce:
+            time.sleep(self.flush_interval)
+        
+        with self.lock:
+            # Close the window: later callers start a new batch
+            self._pending = None
+            keys = list(batch.keys)
+            self._inflight += 1
+        
+        try:
+            data: Dict[str, Dict] = {}
+            for i in range(0, len(keys), MAX_KEYS_PER_CALL):
+                with self.lock:
+                    self.api_calls += 1
+                data.update(self.fetch(keys[i:i + MAX_KEYS_PER_CALL]) or {})
+            fetched_at = time.monotonic()
+            with self.lock:
+                for key, quote in data.items():
+                    self._cache[key] = (quote, fetched_at)
+            batch.results = data
+        except Exception as e:
+            batch.error = e
+        finally:
+            with self.lock:
+                self._inflight -= 1
+            batch.done.set()
+    
+    def invalidate(self):
+        """Drop all cached quotes."""
+        with self.lock:
+            self._cache.clear()
+    
+    def get_stats(self) -> Dict:
+        """Get batching statistics."""
+        return {
+            'total_requests': self.total_requests,
+            'api_calls': self.api_calls,
+            'cached_keys': len(self._cache)
+        }
@@ -3,11 +3,42 @@ Zerodha Kite API trader implementation.
 Handles authentication, order placement, and market data fetching.
 """
 import os
+import time
+import pickle
+import asyncio
 import logging
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from kiteconnect import KiteConnect
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
 
+from ..utils.error_handler import CircuitBreaker, CircuitBreakerOpenError, classify_error
+from .fast_json import install_orjson_parser
+
+
+# Connection pool for the shared kiteconnect requests.Session. Keeping
+# connections alive lets consecutive calls skip the TCP/TLS handshake.
+# urllib3's Retry only retries idempotent methods by default, so order
+# placement (POST) is never replayed by the adapter.
+KITE_HTTP_POOL = {
+    'pool_connections': 16,
+    'pool_maxsize': 32,
+    'max_retries': Retry(total=3, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+}
+
+
+def _run_sync(coro):
+    """Run a coroutine to completion from sync code, even inside a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # asyncio.run() cannot nest, so drive the coroutine on a worker thread's own loop
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
 
 class KiteTrader:
     """Wrapper class for Zerodha Kite API operations with production features."""
@@ -29,12 +60,55 @@ class KiteTrader:
         # Trading mode
         self.trading_mode = os.getenv('TRADING_MODE', 'paper')  # paper/dry-run/live
         
+        # Execution settings (read once; not re-parsed per order)
+        self.slippage_tolerance = float(os.getenv('SLIPPAGE_TOLERANCE', '0.003'))  # 0.3% default
+        self.order_timeout = int(os.getenv('ORDER_TIMEOUT', '30'))
+        self.rate_limit = float(os.getenv('RATE_LIMIT', '3.0'))
+        
         if not self.api_key:
             self.logger.warning("KITE_API_KEY not found in environment variables")
         
+        # NSE tradingsymbol -> instrument token, refreshed once per trading
+        # day and persisted so restarts within the day skip the download.
+        # Warmed in the background once a session exists; the event is clear
+        # while a warm-up is in flight.
+        self._instrument_token_map: Optional[Dict[str, int]] = None
+        self._instruments_fetched_at = None
+        self.instruments_cache_file = os.path.join('data', 'cache', 'instruments_NSE.pkl')
+        self._instruments_ready = threading.Event()
+        self._instruments_ready.set()
+        
+        # Fast-fail kite calls during an outage instead of paying a full
+        # HTTP timeout on every call
+        self._breaker = CircuitBreaker(failure_threshold=5, timeout=30)
+        
         self.kite = None
         self._initialize_connection()
         
+        # is_connected() result cache to avoid a profile() call per check;
+        # failures are re-probed sooner. -inf: no probe yet (monotonic time
+        # can be below the TTL shortly after boot)
+        self.connection_check_ttl = 60.0
+        self.failed_connection_check_ttl = 5.0
+        self._last_connected_check = float('-inf')
+        self._last_connected_result = False
+        
+        # Short-lived LTP cache filled by prefetch_ltp: symbol -> (price, fetched_at)
+        self._ltp_cache: Dict[str, Tuple[float, float]] = {}
+        self.ltp_cache_ttl = 2.0
+        
+        # Interned "NSE:SYMBOL" instrument keys
+        self._nse_symbol_cache: Dict[str, str] = {}
+        
+        # Coalesce quote/LTP requests from concurrent callers into one call
+        from .quote_batcher import QuoteBatcher
+        self.quote_batcher = QuoteBatcher(lambda keys: self._kite_call(self.kite.quote, keys))
+        self.ltp_batcher = QuoteBatcher(lambda keys: self._kite_call(self.kite.ltp, keys))
+        
+        # Account snapshot (positions + holdings + margins) shared within a tick
+        self._snapshot_cache: Optional[Dict] = None
+        self._snapshot_ts = 0.0
+        
         # Initialize production components
         self.order_manager = None
         self.rate_limiter = None
@@ -44,7 +118,7 @@ class KiteTrader:
             from .order_manager import OrderManager
             self.order_manager = OrderManager(
                 self,
-                order_timeout=int(os.getenv('ORDER_TIMEOUT', '30')),
+                order_timeout=self.order_timeout,
                 poll_interval=1.0
             )
             self.logger.info("OrderManager enabled for production trading")
@@ -52,13 +126,17 @@ class KiteTrader:
         if enable_rate_limiter:
             from ..utils.rate_limiter import get_rate_limiter
             self.rate_limiter = get_rate_limiter(
-                requests_per_second=float(os.getenv('RATE_LIMIT', '3.0'))
+                requests_per_second=self.rate_limit
             )
             self.logger.info("Rate limiter enabled (3 req/sec)")
         
         # Initialize position reconciler
         from .position_reconciler import PositionReconciler
-        self.position_reconciler = PositionReconciler(self, tolerance=0.01)
+        self.position_reconciler = PositionReconciler(
+            self,
+            tolerance=0.01,
+            positions_provider=lambda: self.get_account_snapshot()['positions'].get('net', [])
+        )
         
         # Cost calculator
         from ..utils.cost_calculator import get_cost_calculator
@@ -71,11 +149,16 @@ class KiteTrader:
                 self.logger.error("API key is required for connection")
                 return
             
-            self.kite = KiteConnect(api_key=self.api_key)
+            # kiteconnect mounts an HTTPAdapter built from `pool` on its
+            # single reqsession, which every API call goes through
+            self.kite = KiteConnect(api_key=self.api_key, pool=KITE_HTTP_POOL)
+            self.kite.reqsession.headers['Connection'] = 'keep-alive'
+            install_orjson_parser(self.kite.reqsession)
             
             if self.access_token:
                 self.kite.set_access_token(self.access_token)
                 self.logger.info("Kite connection initialized with access token")
+                self.start_instruments_warmup()
             else:
                 self.logger.warning("Access token not found. You'll need to login manually.")
                 
@@ -83,16 +166,59 @@ class KiteTrader:
             self.logger.error(f"Failed to initialize Kite connection: {str(e)}")
     
     def is_connected(self) -> bool:
-        """Check if connected to Kite API."""
+        """
+        Check if connected to Kite API.
+        
+        A successful profile() probe is cached for connection_check_ttl
+        seconds, a failed one for failed_connection_check_ttl seconds.
+        """
         if not self.kite or not self.access_token:
             return False
         
+        now = time.monotonic()
+        ttl = self.connection_check_ttl if self._last_connected_result else self.failed_connection_check_ttl
+        if now - self._last_connected_check < ttl:
+            return self._last_connected_result
+        
         try:
-            self.kite.profile()
-            return True
+            self._kite_call(self.kite.profile)
+            connected = True
+        except CircuitBreakerOpenError:
+            return False  # Not cached: re-probe once the breaker allows it
         except Exception as e:
             self.logger.error(f"Connection check failed: {str(e)}")
-            return False
+            connected = False
+        
+        self._last_connected_check = now
+        self._last_connected_result = connected
+        return connected
+    
+    def _kite_call(self, func, *args, **kwargs):
+        """
+        Call a kite API method through the circuit breaker.
+        
+        Only transient failures (network/server) count toward opening the
+        breaker; request errors like an invalid symbol do not.
+        
+        Raises:
+            CircuitBreakerOpenError: If the breaker is open
+        """
+        if self._breaker.is_open():
+            raise CircuitBreakerOpenError("Kite API circuit breaker is OPEN, skipping call")
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if classify_error(e)[0]:
+                self._breaker.record_failure()
+            raise
+        self._breaker.record_success()
+        return result
+    
+    def _invalidate_session(self, error: Exception):
+        """Force the next is_connected() to re-probe after an auth failure (HTTP 401/403)."""
+        if getattr(error, 'code', None) in (401, 403) or classify_error(error)[1] == "authentication_error":
+            self._last_connected_check = float('-inf')
+            self._last_connected_result = False
     
     def get_login_url(self) -> Optional[str]:
         """Get the login URL for manual authentication."""
@@ -106,33 +232,82 @@ class KiteTrader:
             data = self.kite.generate_session(request_token, api_secret=self.api_secret)
             self.access_token = data["access_token"]
             self.kite.set_access_token(self.access_token)
+            self._last_connected_check = float('-inf')  # Force a fresh connection probe
             self.logger.info("Access token set successfully")
+            self.start_instruments_warmup()
             return self.access_token
         except Exception as e:
             self.logger.error(f"Failed to set access token: {str(e)}")
             return None
     
+    def _nse(self, symbol: str) -> str:
+        """Return the cached "NSE:SYMBOL" instrument key for a symbol."""
+        key = self._nse_symbol_cache.get(symbol)
+        if key is None:
+            key = self._nse_symbol_cache[symbol] = f"NSE:{symbol}"
+        return key
+    
     def get_quote(self, symbols: List[str]) -> Dict:
         """Get current quotes for given symbols."""
         try:
             # Format symbols as "EXCHANGE:SYMBOL"
-            formatted_symbols = [f"NSE:{symbol}" for symbol in symbols]
-            quotes = self.kite.quote(formatted_symbols)
+            formatted_symbols = [self._nse(symbol) for symbol in symbols]
+            quotes = self.quote_batcher.get(formatted_symbols)
             return quotes
         except Exception as e:
+            self._invalidate_session(e)
             self.logger.error(f"Failed to fetch quotes: {str(e)}")
             return {}
     
-    def get_ltp(self, symbols: List[str]) -> Dict[str, float]:
-        """Get last traded price for given symbols."""
+    def get_ltp(self, symbols: List[str], use_cache: bool = True) -> Dict[str, float]:
+        """Get last traded price for given symbols (use_cache=False for a fresh price)."""
         try:
-            formatted_symbols = [f"NSE:{symbol}" for symbol in symbols]
-            ltp_data = self.kite.ltp(formatted_symbols)
+            formatted_symbols = [self._nse(symbol) for symbol in symbols]
+            ltp_data = self.ltp_batcher.get(formatted_symbols, use_cache=use_cache)
             return {k: v['last_price'] for k, v in ltp_data.items()}
         except Exception as e:
+            self._invalidate_session(e)
             self.logger.error(f"Failed to fetch LTP: {str(e)}")
             return {}
     
+    def prefetch_ltp(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Fetch LTPs for many symbols in as few API calls as possible.
+        
+        Kite's ltp endpoint accepts up to 500 instruments per call. Results
+        are cached for ltp_cache_ttl seconds so that subsequent per-symbol
+        lookups (e.g. limit price calculation) don't hit the network.
+        
+        Returns:
+            Dict of symbol -> last price
+        """
+        prices = {}
+        unique_symbols = list(dict.fromkeys(symbols))
+        
+        for i in range(0, len(unique_symbols), 500):
+            batch = unique_symbols[i:i + 500]
+            try:
+                ltp_data = self._kite_call(self.kite.ltp, [self._nse(symbol) for symbol in batch])
+            except Exception as e:
+                self.logger.error(f"Failed to prefetch LTP: {str(e)}")
+                continue
+            
+            fetched_at = time.monotonic()
+            for symbol in batch:
+                data = ltp_data.get(self._nse(symbol))
+                if data:
+                    prices[symbol] = data['last_price']
+                    self._ltp_cache[symbol] = (data['last_price'], fetched_at)
+        
+        return prices
+    
+    def _get_cached_ltp(self, symbol: str) -> Optional[float]:
+        """Return a prefetched LTP if it is still fresh."""
+        cached = self._ltp_cache.get(symbol)
+        if cached and time.monotonic() - cached[1] < self.ltp_cache_ttl:
+            return cached[0]
+        return None
+    
     def get_historical_data(self, symbol: str, from_date: datetime, 
                            to_date: datetime, interval: str = "day") -> List[Dict]:
         """
@@ -145,21 +320,14 @@ class KiteTrader:
             interval: Candle interval (minute, day, 3minute, 5minute, 10minute, etc.)
         """
         try:
-            # You'll need to get instrument token from instruments list
-            # This is a simplified version
-            instruments = self.kite.instruments("NSE")
-            instrument_token = None
-            
-            for inst in instruments:
-                if inst['tradingsymbol'] == symbol:
-                    instrument_token = inst['instrument_token']
-                    break
+            instrument_token = self._get_instrument_token(symbol)
             
             if not instrument_token:
                 self.logger.error(f"Instrument token not found for {symbol}")
                 return []
             
-            historical_data = self.kite.historical_data(
+            historical_data = self._kite_call(
+                self.kite.historical_data,
                 instrument_token=instrument_token,
                 from_date=from_date,
                 to_date=to_date,
@@ -167,9 +335,76 @@ class KiteTrader:
             )
             return historical_data
         except Exception as e:
+            self._invalidate_session(e)
             self.logger.error(f"Failed to fetch historical data: {str(e)}")
             return []
     
+    def _get_instrument_token(self, symbol: str) -> Optional[int]:
+        """
+        Look up the NSE instrument token for a symbol.
+        
+        Tokens are stable intraday, so the instruments dump is reduced to a
+        tradingsymbol -> token map once per day (from the on-disk cache when
+        it is from today, otherwise from the API).
+        """
+        if not self._instruments_ready.is_set():
+            self._instruments_ready.wait(timeout=30)
+        
+        self._ensure_instrument_map()
+        return self._instrument_token_map.get(symbol)
+    
+    def _ensure_instrument_map(self):
+        """Load today's token map from disk or the API if not already current."""
+        today = datetime.now().date()
+        if self._instrument_token_map is None or self._instruments_fetched_at != today:
+            token_map = self._load_instruments_cache(today)
+            if token_map is None:
+                instruments = self._kite_call(self.kite.instruments, "NSE")
+                token_map = {inst['tradingsymbol']: inst['instrument_token'] for inst in instruments}
+                self._save_instruments_cache(today, token_map)
+            self._instrument_token_map = token_map
+            self._instruments_fetched_at = today
+    
+    def start_instruments_warmup(self):
+        """Build the instrument token map in a background thread (no-op if one is running)."""
+        if not self._instruments_ready.is_set():
+            return
+        self._instruments_ready.clear()
+        threading.Thread(target=self._warm_instruments_cache, name="InstrumentsWarmup", daemon=True).start()
+    
+    def _warm_instruments_cache(self):
+        """Background target for start_instruments_warmup."""
+        try:
+            self._ensure_instrument_map()
+            self.logger.info(f"Instrument token map ready ({len(self._instrument_token_map)} symbols)")
+        except Exception as e:
+            self.logger.warning(f"Instrument warm-up failed, will fetch on demand: {e}")
+        finally:
+            self._instruments_ready.set()
+    
+    def _load_instruments_cache(self, today) -> Optional[Dict[str, int]]:
+        """Load today's token map from disk, or None if missing or stale."""
+        try:
+            with open(self.instruments_cache_file, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('date') == today.isoformat():
+                return cached['tokens']
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable instruments cache: {e}")
+        return None
+    
+    def _save_instruments_cache(self, today, token_map: Dict[str, int]):
+        """Persist the token map with its trading date."""
+        try:
+            os.makedirs(os.path.dirname(self.instruments_cache_file), exist_ok=True)
+            with open(self.instruments_cache_file, 'wb') as f:
+                pickle.dump({'date': today.isoformat(), 'tokens': token_map}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            self.logger.warning(f"Failed to write instruments cache: {e}")
+    
     def place_order(self, symbol: str, transaction_type: str, quantity: int,
                     order_type: str = "LIMIT", product: str = "MIS",
                     price: Optional[float] = None, verify_execution: bool = None) -> Optional[str]:
@@ -188,14 +423,21 @@ class KiteTrader:
         Returns:
             Order ID if successful, None otherwise
         """
-        # Apply rate limiting
-        if self.rate_limiter:
-            self.rate_limiter.acquire()
-        
         # Determine if we should verify execution
         if verify_execution is None:
             verify_execution = (self.trading_mode == 'live' and self.order_manager is not None)
         
+        # Verified execution polls the order on an event loop
+        if verify_execution and self.order_manager:
+            return _run_sync(self.place_order_async(
+                symbol, transaction_type, quantity, order_type, product, price,
+                verify_execution=True
+            ))
+        
+        # Apply rate limiting
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        
         try:
             # Smart price calculation for LIMIT orders
             if order_type == "LIMIT" and price is None:
@@ -204,26 +446,6 @@ class KiteTrader:
                     self.logger.error(f"Failed to calculate limit price for {symbol}")
                     return None
             
-            # Use order manager for verified execution in live trading
-            if verify_execution and self.order_manager:
-                result = self.order_manager.place_and_verify_order(
-                    symbol=symbol,
-                    transaction_type=transaction_type,
-                    quantity=quantity,
-                    order_type=order_type,
-                    product=product,
-                    price=price
-                )
-                if result['status'] == 'COMPLETE':
-                    self.logger.info(
-                        f"✓ Order executed: {transaction_type} {result['filled_quantity']} {symbol} "
-                        f"@ ₹{result['average_price']:.2f}"
-                    )
-                    return result['order_id']
-                else:
-                    self.logger.error(f"Order failed: {result.get('message', 'Unknown error')}")
-                    return None
-            
             # Standard order placement (no verification)
             order_params = {
                 'tradingsymbol': symbol,
@@ -238,14 +460,104 @@ class KiteTrader:
             if order_type == "LIMIT" and price:
                 order_params['price'] = price
             
-            order_id = self.kite.place_order(**order_params)
+            order_id = self._kite_call(self.kite.place_order, **order_params)
             self.logger.info(f"Order placed: {order_id} - {transaction_type} {quantity} {symbol} @ ₹{price or 'MARKET'}")
             return order_id
             
         except Exception as e:
+            self._invalidate_session(e)
             self.logger.error(f"Failed to place order: {str(e)}")
             return None
     
+    async def place_order_async(self, symbol: str, transaction_type: str, quantity: int,
+                                order_type: str = "LIMIT", product: str = "MIS",
+                                price: Optional[float] = None,
+                                verify_execution: bool = None) -> Optional[str]:
+        """
+        Async variant of place_order.
+        
+        Verified orders are placed and polled through the OrderManager on the
+        running loop, so many can be awaited together; unverified orders run
+        place_order on a worker thread.
+        
+        Returns:
+            Order ID if successful, None otherwise
+        """
+        if verify_execution is None:
+            verify_execution = (self.trading_mode == 'live' and self.order_manager is not None)
+        
+        if not (verify_execution and self.order_manager):
+            return await asyncio.to_thread(
+                self.place_order, symbol, transaction_type, quantity,
+                order_type, product, price, verify_execution=False
+            )
+        
+        if self.rate_limiter:
+            await asyncio.to_thread(self.rate_limiter.acquire)
+        
+        try:
+            if order_type == "LIMIT" and price is None:
+                price = await asyncio.to_thread(self._calculate_limit_price, symbol, transaction_type)
+                if not price:
+                    self.logger.error(f"Failed to calculate limit price for {symbol}")
+                    return None
+            
+            result = await self.order_manager.place_and_verify_order(
+                symbol=symbol,
+                transaction_type=transaction_type,
+                quantity=quantity,
+                order_type=order_type,
+                product=product,
+                price=price
+            )
+            if result['status'] == 'COMPLETE':
+                self.logger.info(
+                    f"✓ Order executed: {transaction_type} {result['filled_quantity']} {symbol} "
+                    f"@ ₹{result['average_price']:.2f}"
+                )
+                return result['order_id']
+            else:
+                self.logger.error(f"Order failed: {result.get('message', 'Unknown error')}")
+                return None
+        
+        except Exception as e:
+            self._invalidate_session(e)
+            self.logger.error(f"Failed to place order: {str(e)}")
+            return None
+    
+    def place_orders(self, specs: List[Dict]) -> List[Optional[str]]:
+        """
+        Place several orders concurrently (e.g. legs of a multi-leg strategy).
+        
+        LTPs for every LIMIT order without an explicit price are fetched in
+        one batched call up front, then all orders are gathered on one event
+        loop: verified orders share it for placement and status polling, and
+        unverified ones run on worker threads. The rate limiter is shared, so
+        submissions still respect the API limit.
+        
+        Args:
+            specs: List of keyword-argument dicts for place_order, e.g.
+                {'symbol': 'RELIANCE', 'transaction_type': 'BUY', 'quantity': 1}
+        
+        Returns:
+            List of order IDs (None for failed orders), in the order of specs
+        """
+        if not specs:
+            return []
+        
+        needs_ltp = [
+            spec['symbol'] for spec in specs
+            if spec.get('order_type', 'LIMIT') == 'LIMIT' and spec.get('price') is None
+        ]
+        if needs_ltp:
+            self.prefetch_ltp(needs_ltp)
+        
+        return _run_sync(self._place_orders_async(specs))
+    
+    async def _place_orders_async(self, specs: List[Dict]) -> List[Optional[str]]:
+        """Gather place_order_async for every spec, keeping spec order."""
+        return list(await asyncio.gather(*(self.place_order_async(**spec) for spec in specs)))
+    
     def _calculate_limit_price(self, symbol: str, transaction_type: str) -> Optional[float]:
         """
         Calculate limit price with slippage buffer.
@@ -258,15 +570,17 @@ class KiteTrader:
             Limit price with slippage buffer
         """
         try:
-            # Get current LTP
-            ltp_data = self.get_ltp([symbol])
-            ltp = ltp_data.get(f"NSE:{symbol}", 0)
+            # Get current LTP (prefetched batch first, single-symbol call otherwise)
+            ltp = self._get_cached_ltp(symbol)
+            if ltp is None:
+                ltp_data = self.get_ltp([symbol], use_cache=False)
+                ltp = ltp_data.get(self._nse(symbol), 0)
             
             if ltp <= 0:
                 return None
             
             # Apply slippage buffer
-            slippage = float(os.getenv('SLIPPAGE_TOLERANCE', '0.003'))  # 0.3% default
+            slippage = self.slippage_tolerance
             
             if transaction_type == "BUY":
                 # Buy slightly above LTP to ensure execution
@@ -292,45 +606,136 @@ class KiteTrader:
     def get_positions(self) -> Dict:
         """Get current positions."""
         try:
-            positions = self.kite.positions()
+            positions = self._kite_call(self.kite.positions)
             return positions
         except Exception as e:
+            self._invalidate_session(e)
             self.logger.error(f"Failed to fetch positions: {str(e)}")
             return {'net': [], 'day': []}
     
     def get_orders(self) -> List[Dict]:
         """Get all orders for the day."""
         try:
-            orders = self.kite.orders()
+            orders = self._kite_call(self.kite.orders)
             return orders
         except Exception as e:
+            self._invalidate_session(e)
             self.logger.error(f"Failed to fetch orders: {str(e)}")
             return []
     
     def cancel_order(self, order_id: str, variety: str = "regular") -> bool:
         """Cancel an order."""
         try:
-            self.kite.cancel_order(variety=variety, order_id=order_id)
+            self._kite_call(self.kite.cancel_order, variety=variety, order_id=order_id)
             self.logger.info(f"Order cancelled: {order_id}")
             return True
         except Exception as e:
+            self._invalidate_session(e)
             self.logger.error(f"Failed to cancel order: {str(e)}")
             return False
     
     def get_margins(self) -> Dict:
         """Get account margins."""
         try:
-            margins = self.kite.margins()
+            margins = self._kite_call(self.kite.margins)
             return margins
         except Exception as e:
+            self._invalidate_session(e)
             self.logger.error(f"Failed to fetch margins: {str(e)}")
             return {}
     
     def get_holdings(self) -> List[Dict]:
         """Get all holdings (stocks held in delivery)."""
         try:
-            holdings = self.kite.holdings()
+            holdings = self._kite_call(self.kite.holdings)
             return holdings
         except Exception as e:
+            self._invalidate_session(e)
             self.logger.error(f"Failed to fetch holdings: {str(e)}")
             return []
+    
+    def get_account_snapshot(self, ttl: float = 2.0) -> Dict:
+        """
+        Get positions, holdings and margins from one short-lived snapshot.
+        
+        The three calls are issued concurrently and the result is cached for
+        ttl seconds, so components reading account state within the same
+        tick (reconciler, risk checks, strategy) share one set of requests.
+        
+        Args:
+            ttl: Seconds a snapshot stays valid
+        
+        Returns:
+            Dict with 'positions', 'holdings' and 'margins'
+        """
+        now = time.monotonic()
+        if self._snapshot_cache is not None and now - self._snapshot_ts < ttl:
+            return self._snapshot_cache
+        
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            f_pos = executor.submit(self.get_positions)
+            f_hold = executor.submit(self.get_holdings)
+            f_marg = executor.submit(self.get_margins)
+            snapshot = {
+                'positions': f_pos.result(),
+                'holdings': f_hold.result(),
+                'margins': f_marg.result()
+            }
+        
+        self._snapshot_cache = snapshot
+        self._snapshot_ts = time.monotonic()
+        return snapshot
+    
+    # ------------------------------------------------------------------
+    # Async read API
+    #
+    # kiteconnect only ships a blocking client, so the async variants run the
+    # existing getters on worker threads. They keep the same error handling
+    # and defaults, and let independent reads overlap.
+    # ------------------------------------------------------------------
+    
+    async def get_quote_async(self, symbols: List[str]) -> Dict:
+        """Async variant of get_quote."""
+        return await asyncio.to_thread(self.get_quote, symbols)
+    
+    async def get_ltp_async(self, symbols: List[str]) -> Dict[str, float]:
+        """Async variant of get_ltp."""
+        return await asyncio.to_thread(self.get_ltp, symbols)
+    
+    async def get_positions_async(self) -> Dict:
+        """Async variant of get_positions."""
+        return await asyncio.to_thread(self.get_positions)
+    
+    async def get_orders_async(self) -> List[Dict]:
+        """Async variant of get_orders."""
+        return await asyncio.to_thread(self.get_orders)
+    
+    async def get_holdings_async(self) -> List[Dict]:
+        """Async variant of get_holdings."""
+        return await asyncio.to_thread(self.get_holdings)
+    
+    async def get_margins_async(self) -> Dict:
+        """Async variant of get_margins."""
+        return await asyncio.to_thread(self.get_margins)
+    
+    async def snapshot(self) -> Dict:
+        """
+        Fetch positions, orders, holdings and margins concurrently.
+        
+        Wall time is roughly the slowest of the four calls instead of their sum.
+        
+        Returns:
+            Dict with 'positions', 'orders', 'holdings' and 'margins'
+        """
+        positions, orders, holdings, margins = await asyncio.gather(
+            self.get_positions_async(),
+            self.get_orders_async(),
+            self.get_holdings_async(),
+            self.get_margins_async()
+        )
+        return {
+            'positions': positions,
+            'orders': orders,
+            'holdings': holdings,
+            'margins': margins
+        }
@@ -8,59 +8,150 @@ Simulates real trades with virtual money to:
 - Analyze trade patterns
 """
 import json
+import pickle
+import atexit
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional
+import threading
+from collections import deque
+from datetime import date, datetime
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
 import os
 
+import numpy as np
+import orjson
+
+
+# Full state snapshot cadence; in between, only the small hot state is written
+FULL_SNAPSHOT_EVERY = 100
+
+# Recent trades / closed positions kept in memory; the full history is in
+# the JSONL logs (see iter_trades / iter_closed_positions)
+TRADE_HISTORY_SIZE = 1000
+
+# Simulated brokerage per trade (₹20)
+BROKERAGE_PAISE = 2000
+
+
+def _to_paise(amount: float) -> int:
+    """Convert rupees to integer paise."""
+    return int(round(amount * 100))
+
+
+def _from_paise(paise: int) -> float:
+    """Convert integer paise to rupees."""
+    return paise / 100
+
+
+def _state_paths(data_dir: str, snapshot_format: str) -> Tuple[str, str, str, str]:
+    """Full snapshot, hot state, trade log and closed-position log paths."""
+    hot_ext = 'pkl' if snapshot_format == 'pickle' else 'json'
+    return (
+        os.path.join(data_dir, 'paper_trading_state.json'),
+        os.path.join(data_dir, f'paper_trading_hot.{hot_ext}'),
+        os.path.join(data_dir, 'trades.jsonl'),
+        os.path.join(data_dir, 'closed_positions.jsonl')
+    )
+
 
 class PaperTrader:
     """
     Simulates trading with virtual money using real market data.
     """
     
-    def __init__(self, initial_capital: float = 100000.0, data_dir: str = 'ai_data'):
+    def __init__(self, initial_capital: float = 100000.0, data_dir: str = 'ai_data',
+                 snapshot_format: str = 'pickle'):
         """
         Initialize paper trader.
         
         Args:
             initial_capital: Starting virtual capital (default: ₹100,000)
             data_dir: Directory to store paper trading data
+            snapshot_format: Hot state format, 'pickle' (binary, exact position
+                arrays) or 'json'; the full snapshot is always JSON
         """
         self.logger = logging.getLogger(__name__)
         self.data_dir = data_dir
         os.makedirs(data_dir, exist_ok=True)
         
+        # Persistence: full snapshot + per-trade hot state + append-only logs
+        self.snapshot_format = snapshot_format
+        (self.state_file, self.hot_state_file,
+         self.trade_log_file, self.closed_log_file) = _state_paths(data_dir, snapshot_format)
+        self._trades_since_snapshot = 0
+        
         # Account state
         self.initial_capital = initial_capital
         self.current_capital = initial_capital
         self.available_capital = initial_capital
         
-        # Portfolio
-        self.positions: Dict[str, Dict] = {}  # symbol -> position info
-        self.closed_positions: List[Dict] = []
+        # Portfolio: open positions stored as parallel arrays (one row per
+        # symbol) so valuation is a single dot product. Money is int64 paise.
+        self._pos_symbols: List[str] = []
+        self._pos_index: Dict[str, int] = {}  # symbol -> row
+        self._pos_qty = np.zeros(0, dtype=np.int64)
+        self._pos_avg = np.zeros(0, dtype=np.int64)
+        self._pos_invested = np.zeros(0, dtype=np.int64)
+        self._pos_entry_price = np.zeros(0, dtype=np.int64)
+        self._pos_mark = np.zeros(0, dtype=np.int64)  # price each row is valued at
+        self._pos_entry_time: List[datetime] = []
+        self.closed_positions: Deque[Dict] = deque(maxlen=TRADE_HISTORY_SIZE)
+        self.closed_count = 0
         
         # Trade history
-        self.trade_history: List[Dict] = []
+        self.trade_history: Deque[Dict] = deque(maxlen=TRADE_HISTORY_SIZE)
         self.daily_pnl: Dict[str, float] = {}  # date -> pnl
+        self.daily_counters: Dict[str, Dict[str, int]] = {}  # date -> closed trade counts
         
         # Performance metrics
         self.total_trades = 0
         self.winning_trades = 0
         self.losing_trades = 0
-        self.total_profit = 0.0
-        self.total_loss = 0.0
+        self._total_profit_p = 0
+        self._total_loss_p = 0
         
         # Daily statistics tracking
         self.daily_stats: List[Dict] = []  # List of daily trading statistics
         
+        # Date strings formatted once per day rather than per trade
+        self._today_date: Optional[date] = None
+        self._today_str = ''
+        self._today_compact = ''
+        
+        # Order handlers by transaction type
+        self._handlers = {
+            'BUY': self._execute_buy,
+            'SELL': self._execute_sell
+        }
+        
         # Load previous session if exists
         self._load_state()
         
+        # Portfolio value (paise) kept up to date per trade; positions are
+        # marked at average price until mark_to_market() or a trade supplies prices
+        self._pos_mark = self._pos_avg.copy()
+        self._portfolio_value_p = self._available_p + int(self._pos_qty @ self._pos_mark)
+        
+        # Line-buffered so each record reaches the OS as soon as it's written
+        self._trade_log = open(self.trade_log_file, 'a', buffering=1)
+        self._closed_log = open(self.closed_log_file, 'a', buffering=1)
+        
+        # State files are written by a background thread so orders never
+        # block on disk; pending saves are flushed and the logs closed at
+        # interpreter exit.
+        # One pending slot per file: a newer save replaces an unwritten one.
+        self._pending_saves: Dict[str, Tuple[Dict, str]] = {}
+        self._save_cond = threading.Condition()
+        self._save_writing = False
+        self._save_stop = False
+        self._save_thread = threading.Thread(target=self._save_worker, name="PaperStateWriter", daemon=True)
+        self._save_thread.start()
+        atexit.register(self.close)
+        
         self.logger.info(f"Paper Trading initialized with ₹{initial_capital:,.2f} virtual capital")
     
     def execute_order(self, symbol: str, transaction_type: str, quantity: int, 
-                     price: float, order_type: str = "MARKET") -> Dict:
+                     price: float, order_type: str = "MARKET",
+                     _now: Optional[datetime] = None) -> Dict:
         """
         Simulate order execution.
         
@@ -70,170 +161,233 @@ class PaperTrader:
             quantity: Number of shares
             price: Execution price
             order_type: Order type (default: MARKET)
+            _now: Pre-captured execution time (batch closes share one timestamp)
             
         Returns:
             Order result with execution details
         """
-        timestamp = datetime.now()
-        trade_value = quantity * price
+        handler = self._handlers.get(transaction_type)
+        if handler is None:
+            self.logger.warning(f"Unknown transaction type {transaction_type} for {symbol}")
+            return {
+                'status': 'REJECTED',
+                'reason': 'Invalid transaction type',
+                'symbol': symbol
+            }
+        return handler(symbol, quantity, price, order_type, _now)
+    
+    def _trade_clock(self, now: Optional[datetime] = None):
+        """Trade timestamp and its ISO string; refreshes cached date strings on day change."""
+        timestamp = now or datetime.now()
+        trade_date = timestamp.date()
+        if trade_date != self._today_date:
+            self._today_date = trade_date
+            self._today_str = trade_date.isoformat()
+            self._today_compact = trade_date.strftime('%Y%m%d')
+        return timestamp, timestamp.isoformat()
+    
+    def _execute_buy(self, symbol: str, quantity: int, price: float, order_type: str,
+                     now: Optional[datetime] = None) -> Dict:
+        """Simulate a BUY order."""
+        timestamp, timestamp_iso = self._trade_clock(now)
+        price_p = _to_paise(price)
+        value_p = quantity * price_p
+        trade_value = _from_paise(value_p)
         
         # Simulate brokerage (₹20 per trade)
-        brokerage = 20.0
+        brokerage = _from_paise(BROKERAGE_PAISE)
+        required_p = value_p + BROKERAGE_PAISE
         
-        if transaction_type == 'BUY':
-            required_capital = trade_value + brokerage
-            
-            if required_capital > self.available_capital:
-                self.logger.warning(
-                    f"Insufficient virtual capital for {symbol}: "
-                    f"Required ₹{required_capital:,.2f}, Available ₹{self.available_capital:,.2f}"
-                )
-                return {
-                    'status': 'REJECTED',
-                    'reason': 'Insufficient capital',
-                    'symbol': symbol
-                }
-            
-            # Execute BUY
-            self.available_capital -= required_capital
-            
-            if symbol in self.positions:
-                # Average up position
-                old_qty = self.positions[symbol]['quantity']
-                old_price = self.positions[symbol]['avg_price']
-                new_qty = old_qty + quantity
-                new_avg = ((old_qty * old_price) + (quantity * price)) / new_qty
-                
-                self.positions[symbol]['quantity'] = new_qty
-                self.positions[symbol]['avg_price'] = new_avg
-                self.positions[symbol]['invested'] += trade_value
-            else:
-                # New position
-                self.positions[symbol] = {
-                    'quantity': quantity,
-                    'avg_price': price,
-                    'invested': trade_value,
-                    'entry_time': timestamp,
-                    'entry_price': price
-                }
-            
-            trade_record = {
-                'timestamp': timestamp.isoformat(),
-                'symbol': symbol,
-                'type': 'BUY',
-                'quantity': quantity,
-                'price': price,
-                'value': trade_value,
-                'brokerage': brokerage,
-                'capital_after': self.available_capital,
-                'portfolio_value': self.get_portfolio_value({symbol: price})
+        if required_p > self._available_p:
+            self.logger.warning(
+                f"Insufficient virtual capital for {symbol}: "
+                f"Required ₹{_from_paise(required_p):,.2f}, Available ₹{self.available_capital:,.2f}"
+            )
+            return {
+                'status': 'REJECTED',
+                'reason': 'Insufficient capital',
+                'symbol': symbol
             }
+        
+        # Execute BUY
+        self._available_p -= required_p
+        
+        row = self._pos_index.get(symbol)
+        if row is not None:
+            # Average up position (rounded to the nearest paisa)
+            old_qty = self._pos_qty.item(row)
+            old_avg_p = self._pos_avg.item(row)
+            old_mark_p = self._pos_mark.item(row)
+            new_qty = old_qty + quantity
+            new_avg_p = (old_qty * old_avg_p + value_p + new_qty // 2) // new_qty
             
-            self.logger.info(
-                f"📝 PAPER TRADE: BUY {quantity} {symbol} @ ₹{price:.2f} "
-                f"(Total: ₹{trade_value:,.2f} + ₹{brokerage} brokerage)"
+            self._pos_qty[row] = new_qty
+            self._pos_avg[row] = new_avg_p
+            self._pos_invested[row] += value_p
+            self._pos_mark[row] = price_p
+            self._portfolio_value_p += new_qty * price_p - old_qty * old_mark_p - required_p
+        else:
+            # New position
+            self._add_position(symbol, quantity, price_p, value_p, timestamp, price_p)
+            self._portfolio_value_p += value_p - required_p
+        
+        self._record_trade({
+            'timestamp': timestamp_iso,
+            'symbol': symbol,
+            'type': 'BUY',
+            'quantity': quantity,
+            'price': price,
+            'value': trade_value,
+            'brokerage': brokerage,
+            'capital_after': self.available_capital,
+            'portfolio_value': _from_paise(self._portfolio_value_p)
+        })
+        
+        self.logger.info(
+            f"📝 PAPER TRADE: BUY {quantity} {symbol} @ ₹{price:.2f} "
+            f"(Total: ₹{trade_value:,.2f} + ₹{brokerage} brokerage)"
+        )
+        
+        self._update_daily_pnl()
+        self._persist_after_trade()
+        return self._order_result(symbol, 'BUY', quantity, price, timestamp_iso)
+    
+    def _execute_sell(self, symbol: str, quantity: int, price: float, order_type: str,
+                      now: Optional[datetime] = None) -> Dict:
+        """Simulate a SELL order against an open position."""
+        row = self._pos_index.get(symbol)
+        if row is None:
+            self.logger.warning(f"No position to sell for {symbol}")
+            return {
+                'status': 'REJECTED',
+                'reason': 'No position',
+                'symbol': symbol
+            }
+        
+        held_qty = self._pos_qty.item(row)
+        if quantity > held_qty:
+            self.logger.warning(
+                f"Insufficient quantity for {symbol}: "
+                f"Tried to sell {quantity}, have {held_qty}"
             )
+            return {
+                'status': 'REJECTED',
+                'reason': 'Insufficient quantity',
+                'symbol': symbol
+            }
         
-        else:  # SELL
-            if symbol not in self.positions:
-                self.logger.warning(f"No position to sell for {symbol}")
-                return {
-                    'status': 'REJECTED',
-                    'reason': 'No position',
-                    'symbol': symbol
-                }
-            
-            position = self.positions[symbol]
-            if quantity > position['quantity']:
-                self.logger.warning(
-                    f"Insufficient quantity for {symbol}: "
-                    f"Tried to sell {quantity}, have {position['quantity']}"
-                )
-                return {
-                    'status': 'REJECTED',
-                    'reason': 'Insufficient quantity',
-                    'symbol': symbol
-                }
-            
-            # Execute SELL
-            sell_value = trade_value - brokerage
-            self.available_capital += sell_value
-            
-            # Calculate P&L
-            entry_price = position['entry_price']
-            pnl = (price - entry_price) * quantity
-            pnl_pct = ((price - entry_price) / entry_price) * 100
-            
-            # Update metrics
-            self.total_trades += 1
-            if pnl > 0:
-                self.winning_trades += 1
-                self.total_profit += pnl
-            else:
-                self.losing_trades += 1
-                self.total_loss += abs(pnl)
-            
-            # Update position
-            position['quantity'] -= quantity
-            
-            # Close position if fully sold
-            if position['quantity'] == 0:
-                holding_period = (timestamp - position['entry_time']).total_seconds() / 60  # minutes
-                closed_position = {
-                    'symbol': symbol,
-                    'entry_price': entry_price,
-                    'exit_price': price,
-                    'quantity': quantity,
-                    'pnl': pnl,
-                    'pnl_pct': pnl_pct,
-                    'holding_period_minutes': holding_period,
-                    'entry_time': position['entry_time'].isoformat(),
-                    'exit_time': timestamp.isoformat()
-                }
-                self.closed_positions.append(closed_position)
-                del self.positions[symbol]
-            
-            trade_record = {
-                'timestamp': timestamp.isoformat(),
+        timestamp, timestamp_iso = self._trade_clock(now)
+        price_p = _to_paise(price)
+        value_p = quantity * price_p
+        brokerage = _from_paise(BROKERAGE_PAISE)
+        
+        # Execute SELL
+        sell_p = value_p - BROKERAGE_PAISE
+        self._available_p += sell_p
+        # Held shares were valued at the row's mark; the rest are re-marked at this price
+        self._portfolio_value_p += sell_p + (held_qty - quantity) * price_p - held_qty * self._pos_mark.item(row)
+        self._pos_mark[row] = price_p
+        sell_value = _from_paise(sell_p)
+        
+        # Calculate P&L (exact in paise)
+        entry_p = self._pos_entry_price.item(row)
+        entry_price = _from_paise(entry_p)
+        pnl_p = (price_p - entry_p) * quantity
+        pnl = _from_paise(pnl_p)
+        pnl_pct = (price_p - entry_p) * 100 / entry_p
+        
+        # Update metrics
+        is_win = pnl_p > 0
+        self.total_trades += 1
+        self.winning_trades += is_win
+        self.losing_trades += not is_win
+        self._total_profit_p += pnl_p if is_win else 0
+        self._total_loss_p += 0 if is_win else -pnl_p
+        
+        # Update position
+        remaining = held_qty - quantity
+        self._pos_qty[row] = remaining
+        
+        # Close position if fully sold
+        if remaining == 0:
+            entry_time = self._pos_entry_time[row]
+            holding_period = (timestamp - entry_time).total_seconds() / 60  # minutes
+            closed_position = {
                 'symbol': symbol,
-                'type': 'SELL',
+                'entry_price': entry_price,
+                'exit_price': price,
                 'quantity': quantity,
-                'price': price,
-                'value': sell_value,
-                'brokerage': brokerage,
                 'pnl': pnl,
                 'pnl_pct': pnl_pct,
-                'capital_after': self.available_capital,
-                'portfolio_value': self.get_portfolio_value({symbol: price})
+                'holding_period_minutes': holding_period,
+                'entry_time': entry_time.isoformat(),
+                'exit_time': timestamp_iso
             }
-            
-            pnl_emoji = "🟢" if pnl > 0 else "🔴"
-            self.logger.info(
-                f"📝 PAPER TRADE: SELL {quantity} {symbol} @ ₹{price:.2f} "
-                f"{pnl_emoji} P&L: ₹{pnl:+,.2f} ({pnl_pct:+.2f}%)"
-            )
+            self.closed_positions.append(closed_position)
+            self.closed_count += 1
+            self._closed_log.write(json.dumps(closed_position) + '\n')
+            self._remove_position(symbol)
         
-        # Record trade
+        self._record_trade({
+            'timestamp': timestamp_iso,
+            'symbol': symbol,
+            'type': 'SELL',
+            'quantity': quantity,
+            'price': price,
+            'value': sell_value,
+            'brokerage': brokerage,
+            'pnl': pnl,
+            'pnl_pct': pnl_pct,
+            'capital_after': self.available_capital,
+            'portfolio_value': _from_paise(self._portfolio_value_p)
+        })
+        
+        pnl_emoji = "🟢" if pnl > 0 else "🔴"
+        self.logger.info(
+            f"📝 PAPER TRADE: SELL {quantity} {symbol} @ ₹{price:.2f} "
+            f"{pnl_emoji} P&L: ₹{pnl:+,.2f} ({pnl_pct:+.2f}%)"
+        )
+        
+        self._update_daily_pnl(pnl, is_win)
+        self._persist_after_trade()
+        return self._order_result(symbol, 'SELL', quantity, price, timestamp_iso)
+    
+    def _record_trade(self, trade_record: Dict):
+        """Add a trade to the in-memory history and the append-only log."""
         self.trade_history.append(trade_record)
-        
-        # Update daily P&L
-        today = timestamp.strftime('%Y-%m-%d')
+        self._trade_log.write(json.dumps(trade_record) + '\n')
+    
+    def _update_daily_pnl(self, pnl: Optional[float] = None, is_win: bool = False):
+        """Update today's P&L and counters (pnl is None for trades that don't close)."""
+        today = self._today_str
         if today not in self.daily_pnl:
             self.daily_pnl[today] = 0.0
-        if transaction_type == 'SELL':
+        if pnl is not None:
             self.daily_pnl[today] += pnl
-        
-        # Save state
-        self._save_state()
-        
+            counters = self.daily_counters.setdefault(today, {'trades': 0, 'wins': 0, 'losses': 0})
+            counters['trades'] += 1
+            counters['wins'] += is_win
+            counters['losses'] += not is_win
+    
+    def _persist_after_trade(self):
+        """Persist: hot state every trade, full snapshot periodically."""
+        self._trades_since_snapshot += 1
+        if self._trades_since_snapshot >= FULL_SNAPSHOT_EVERY:
+            self._save_state()
+        else:
+            self._save_hot_state()
+    
+    def _order_result(self, symbol: str, transaction_type: str, quantity: int,
+                      price: float, timestamp_iso: str) -> Dict:
+        """Build the COMPLETE order response."""
         return {
             'status': 'COMPLETE',
-            'order_id': f"PAPER_{timestamp.strftime('%Y%m%d%H%M%S')}_{symbol}",
+            'order_id': f"PAPER_{self._today_compact}{timestamp_iso[11:19].replace(':', '')}_{symbol}",
             'symbol': symbol,
             'transaction_type': transaction_type,
             'quantity': quantity,
             'price': price,
-            'timestamp': timestamp.isoformat()
+            'timestamp': timestamp_iso
         }
     
     def get_portfolio_value(self, current_prices: Dict[str, float]) -> float:
@@ -246,12 +400,123 @@ class PaperTrader:
         Returns:
             Total portfolio value (cash + positions)
         """
-        positions_value = 0.0
-        for symbol, position in self.positions.items():
-            current_price = current_prices.get(symbol, position['avg_price'])
-            positions_value += position['quantity'] * current_price
+        count = len(self._pos_symbols)
+        if count == 0:
+            return self.available_capital
+        
+        avg = self._pos_avg
+        price_vec = np.fromiter(
+            (
+                _to_paise(current_prices[symbol]) if symbol in current_prices else avg[i]
+                for i, symbol in enumerate(self._pos_symbols)
+            ),
+            dtype=np.int64,
+            count=count
+        )
+        return _from_paise(self._available_p + int(self._pos_qty @ price_vec))
+    
+    def mark_to_market(self, current_prices: Dict[str, float]) -> float:
+        """
+        Revalue the portfolio at current prices and reset the running value.
         
-        return self.available_capital + positions_value
+        Positions without a price keep their last mark.
+        
+        Args:
+            current_prices: Dict of symbol -> current price
+            
+        Returns:
+            Total portfolio value (cash + positions)
+        """
+        for symbol, price in current_prices.items():
+            row = self._pos_index.get(symbol)
+            if row is not None:
+                self._pos_mark[row] = _to_paise(price)
+        self._portfolio_value_p = self._available_p + int(self._pos_qty @ self._pos_mark)
+        return _from_paise(self._portfolio_value_p)
+    
+    @property
+    def available_capital(self) -> float:
+        """Cash available for new positions."""
+        return _from_paise(self._available_p)
+    
+    @available_capital.setter
+    def available_capital(self, value: float):
+        self._available_p = _to_paise(value)
+    
+    @property
+    def total_profit(self) -> float:
+        """Sum of winning trade P&L."""
+        return _from_paise(self._total_profit_p)
+    
+    @total_profit.setter
+    def total_profit(self, value: float):
+        self._total_profit_p = _to_paise(value)
+    
+    @property
+    def total_loss(self) -> float:
+        """Sum of losing trade P&L (positive number)."""
+        return _from_paise(self._total_loss_p)
+    
+    @total_loss.setter
+    def total_loss(self, value: float):
+        self._total_loss_p = _to_paise(value)
+    
+    def _add_position(self, symbol: str, quantity: int, avg_price_p: int, invested_p: int,
+                      entry_time: datetime, entry_price_p: int):
+        """Append a new position row (money in paise)."""
+        self._pos_index[symbol] = len(self._pos_symbols)
+        self._pos_symbols.append(symbol)
+        self._pos_entry_time.append(entry_time)
+        self._pos_qty = np.append(self._pos_qty, quantity)
+        self._pos_avg = np.append(self._pos_avg, avg_price_p)
+        self._pos_invested = np.append(self._pos_invested, invested_p)
+        self._pos_entry_price = np.append(self._pos_entry_price, entry_price_p)
+        self._pos_mark = np.append(self._pos_mark, avg_price_p)
+    
+    def _remove_position(self, symbol: str):
+        """Remove a position row by moving the last row into its slot."""
+        row = self._pos_index.pop(symbol)
+        last = len(self._pos_symbols) - 1
+        if row != last:
+            moved = self._pos_symbols[last]
+            self._pos_symbols[row] = moved
+            self._pos_entry_time[row] = self._pos_entry_time[last]
+            for arr in (self._pos_qty, self._pos_avg, self._pos_invested, self._pos_entry_price, self._pos_mark):
+                arr[row] = arr[last]
+            self._pos_index[moved] = row
+        self._pos_symbols.pop()
+        self._pos_entry_time.pop()
+        self._pos_qty = self._pos_qty[:last]
+        self._pos_avg = self._pos_avg[:last]
+        self._pos_invested = self._pos_invested[:last]
+        self._pos_entry_price = self._pos_entry_price[:last]
+        self._pos_mark = self._pos_mark[:last]
+    
+    def position_view(self, symbol: str) -> Optional[Dict]:
+        """
+        Get a position as a dict (snapshot, not live).
+        
+        Args:
+            symbol: Stock symbol
+            
+        Returns:
+            Position info, or None if there is no open position
+        """
+        row = self._pos_index.get(symbol)
+        if row is None:
+            return None
+        return {
+            'quantity': self._pos_qty.item(row),
+            'avg_price': _from_paise(self._pos_avg.item(row)),
+            'invested': _from_paise(self._pos_invested.item(row)),
+            'entry_time': self._pos_entry_time[row],
+            'entry_price': _from_paise(self._pos_entry_price.item(row))
+        }
+    
+    @property
+    def positions(self) -> Dict[str, Dict]:
+        """Open positions as symbol -> position info (read-only snapshot)."""
+        return {symbol: self.position_view(symbol) for symbol in self._pos_symbols}
     
     def get_position_pnl(self, symbol: str, current_price: float) -> Dict:
         """
@@ -264,10 +529,10 @@ class PaperTrader:
         Returns:
             Position P&L details
         """
-        if symbol not in self.positions:
+        position = self.position_view(symbol)
+        if position is None:
             return {'pnl': 0, 'pnl_pct': 0}
         
-        position = self.positions[symbol]
         pnl = (current_price - position['avg_price']) * position['quantity']
         pnl_pct = ((current_price - position['avg_price']) / position['avg_price']) * 100
         
@@ -310,8 +575,8 @@ class PaperTrader:
             'avg_win': avg_win,
             'avg_loss': avg_loss,
             'profit_factor': profit_factor,
-            'active_positions': len(self.positions),
-            'closed_positions': len(self.closed_positions)
+            'active_positions': len(self._pos_symbols),
+            'closed_positions': self.closed_count
         }
     
     def reset_daily(self, current_prices: Dict[str, float] = None):
@@ -321,35 +586,25 @@ class PaperTrader:
         Args:
             current_prices: Dictionary of symbol -> current price for position closing
         """
-        today = datetime.now().strftime('%Y-%m-%d')
+        now = datetime.now()
+        today = now.date().isoformat()
         self.logger.info(f"Paper Trading: End of day reset for {today}")
         
         # Calculate today's statistics before closing
-        day_trades = 0
-        day_wins = 0
-        day_losses = 0
+        counters = self.daily_counters.get(today, {'trades': 0, 'wins': 0, 'losses': 0})
+        day_trades = counters['trades']
+        day_wins = counters['wins']
+        day_losses = counters['losses']
         day_pnl = self.daily_pnl.get(today, 0.0)
         starting_capital = self.current_capital - day_pnl
         
-        # Count today's trades
-        for trade in reversed(self.trade_history):
-            trade_date = datetime.fromisoformat(trade['timestamp']).strftime('%Y-%m-%d')
-            if trade_date != today:
-                break
-            if trade['type'] == 'SELL':
-                day_trades += 1
-                if trade.get('pnl', 0) > 0:
-                    day_wins += 1
-                else:
-                    day_losses += 1
-        
         # Force close all open positions at end of day (intraday trading)
-        if self.positions:
-            self.logger.warning(f"Paper Trading: Closing {len(self.positions)} open positions at EOD")
+        if self._pos_symbols:
+            self.logger.warning(f"Paper Trading: Closing {len(self._pos_symbols)} open positions at EOD")
             
-            positions_to_close = list(self.positions.keys())
+            positions_to_close = list(self._pos_symbols)
             for symbol in positions_to_close:
-                position = self.positions[symbol]
+                position = self.position_view(symbol)
                 quantity = position['quantity']
                 
                 # Use current price if available, otherwise use avg price
@@ -365,7 +620,8 @@ class PaperTrader:
                     symbol=symbol,
                     transaction_type='SELL',
                     quantity=quantity,
-                    price=close_price
+                    price=close_price,
+                    _now=now
                 )
                 
                 if result['status'] == 'COMPLETE':
@@ -389,57 +645,311 @@ class PaperTrader:
         # Save state with updated stats
         self._save_state()
     
-    def _save_state(self):
-        """Save paper trading state to disk."""
+    def _serialize_positions(self) -> Dict[str, Dict]:
+        """Open positions with JSON-safe entry times."""
+        return {
+            symbol: {
+                **pos,
+                'entry_time': pos['entry_time'].isoformat()
+            }
+            for symbol, pos in self.positions.items()
+        }
+    
+    def _hot_state(self, binary: bool = False) -> Dict:
+        """
+        Small state needed to resume trading: capital, open positions, counters.
+        
+        With binary=True the position arrays are included as-is (paise, no
+        float conversion) for pickling instead of JSON-safe position dicts.
+        """
         state = {
             'initial_capital': self.initial_capital,
             'current_capital': self.current_capital,
             'available_capital': self.available_capital,
-            'positions': {
-                symbol: {
-                    **pos,
-                    'entry_time': pos['entry_time'].isoformat() if isinstance(pos['entry_time'], datetime) else pos['entry_time']
-                }
-                for symbol, pos in self.positions.items()
-            },
-            'closed_positions': self.closed_positions,
-            'trade_history': self.trade_history[-100:],  # Keep last 100 trades
-            'daily_pnl': self.daily_pnl,
-            'daily_stats': self.daily_stats,  # Save daily statistics
+            'daily_pnl': dict(self.daily_pnl),
+            'daily_counters': {day: dict(c) for day, c in self.daily_counters.items()},
             'total_trades': self.total_trades,
             'winning_trades': self.winning_trades,
             'losing_trades': self.losing_trades,
             'total_profit': self.total_profit,
             'total_loss': self.total_loss,
+            'closed_count': self.closed_count,
+            'daily_stats': list(self.daily_stats),
             'last_updated': datetime.now().isoformat()
         }
         
-        state_file = os.path.join(self.data_dir, 'paper_trading_state.json')
-        with open(state_file, 'w') as f:
-            json.dump(state, f, indent=2)
+        if binary:
+            state['available_paise'] = self._available_p
+            state['position_arrays'] = {
+                'symbols': list(self._pos_symbols),
+                'entry_time': list(self._pos_entry_time),
+                'quantity': self._pos_qty.copy(),
+                'avg_price': self._pos_avg.copy(),
+                'invested': self._pos_invested.copy(),
+                'entry_price': self._pos_entry_price.copy()
+            }
+        else:
+            state['positions'] = self._serialize_positions()
+        return state
+    
+    @staticmethod
+    def _dump_state(state: Dict, pretty: bool = False) -> bytes:
+        """Serialize state with orjson (indented only when pretty is set)."""
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(state, option=option)
+    
+    def _enqueue_save(self, path: str, state: Dict, fmt: str = 'json'):
+        """
+        Hand a state copy to the writer thread (replaces any unwritten save of path).
+        
+        Args:
+            path: Destination file
+            state: State dict (must not be mutated afterwards)
+            fmt: 'json', 'json_pretty' or 'pickle'
+        """
+        with self._save_cond:
+            self._pending_saves[path] = (state, fmt)
+            self._save_cond.notify_all()
+    
+    def _save_hot_state(self):
+        """Save the hot state; cost depends on open positions, not history."""
+        if self.snapshot_format == 'pickle':
+            self._enqueue_save(self.hot_state_file, self._hot_state(binary=True), 'pickle')
+        else:
+            self._enqueue_save(self.hot_state_file, self._hot_state())
+    
+    def _save_state(self):
+        """Save full paper trading state snapshot to disk."""
+        state = self._hot_state()
+        state.update({
+            'closed_positions': list(self.closed_positions),
+            'trade_history': list(self.trade_history)
+        })
+        
+        self._enqueue_save(self.state_file, state, 'json_pretty')
+        self._trades_since_snapshot = 0
+    
+    def _save_worker(self):
+        """Write queued state files, keeping only the latest pending save per file; exits after close()."""
+        while True:
+            with self._save_cond:
+                while not self._pending_saves and not self._save_stop:
+                    self._save_cond.wait()
+                if not self._pending_saves:
+                    return
+                pending = self._pending_saves
+                self._pending_saves = {}
+                self._save_writing = True
+            
+            for path, (state, fmt) in pending.items():
+                try:
+                    tmp_path = f"{path}.tmp"
+                    with open(tmp_path, 'wb') as f:
+                        if fmt == 'pickle':
+                            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                        else:
+                            f.write(self._dump_state(state, pretty=(fmt == 'json_pretty')))
+                    os.replace(tmp_path, path)
+                except Exception as e:
+                    self.logger.error(f"Failed to save paper trading state to {path}: {e}")
+            
+            with self._save_cond:
+                self._save_writing = False
+                self._save_cond.notify_all()
+    
+    def flush(self):
+        """Block until all queued state saves are on disk and the trade logs are flushed."""
+        with self._save_cond:
+            while self._pending_saves or self._save_writing:
+                self._save_cond.wait()
+        for log in (self._trade_log, self._closed_log):
+            if not log.closed:
+                log.flush()
+    
+    def close(self):
+        """Write pending saves, stop the writer thread and close the trade logs (idempotent; no trading afterwards)."""
+        with self._save_cond:
+            self._save_stop = True
+            self._save_cond.notify_all()
+        self._save_thread.join()
+        self._trade_log.close()
+        self._closed_log.close()
+        atexit.unregister(self.close)
+    
+    @staticmethod
+    def _iter_jsonl(path: str) -> Iterator[Dict]:
+        """Yield records from an append-only JSONL log."""
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield orjson.loads(line)
+    
+    @staticmethod
+    def _tail_jsonl(path: str, count: int) -> List[Dict]:
+        """Parse only the last `count` records of a JSONL log, reading backwards from the end."""
+        if count <= 0 or not os.path.exists(path):
+            return []
+        
+        with open(path, 'rb') as f:
+            pos = f.seek(0, os.SEEK_END)
+            data = b''
+            # One extra newline guarantees the first kept line is complete
+            while pos > 0 and data.count(b'\n') <= count:
+                step = min(65536, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+        
+        lines = [line for line in data.splitlines() if line.strip()]
+        return [orjson.loads(line) for line in lines[-count:]]
+    
+    def iter_trades(self) -> Iterator[Dict]:
+        """Lazily yield every recorded trade from the trade log (oldest first)."""
+        return self._iter_jsonl(self.trade_log_file)
+    
+    def iter_closed_positions(self) -> Iterator[Dict]:
+        """Lazily yield every closed position from the log (oldest first)."""
+        return self._iter_jsonl(self.closed_log_file)
+    
+    @staticmethod
+    def _read_state_files(state_file: str, hot_state_file: str,
+                          snapshot_format: str) -> Tuple[Optional[Dict], bool]:
+        """
+        Read the most recent of the hot state and the full snapshot.
+        
+        The small hot state is read first and the full snapshot is only parsed
+        if it was written later.
+        
+        Returns:
+            (state or None, whether it is the hot state)
+        """
+        state = None
+        hot = None
+        
+        hot_mtime = os.path.getmtime(hot_state_file) if os.path.exists(hot_state_file) else None
+        snapshot_mtime = os.path.getmtime(state_file) if os.path.exists(state_file) else None
+        
+        if hot_mtime is not None:
+            with open(hot_state_file, 'rb') as f:
+                if snapshot_format == 'pickle':
+                    hot = pickle.load(f)
+                else:
+                    hot = orjson.loads(f.read())
+        if snapshot_mtime is not None and (hot_mtime is None or snapshot_mtime >= hot_mtime):
+            with open(state_file, 'rb') as f:
+                state = orjson.loads(f.read())
+        
+        hot_is_newer = hot is not None and (
+            state is None or hot.get('last_updated', '') > state.get('last_updated', '')
+        )
+        if hot_is_newer:
+            state = hot
+        return state, hot_is_newer
+    
+    @classmethod
+    def read_state(cls, data_dir: str = 'ai_data', snapshot_format: str = 'pickle',
+                   history: int = TRADE_HISTORY_SIZE) -> Optional[Dict]:
+        """
+        Read the latest saved state without constructing a trader (e.g. for the dashboard).
+        
+        Uses whichever of the hot state and full snapshot is newer; when it is
+        the hot state, recent trades and closed positions come from the tail
+        of the JSONL logs.
+        
+        Args:
+            data_dir: Paper trading data directory
+            snapshot_format: Hot state format the trader was created with
+            history: Number of recent trades / closed positions to include
+        
+        Returns:
+            JSON-safe state dict (same keys as the full snapshot), or None
+        """
+        state_file, hot_state_file, trade_log_file, closed_log_file = _state_paths(data_dir, snapshot_format)
+        state, hot_is_newer = cls._read_state_files(state_file, hot_state_file, snapshot_format)
+        if state is None:
+            return None
+        
+        arrays = state.pop('position_arrays', None)
+        state.pop('available_paise', None)
+        if arrays is not None:
+            state['positions'] = {
+                symbol: {
+                    'quantity': int(arrays['quantity'][row]),
+                    'avg_price': _from_paise(int(arrays['avg_price'][row])),
+                    'invested': _from_paise(int(arrays['invested'][row])),
+                    'entry_time': arrays['entry_time'][row].isoformat(),
+                    'entry_price': _from_paise(int(arrays['entry_price'][row]))
+                }
+                for row, symbol in enumerate(arrays['symbols'])
+            }
+        
+        if hot_is_newer:
+            state['trade_history'] = cls._tail_jsonl(trade_log_file, history)
+            state['closed_positions'] = cls._tail_jsonl(closed_log_file, history)
+        return state
     
     def _load_state(self):
-        """Load paper trading state from disk."""
-        state_file = os.path.join(self.data_dir, 'paper_trading_state.json')
+        """
+        Load paper trading state from disk.
         
-        if not os.path.exists(state_file):
+        See _read_state_files; when the hot state is newest, recent history
+        comes from the tail of the JSONL logs, so startup cost doesn't grow
+        with total trades.
+        """
+        try:
+            state, hot_is_newer = self._read_state_files(
+                self.state_file, self.hot_state_file, self.snapshot_format
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to load paper trading state: {e}")
+            return
+        
+        if state is None:
             return
         
         try:
-            with open(state_file, 'r') as f:
-                state = json.load(f)
-            
             self.current_capital = state.get('current_capital', self.initial_capital)
             self.available_capital = state.get('available_capital', self.initial_capital)
+            if 'available_paise' in state:
+                self._available_p = state['available_paise']
+            
+            # Load positions (binary hot state carries the arrays directly)
+            arrays = state.get('position_arrays')
+            if arrays is not None:
+                self._pos_symbols = list(arrays['symbols'])
+                self._pos_entry_time = list(arrays['entry_time'])
+                self._pos_index = {symbol: row for row, symbol in enumerate(self._pos_symbols)}
+                self._pos_qty = arrays['quantity']
+                self._pos_avg = arrays['avg_price']
+                self._pos_invested = arrays['invested']
+                self._pos_entry_price = arrays['entry_price']
+            else:
+                for symbol, pos in state.get('positions', {}).items():
+                    self._add_position(
+                        symbol,
+                        pos['quantity'],
+                        _to_paise(pos['avg_price']),
+                        _to_paise(pos['invested']),
+                        datetime.fromisoformat(pos['entry_time']),
+                        _to_paise(pos['entry_price'])
+                    )
             
-            # Load positions
-            for symbol, pos in state.get('positions', {}).items():
-                pos['entry_time'] = datetime.fromisoformat(pos['entry_time'])
-                self.positions[symbol] = pos
+            if hot_is_newer:
+                trades = self._tail_jsonl(self.trade_log_file, TRADE_HISTORY_SIZE)
+                closed = self._tail_jsonl(self.closed_log_file, TRADE_HISTORY_SIZE)
+            else:
+                trades = state.get('trade_history', [])
+                closed = state.get('closed_positions', [])
+            self.trade_history = deque(trades, maxlen=TRADE_HISTORY_SIZE)
+            self.closed_positions = deque(closed, maxlen=TRADE_HISTORY_SIZE)
+            self.closed_count = state.get('closed_count', len(closed))
             
-            self.closed_positions = state.get('closed_positions', [])
-            self.trade_history = state.get('trade_history', [])
             self.daily_pnl = state.get('daily_pnl', {})
+            self.daily_counters = state.get('daily_counters', {})
             self.daily_stats = state.get('daily_stats', [])  # Load daily statistics
             self.total_trades = state.get('total_trades', 0)
             self.winning_trades = state.get('winning_trades', 0)
@@ -455,11 +965,11 @@ class PaperTrader:
     def get_positions(self) -> List[Dict]:
         """Get current positions (compatible with Kite API format)."""
         positions = []
-        for symbol, pos in self.positions.items():
+        for row, symbol in enumerate(self._pos_symbols):
             positions.append({
                 'tradingsymbol': symbol,
-                'quantity': pos['quantity'],
-                'average_price': pos['avg_price'],
+                'quantity': self._pos_qty.item(row),
+                'average_price': _from_paise(self._pos_avg.item(row)),
                 'pnl': 0,  # Would need current price to calculate
                 'product': 'MIS',  # Intraday
                 'exchange': 'NSE'
@@ -8,18 +8,112 @@ Combines the high-low intraday strategy with AI capabilities:
 - Continuous learning from trade outcomes
 - Dynamic risk management based on AI confidence
 """
+import itertools
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import os
+import time
+
+import numpy as np
 
 from .intraday_high_low_strategy import IntradayHighLowStrategy
-from ..ai_modules.pattern_recognition import PatternRecognizer
+from ..ai_modules.pattern_recognition import PatternRecognizer, score_candlestick_patterns
 from ..ai_modules.sentiment_analyzer import SentimentAnalyzer
 from ..ai_modules.predictive_model import PredictiveModel
+from ..ai_modules.state_store import AI_STATE_FILE, write_ai_state
 from ..ai_modules.trading_psychology import TradingPsychologyGuard
 
 
+def _quote_key(quote: Dict) -> Tuple:
+    """Identity of a quote for memoization: last price, OHLC and volume."""
+    ohlc = quote.get('ohlc', {})
+    return (
+        quote.get('last_price'),
+        ohlc.get('open'),
+        ohlc.get('high'),
+        ohlc.get('low'),
+        quote.get('volume')
+    )
+
+
+_BULL = ('hammer', 'bullish_engulfing', 'morning_star')
+_BEAR = ('shooting_star', 'bearish_engulfing', 'evening_star')
+
+# AI signal components and their weights in the combined vote
+_COMPONENTS = ('pattern', 'trend', 'sentiment', 'prediction', 'sr_levels')
+_COMPONENT_WEIGHTS = (0.2, 0.25, 0.15, 0.3, 0.1)
+_VOTES = {'BUY': 1, 'SELL': -1}
+_VOTE_SIGNALS = {1: 'BUY', -1: 'SELL', 0: None}
+
+# Seconds a last seen quote price stands in for a fresh get_ltp call
+LAST_PRICE_MAX_AGE = 2.0
+
+# Marks AIIntradayStrategy._saved_ai_state as not read from disk yet
+_NOT_LOADED = object()
+
+# Outcomes of the base/AI signal combination (see _get_raw_combined_signal)
+(_NO_SIGNAL, _CONSENSUS, _AI_ONLY, _AI_CONFLICT,
+ _AI_SELL_NO_POSITION, _BASE_SENTIMENT_CHECK) = range(6)
+
+
+def _build_decision_table() -> Dict[Tuple[Optional[str], Optional[str], bool, bool], int]:
+    """Outcome for every (base_signal, ai_signal, ai_confident, has_position)."""
+    signals = (None, 'BUY', 'SELL')
+    table = {}
+    for base, ai, confident, has_position in itertools.product(signals, signals, (False, True), (False, True)):
+        outcome = _NO_SIGNAL
+        if confident and base == ai and base:
+            # Both agree - strong signal
+            outcome = _CONSENSUS
+        elif confident and ai and ai != base:
+            # AI alone or in conflict with base; never SELL without a position
+            if ai == 'SELL' and not has_position:
+                outcome = _AI_SELL_NO_POSITION
+            else:
+                outcome = _AI_CONFLICT if base else _AI_ONLY
+        elif base:
+            # Low AI confidence (or no AI signal) - base strategy, if sentiment agrees
+            outcome = _BASE_SENTIMENT_CHECK
+        table[(base, ai, confident, has_position)] = outcome
+    return table
+
+
+_DECISION_TABLE = _build_decision_table()
+
+
+@lru_cache(maxsize=1024)
+def _pattern_signal(pattern_items: Tuple[Tuple[str, float], ...]) -> Optional[str]:
+    """Signal for a frozen (name, score) pattern tuple; see _interpret_patterns."""
+    get = dict(pattern_items).get
+    
+    bullish_score = sum(get(p, 0.0) for p in _BULL)
+    bearish_score = sum(get(p, 0.0) for p in _BEAR)
+    
+    if bullish_score > bearish_score and bullish_score > 0.6:
+        return 'BUY'
+    elif bearish_score > bullish_score and bearish_score > 0.6:
+        return 'SELL'
+    
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _trend_signal(direction: str, strength: float, confidence: float) -> Optional[str]:
+    """Signal for a trend reading; see _interpret_trend."""
+    if confidence < 0.5:
+        return None
+    
+    if direction == 'uptrend' and strength > 0.5:
+        return 'BUY'
+    elif direction == 'downtrend' and strength > 0.5:
+        return 'SELL'
+    
+    return None
+
+
 class AIIntradayStrategy(IntradayHighLowStrategy):
     """
     AI-powered intraday strategy that enhances the base strategy with:
@@ -29,6 +123,16 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
     - Continuous learning and adaptation
     """
     
+    __slots__ = ('_pattern_recognizer', '_sentiment_analyzer', '_predictive_model', '_saved_ai_state',
+                 'psychology_guard', 'ai_confidence_threshold', 'ai_trades', 'ai_data_dir',
+                 '_pattern_path', '_sentiment_path', '_model_path', '_ai_state_path',
+                 '_save_executor', '_ai_signal_cache', '_last_price',
+                 '_last_psych_check', '_last_tick', '_prev_close',
+                 'trade_entries')
+    
+    # Data directories already created in this process
+    _created_dirs = set()
+    
     def __init__(self,
                  trader,
                  symbols: List[str],
@@ -53,10 +157,11 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
             stop_loss_pct, name
         )
         
-        # Initialize AI modules
-        self.pattern_recognizer = PatternRecognizer(lookback_periods=100)
-        self.sentiment_analyzer = SentimentAnalyzer()
-        self.predictive_model = PredictiveModel()
+        # AI modules are built and restored on first use (see the properties below)
+        self._pattern_recognizer: Optional[PatternRecognizer] = None
+        self._sentiment_analyzer: Optional[SentimentAnalyzer] = None
+        self._predictive_model: Optional[PredictiveModel] = None
+        self._saved_ai_state = _NOT_LOADED
         
         # Initialize psychology guard for emotional control
         self.psychology_guard = TradingPsychologyGuard(
@@ -70,6 +175,24 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
         
         self.ai_confidence_threshold = ai_confidence_threshold
         
+        # Last quote key and AI signal per symbol; a repeated quote reuses the signal
+        self._ai_signal_cache: Dict[str, Tuple[Tuple, Dict]] = {}
+        
+        # Last quoted price per symbol with its monotonic timestamp
+        self._last_price: Dict[str, Tuple[float, float]] = {}
+        
+        # Psychology check that allowed the latest signal, reused for position sizing
+        self._last_psych_check: Dict[str, Tuple[str, Dict]] = {}
+        
+        # Last (quote key, has_position) fingerprint and base signal per symbol
+        self._last_tick: Dict[str, Tuple[Tuple, Optional[str]]] = {}
+        
+        # Previous close per symbol for the sentiment price change
+        self._prev_close: Dict[str, float] = {}
+        
+        # Open trade per symbol (price, time, signal, patterns) for learning on exit
+        self.trade_entries: Dict[str, Dict] = {}
+        
         # Track AI performance
         self.ai_trades = {
             'total': 0,
@@ -77,34 +200,109 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
             'failed': 0
         }
         
-        # AI data directory
+        # AI data directory and model files
         self.ai_data_dir = 'data/ai_data'
-        os.makedirs(self.ai_data_dir, exist_ok=True)
+        if self.ai_data_dir not in AIIntradayStrategy._created_dirs:
+            os.makedirs(self.ai_data_dir, exist_ok=True)
+            AIIntradayStrategy._created_dirs.add(self.ai_data_dir)
+        self._pattern_path = os.path.join(self.ai_data_dir, 'patterns.json')
+        self._sentiment_path = os.path.join(self.ai_data_dir, 'sentiment.json')
+        self._model_path = os.path.join(self.ai_data_dir, 'model.json')
+        self._ai_state_path = os.path.join(self.ai_data_dir, AI_STATE_FILE)
         
-        # Load previously learned patterns
-        self._load_ai_models()
+        # Single writer so checkpoints never block trading and never interleave
+        self._save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ai-state')
         
         self.logger.info(f"AI-Enhanced Strategy initialized with confidence threshold={ai_confidence_threshold}")
     
-    def _load_ai_models(self):
-        """Load previously trained AI models."""
-        pattern_file = os.path.join(self.ai_data_dir, 'patterns.json')
-        sentiment_file = os.path.join(self.ai_data_dir, 'sentiment.json')
-        model_file = os.path.join(self.ai_data_dir, 'model.json')
+    @property
+    def pattern_recognizer(self) -> PatternRecognizer:
+        """Pattern recognizer, built and restored from saved state on first use."""
+        if self._pattern_recognizer is None:
+            recognizer = PatternRecognizer(lookback_periods=100)
+            self._restore_ai_module(recognizer, 'patterns', recognizer.load_patterns, self._pattern_path)
+            self._pattern_recognizer = recognizer
+        return self._pattern_recognizer
+    
+    @property
+    def sentiment_analyzer(self) -> SentimentAnalyzer:
+        """Sentiment analyzer, built and restored from saved state on first use."""
+        if self._sentiment_analyzer is None:
+            analyzer = SentimentAnalyzer()
+            self._restore_ai_module(analyzer, 'sentiment', analyzer.load_sentiment_data, self._sentiment_path)
+            self._sentiment_analyzer = analyzer
+        return self._sentiment_analyzer
+    
+    @property
+    def predictive_model(self) -> PredictiveModel:
+        """Predictive model, built and restored from saved state on first use."""
+        if self._predictive_model is None:
+            model = PredictiveModel()
+            self._restore_ai_module(model, 'model', model.load_model, self._model_path)
+            self._predictive_model = model
+        return self._predictive_model
+    
+    def _load_ai_models(self) -> Optional[Dict]:
+        """
+        Read the consolidated AI state (ai_state.pkl) once.
         
-        self.pattern_recognizer.load_patterns(pattern_file)
-        self.sentiment_analyzer.load_sentiment_data(sentiment_file)
-        self.predictive_model.load_model(model_file)
+        Returns:
+            Dict with 'patterns', 'sentiment' and 'model' parts, or None when
+            there is no readable file (modules then use the legacy JSON files)
+        """
+        if self._saved_ai_state is _NOT_LOADED:
+            self._saved_ai_state = None
+            if os.path.exists(self._ai_state_path):
+                try:
+                    with open(self._ai_state_path, 'rb') as f:
+                        self._saved_ai_state = pickle.load(f)
+                    self.logger.info(f"AI state loaded from {self._ai_state_path}")
+                except Exception as e:
+                    self.logger.error(f"Error loading AI state, falling back to JSON files: {e}")
+        return self._saved_ai_state
+    
+    def _restore_ai_module(self, module, part: str, load_legacy, legacy_path: str):
+        """
+        Restore one AI module from ai_state.pkl, else from its JSON file.
+        
+        A JSON file written after ai_state.pkl (e.g. by an older training
+        script) wins, so retrained models are never shadowed by the pickle.
+        """
+        state = self._load_ai_models()
+        legacy_mtime = os.path.getmtime(legacy_path) if os.path.exists(legacy_path) else None
+        state_mtime = os.path.getmtime(self._ai_state_path) if os.path.exists(self._ai_state_path) else float('inf')
+        if state is not None and part in state and (legacy_mtime is None or legacy_mtime <= state_mtime):
+            module.set_state(state[part])
+        elif legacy_mtime is not None:
+            load_legacy(legacy_path)
     
     def _save_ai_models(self):
-        """Save trained AI models."""
-        pattern_file = os.path.join(self.ai_data_dir, 'patterns.json')
-        sentiment_file = os.path.join(self.ai_data_dir, 'sentiment.json')
-        model_file = os.path.join(self.ai_data_dir, 'model.json')
+        """Snapshot trained AI models and write them in the background."""
+        saved = self._load_ai_models() or {}
+        modules = (
+            ('patterns', self._pattern_recognizer, 'pattern_recognizer'),
+            ('sentiment', self._sentiment_analyzer, 'sentiment_analyzer'),
+            ('model', self._predictive_model, 'predictive_model')
+        )
+        
+        state = {}
+        for part, module, attr in modules:
+            if module is None and part in saved:
+                # Never used this session: carry the saved state over unchanged
+                state[part] = saved[part]
+            else:
+                state[part] = getattr(self, attr).get_state()
         
-        self.pattern_recognizer.save_patterns(pattern_file)
-        self.sentiment_analyzer.save_sentiment_data(sentiment_file)
-        self.predictive_model.save_model(model_file)
+        self._saved_ai_state = state
+        self._save_executor.submit(self._write_ai_state, state)
+    
+    def _write_ai_state(self, state: Dict):
+        """Pickle the AI state snapshot to ai_state.pkl (runs on the save executor)."""
+        try:
+            write_ai_state(self._ai_state_path, state)
+            self.logger.info(f"AI state saved to {self._ai_state_path}")
+        except Exception as e:
+            self.logger.error(f"Error saving AI state: {e}")
     
     def analyze(self, symbol: str, market_data: Dict) -> Optional[str]:
         """
@@ -117,45 +315,115 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
         4. Combine signals with intelligent weighting
         5. Apply emotion-free decision making
         """
-        # Update intraday data (base strategy)
-        self.update_intraday_data(symbol, market_data)
-        
-        # Update AI modules with market data
-        self._update_ai_modules(symbol, market_data)
-        
-        # Get base strategy signal
-        base_signal = super().analyze(symbol, market_data)
+        return self.analyze_batch(market_data, [symbol])[symbol]
+    
+    def analyze_batch(self, market_data: Dict,
+                      symbols: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+        """
+        Analyze several symbols from one quote snapshot.
         
-        # Get AI-enhanced signal
-        ai_signal = self._get_ai_signal(symbol, market_data)
+        Intraday data and AI module history are updated per symbol; base
+        signals (analyze_prices) and AI signals (_compute_ai_signals) for
+        every symbol with a new quote are then computed together. A tick
+        identical to the previous one for a symbol (same quote, same
+        position) skips all of that and reuses the previous base and AI
+        signals.
         
-        # Combine signals
-        final_signal = self._combine_signals(symbol, base_signal, ai_signal)
+        Args:
+            market_data: Quotes keyed by "NSE:<symbol>"
+            symbols: Symbols to analyze (default: all strategy symbols)
         
-        if final_signal:
-            self.logger.info(
-                f"AI Strategy signal for {symbol}: {final_signal} "
-                f"(base={base_signal}, ai={ai_signal['signal']}, "
-                f"confidence={ai_signal['confidence']:.2f})"
-            )
+        Returns:
+            Dict of symbol -> 'BUY', 'SELL', or None
+        """
+        if symbols is None:
+            symbols = self.symbols
+        
+        base_signals = {}
+        fingerprints = {}
+        priced = []
+        prices = []
+        stale = []
+        for symbol in symbols:
+            quote = market_data.get(self._quote_keys[symbol])
+            base_signals[symbol] = None
+            if quote is not None:
+                fingerprint = (_quote_key(quote), self.has_position(symbol))
+                last_tick = self._last_tick.get(symbol)
+                if last_tick is not None and last_tick[0] == fingerprint:
+                    # Duplicate tick: nothing for the intraday range, AI modules or base logic
+                    self._last_price[symbol] = (quote.get('last_price', 0), time.monotonic())
+                    base_signals[symbol] = last_tick[1]
+                    continue
+                fingerprints[symbol] = fingerprint
+            
+            # Update intraday data (base strategy) and AI modules
+            self.update_intraday_data(symbol, market_data)
+            self._update_ai_modules(symbol, market_data)
+            
+            if quote is not None:
+                current_price = quote.get('last_price', 0)
+                if current_price > 0:
+                    priced.append(symbol)
+                    prices.append(current_price)
+                if symbol not in self._ai_signal_cache:
+                    stale.append(symbol)
+        
+        # Base strategy signals for all changed quotes in one pass
+        if priced:
+            base_signals.update(self.analyze_prices(priced, np.array(prices, dtype=np.float64)))
+        for symbol, fingerprint in fingerprints.items():
+            self._last_tick[symbol] = (fingerprint, base_signals[symbol])
+        
+        # Fresh AI signals for all changed quotes in one pass
+        if stale:
+            fresh = self._compute_ai_signals(stale, market_data)
+            for symbol in stale:
+                self._ai_signal_cache[symbol] = (_quote_key(market_data[self._quote_keys[symbol]]), fresh[symbol])
+        
+        results = {}
+        for symbol in symbols:
+            base_signal = base_signals[symbol]
+            ai_signal = self._get_ai_signal(symbol, market_data)
+            
+            # Combine signals
+            final_signal = self._combine_signals(symbol, base_signal, ai_signal)
+            
+            if final_signal:
+                self.logger.info(
+                    "AI Strategy signal for %s: %s (base=%s, ai=%s, confidence=%.2f)",
+                    symbol, final_signal, base_signal, ai_signal['signal'], ai_signal['confidence']
+                )
+            
+            results[symbol] = final_signal
         
-        return final_signal
+        return results
     
     def _update_ai_modules(self, symbol: str, market_data: Dict):
         """Update all AI modules with latest market data."""
-        symbol_key = f"NSE:{symbol}"
+        symbol_key = self._quote_keys[symbol]
         if symbol_key not in market_data:
             return
         
         quote = market_data[symbol_key]
-        ohlc = quote.get('ohlc', {})
+        last_price = quote.get('last_price', 0)
+        self._last_price[symbol] = (last_price, time.monotonic())
+        
+        # Identical quote to the one behind the cached signal: nothing new to learn
+        cached = self._ai_signal_cache.get(symbol)
+        if cached is not None:
+            if cached[0] == _quote_key(quote):
+                return
+            del self._ai_signal_cache[symbol]
+        
+        ohlc_get = quote.get('ohlc', {}).get
         
         # Prepare candle data
         candle = {
-            'open': ohlc.get('open', quote.get('last_price', 0)),
-            'high': ohlc.get('high', quote.get('last_price', 0)),
-            'low': ohlc.get('low', quote.get('last_price', 0)),
-            'close': quote.get('last_price', 0),
+            'open': ohlc_get('open', last_price),
+            'high': ohlc_get('high', last_price),
+            'low': ohlc_get('low', last_price),
+            'close': last_price,
             'volume': quote.get('volume', 0)
         }
         
@@ -166,13 +434,13 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
         self.predictive_model.update_timeframe_data(symbol, '5m', candle)
         
         # Update sentiment based on price action
-        if symbol in self.intraday_data:
-            prev_close = self.intraday_data[symbol].get('prev_close', candle['close'])
-            price_change = ((candle['close'] - prev_close) / prev_close * 100) if prev_close > 0 else 0
+        if symbol in self._idx:
+            prev_close = self._prev_close.get(symbol, last_price)
+            price_change = ((last_price - prev_close) / prev_close * 100) if prev_close > 0 else 0
             volume_change = 0  # Would calculate from historical volume
             
             self.sentiment_analyzer.update_sentiment(symbol, price_change, volume_change)
-            self.intraday_data[symbol]['prev_close'] = candle['close']
+            self._prev_close[symbol] = last_price
     
     def _get_ai_signal(self, symbol: str, market_data: Dict) -> Dict:
         """
@@ -181,104 +449,148 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
         Returns:
             Dict with signal, confidence, and component scores
         """
-        # 1. Pattern Recognition
-        patterns = self.pattern_recognizer.detect_candlestick_patterns(symbol)
-        pattern_signal = self._interpret_patterns(patterns)
-        
-        # 2. Trend Analysis
-        trend = self.pattern_recognizer.detect_trend(symbol)
-        trend_signal = self._interpret_trend(trend)
-        
-        # 3. Sentiment Analysis
-        sentiment = self.sentiment_analyzer.get_sentiment_score(symbol)
-        sentiment_signal = self._interpret_sentiment(sentiment)
-        
-        # 4. Predictive Model
-        prediction = self.predictive_model.predict_price_movement(symbol)
-        prediction_signal = self._interpret_prediction(prediction)
-        
-        # 5. Support/Resistance
-        levels = self.pattern_recognizer.identify_support_resistance(symbol)
-        sr_signal = self._check_support_resistance(symbol, market_data, levels)
-        
-        # Combine all signals with weights
-        signals = {
-            'pattern': {'signal': pattern_signal, 'weight': 0.2},
-            'trend': {'signal': trend_signal, 'weight': 0.25},
-            'sentiment': {'signal': sentiment_signal, 'weight': 0.15},
-            'prediction': {'signal': prediction_signal, 'weight': 0.3},
-            'sr_levels': {'signal': sr_signal, 'weight': 0.1}
-        }
-        
-        # Calculate weighted signal
-        total_score = 0
-        total_weight = 0
+        quote = market_data.get(self._quote_keys[symbol])
+        key = _quote_key(quote) if quote is not None else None
+        cached = self._ai_signal_cache.get(symbol)
+        if key is not None and cached is not None and cached[0] == key:
+            return cached[1]
+        
+        ai_signal = self._compute_ai_signal(symbol, market_data)
+        if key is not None:
+            self._ai_signal_cache[symbol] = (key, ai_signal)
+        return ai_signal
+    
+    def _compute_ai_signal(self, symbol: str, market_data: Dict) -> Dict:
+        """Run all AI modules and combine their signals (uncached)."""
+        return self._compute_ai_signals([symbol], market_data)[symbol]
+    
+    def _compute_ai_signals(self, symbols: List[str], market_data: Dict) -> Dict[str, Dict]:
+        """
+        Run all AI modules for several symbols and combine their signals.
         
-        for component, data in signals.items():
-            if data['signal'] in ['BUY', 'SELL']:
-                score = 1 if data['signal'] == 'BUY' else -1
-                total_score += score * data['weight']
-                total_weight += data['weight']
+        Candlestick patterns are scored for all symbols at once and the
+        weighted vote is a single matrix-vector product; trend, sentiment,
+        prediction and support/resistance come from the stateful modules
+        symbol by symbol.
         
-        # Determine final AI signal
-        if total_weight == 0:
-            return {'signal': None, 'confidence': 0, 'components': signals}
+        Returns:
+            Dict of symbol -> {signal, confidence, components}
+        """
+        recognizer = self.pattern_recognizer
+        sentiment_analyzer = self.sentiment_analyzer
+        predictive_model = self.predictive_model
+        
+        # 1. Pattern Recognition (vectorized across symbols)
+        pattern_signals = dict.fromkeys(symbols)
+        recent = []
+        for symbol in symbols:
+            ohlc = recognizer.get_recent_ohlc(symbol)
+            if ohlc is not None:
+                recent.append((symbol, ohlc))
+        if recent:
+            scores = score_candlestick_patterns(np.stack([ohlc for _, ohlc in recent]))
+            for (symbol, _), signal in zip(recent, self._interpret_pattern_scores(scores)):
+                pattern_signals[symbol] = signal
+        
+        component_signals = []
+        levels_list = []
+        for symbol in symbols:
+            # 2. Trend Analysis
+            trend = recognizer.detect_trend(symbol)
+            trend_signal = self._interpret_trend(trend)
+            
+            # 3. Sentiment Analysis
+            sentiment = sentiment_analyzer.get_sentiment_score(symbol)
+            sentiment_signal = self._interpret_sentiment(symbol, sentiment)
+            
+            # 4. Predictive Model
+            prediction = predictive_model.predict_price_movement(symbol)
+            prediction_signal = self._interpret_prediction(prediction)
+            
+            # 5. Support/Resistance levels (checked for all symbols below)
+            levels_list.append(recognizer.identify_support_resistance(symbol))
+            
+            component_signals.append(
+                (pattern_signals[symbol], trend_signal, sentiment_signal, prediction_signal)
+            )
         
-        avg_score = total_score / total_weight
-        confidence = abs(avg_score)
+        sr_signals = self._support_resistance_signals(symbols, market_data, levels_list)
+        component_signals = [row + (sr,) for row, sr in zip(component_signals, sr_signals)]
         
-        if avg_score > 0.3:
-            final_signal = 'BUY'
-        elif avg_score < -0.3:
-            final_signal = 'SELL'
-        else:
-            final_signal = None
+        # Weighted vote: one row per symbol, +1 BUY / -1 SELL / 0 abstain
+        votes = np.array(
+            [[_VOTES.get(signal, 0) for signal in row] for row in component_signals],
+            dtype=np.int8
+        )
+        voted = votes != 0
+        # votes @ weights, accumulated column by column in component order so the
+        # sums (and the 0.3 threshold ties) match the old per-symbol loop exactly
+        total_score = np.zeros(len(symbols))
+        total_weight = np.zeros(len(symbols))
+        for k, weight in enumerate(_COMPONENT_WEIGHTS):
+            total_score += votes[:, k] * weight
+            total_weight += voted[:, k] * weight
+        avg_score = np.divide(total_score, total_weight,
+                              out=np.zeros_like(total_score), where=total_weight > 0)
+        final_votes = np.where(avg_score > 0.3, 1, np.where(avg_score < -0.3, -1, 0))
+        
+        # Per-component breakdown is only for logging; skip building it when unused
+        with_components = self.logger.isEnabledFor(logging.INFO)
+        
+        results = {}
+        for i, symbol in enumerate(symbols):
+            signals = {
+                component: {'signal': signal, 'weight': weight}
+                for component, signal, weight in zip(_COMPONENTS, component_signals[i], _COMPONENT_WEIGHTS)
+            } if with_components else None
+            
+            if total_weight[i] == 0:
+                results[symbol] = {'signal': None, 'confidence': 0, 'components': signals}
+                continue
+            
+            results[symbol] = {
+                'signal': _VOTE_SIGNALS[int(final_votes[i])],
+                'confidence': float(abs(avg_score[i])),
+                'components': signals
+            }
         
-        return {
-            'signal': final_signal,
-            'confidence': confidence,
-            'components': signals
-        }
+        return results
     
     def _interpret_patterns(self, patterns: Dict[str, float]) -> Optional[str]:
         """Interpret candlestick patterns."""
         if not patterns:
             return None
         
-        bullish_patterns = ['hammer', 'bullish_engulfing', 'morning_star']
-        bearish_patterns = ['shooting_star', 'bearish_engulfing', 'evening_star']
-        
-        bullish_score = sum(patterns.get(p, 0) for p in bullish_patterns)
-        bearish_score = sum(patterns.get(p, 0) for p in bearish_patterns)
+        return _pattern_signal(tuple(sorted(patterns.items())))
+    
+    def _interpret_pattern_scores(self, scores: np.ndarray) -> List[Optional[str]]:
+        """
+        Batch form of _interpret_patterns.
         
-        if bullish_score > bearish_score and bullish_score > 0.6:
-            return 'BUY'
-        elif bearish_score > bullish_score and bearish_score > 0.6:
-            return 'SELL'
+        Args:
+            scores: (N, 6) output of score_candlestick_patterns
         
-        return None
+        Returns:
+            One signal per row, same thresholds as _pattern_signal
+        """
+        bullish_score = scores[:, :3].sum(axis=1)
+        bearish_score = scores[:, 3:].sum(axis=1)
+        signals = np.where(
+            (bullish_score > bearish_score) & (bullish_score > 0.6), 'BUY',
+            np.where((bearish_score > bullish_score) & (bearish_score > 0.6), 'SELL', '')
+        )
+        return [signal or None for signal in signals.tolist()]
     
     def _interpret_trend(self, trend: Dict) -> Optional[str]:
         """Interpret trend analysis."""
-        if trend['confidence'] < 0.5:
-            return None
-        
-        if trend['direction'] == 'uptrend' and trend['strength'] > 0.5:
-            return 'BUY'
-        elif trend['direction'] == 'downtrend' and trend['strength'] > 0.5:
-            return 'SELL'
-        
-        return None
+        return _trend_signal(trend['direction'], trend['strength'], trend['confidence'])
     
-    def _interpret_sentiment(self, sentiment: Dict) -> Optional[str]:
-        """Interpret sentiment analysis."""
+    def _interpret_sentiment(self, symbol: str, sentiment: Dict) -> Optional[str]:
+        """Interpret sentiment analysis for the symbol being analyzed."""
         if sentiment['confidence'] < 0.4:
             return None
         
-        return self.sentiment_analyzer.get_sentiment_signal(
-            list(self.sentiment_analyzer.sentiment_cache.keys())[0] 
-            if self.sentiment_analyzer.sentiment_cache else None
-        )
+        return self.sentiment_analyzer.get_sentiment_signal(symbol)
     
     def _interpret_prediction(self, prediction: Dict) -> Optional[str]:
         """Interpret predictive model output."""
@@ -294,25 +606,40 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
     
     def _check_support_resistance(self, symbol: str, market_data: Dict, levels: Dict) -> Optional[str]:
         """Check if price is near support/resistance."""
-        symbol_key = f"NSE:{symbol}"
-        if symbol_key not in market_data:
-            return None
-        
-        current_price = market_data[symbol_key].get('last_price', 0)
-        if current_price == 0:
-            return None
-        
-        # Check if near support (buy opportunity)
-        for support in levels.get('support', [])[:2]:  # Check top 2 support levels
-            if abs(current_price - support) / support < 0.005:  # Within 0.5%
-                return 'BUY'
-        
-        # Check if near resistance (sell opportunity)
-        for resistance in levels.get('resistance', [])[:2]:
-            if abs(current_price - resistance) / resistance < 0.005:
-                return 'SELL'
+        return self._support_resistance_signals([symbol], market_data, [levels])[0]
+    
+    def _support_resistance_signals(self, symbols: List[str], market_data: Dict,
+                                    levels_list: List[Dict]) -> List[Optional[str]]:
+        """
+        Batch form of _check_support_resistance.
         
-        return None
+        The top two support and resistance levels of every symbol are stacked
+        into NaN-padded (N, 2) arrays and compared with the current prices in
+        one pass; price within 0.5% of a support is BUY, else of a resistance
+        is SELL.
+        """
+        n = len(symbols)
+        prices = np.zeros(n)
+        support = np.full((n, 2), np.nan)
+        resistance = np.full((n, 2), np.nan)
+        for i, (symbol, levels) in enumerate(zip(symbols, levels_list)):
+            quote = market_data.get(self._quote_keys[symbol])
+            if quote is not None:
+                prices[i] = quote.get('last_price', 0)
+            top_support = levels.get('support', [])[:2]  # Check top 2 support levels
+            top_resistance = levels.get('resistance', [])[:2]
+            support[i, :len(top_support)] = top_support
+            resistance[i, :len(top_resistance)] = top_resistance
+        
+        price_col = prices[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            near_support = (np.abs(price_col - support) / support < 0.005).any(axis=1)
+            near_resistance = (np.abs(price_col - resistance) / resistance < 0.005).any(axis=1)
+        
+        quoted = prices != 0
+        signals = np.where(quoted & near_support, 'BUY',
+                           np.where(quoted & near_resistance, 'SELL', ''))
+        return [signal or None for signal in signals.tolist()]
     
     def _combine_signals(self, symbol: str, base_signal: Optional[str], 
                         ai_signal: Dict) -> Optional[str]:
@@ -343,17 +670,19 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
         
         if not psych_check['allowed']:
             self.logger.warning(
-                f"{symbol}: Trade BLOCKED by psychology guard - {psych_check['reason']}"
+                "%s: Trade BLOCKED by psychology guard - %s", symbol, psych_check['reason']
             )
-            coaching = self.psychology_guard.get_emotional_coaching()
-            self.logger.info(coaching)
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(self.psychology_guard.get_emotional_coaching())
             return None
         
+        self._last_psych_check[symbol] = (raw_signal, psych_check)
+        
         # Log emotional state even when allowing trade
         if psych_check['emotional_state'] != 'neutral':
             self.logger.info(
-                f"{symbol}: Trading with {psych_check['emotional_state']} state - "
-                f"adjustment: {psych_check['adjustment']:.2f}x"
+                "%s: Trading with %s state - adjustment: %.2fx",
+                symbol, psych_check['emotional_state'], psych_check['adjustment']
             )
         
         return raw_signal
@@ -369,52 +698,44 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
         ai_conf = ai_signal['confidence']
         ai_sig = ai_signal['signal']
         
-        # Check position status for sell signals
-        has_position = self.has_position(symbol)
+        outcome = _DECISION_TABLE.get(
+            (base_signal, ai_sig, ai_conf >= self.ai_confidence_threshold, self.has_position(symbol)),
+            _NO_SIGNAL
+        )
         
-        # High AI confidence - trust the AI
-        if ai_conf >= self.ai_confidence_threshold:
-            # Both agree - strong signal
-            if base_signal == ai_sig and base_signal:
-                self.logger.info(f"{symbol}: Strong consensus - Base and AI agree on {base_signal}")
-                return base_signal
-            
-            # AI has signal, base doesn't - use AI
-            elif ai_sig and not base_signal:
-                # CRITICAL: Don't SELL if we have no position
-                if ai_sig == 'SELL' and not has_position:
-                    self.logger.debug(f"{symbol}: AI SELL signal ignored - no position to sell")
-                    return None
-                self.logger.info(f"{symbol}: AI signal {ai_sig} (confidence: {ai_conf:.2f})")
-                return ai_sig
-            
-            # Both have signals but disagree - use higher confidence source
-            elif ai_sig and base_signal and ai_sig != base_signal:
-                # CRITICAL: Don't SELL if we have no position
-                if ai_sig == 'SELL' and not has_position:
-                    self.logger.debug(f"{symbol}: AI SELL signal ignored - no position to sell")
-                    return None
-                self.logger.info(f"{symbol}: Conflict - AI={ai_sig}, Base={base_signal}. Using AI.")
-                return ai_sig
-        
-        # Low AI confidence - use base strategy
-        if base_signal:
+        if outcome == _CONSENSUS:
+            self.logger.info("%s: Strong consensus - Base and AI agree on %s", symbol, base_signal)
+            return base_signal
+        
+        if outcome == _AI_ONLY:
+            self.logger.info("%s: AI signal %s (confidence: %.2f)", symbol, ai_sig, ai_conf)
+            return ai_sig
+        
+        if outcome == _AI_CONFLICT:
+            self.logger.info("%s: Conflict - AI=%s, Base=%s. Using AI.", symbol, ai_sig, base_signal)
+            return ai_sig
+        
+        if outcome == _AI_SELL_NO_POSITION:
+            # CRITICAL: Don't SELL if we have no position
+            self.logger.debug("%s: AI SELL signal ignored - no position to sell", symbol)
+            return None
+        
+        if outcome == _BASE_SENTIMENT_CHECK:
             # Check sentiment supports the trade (risk management)
             if self.sentiment_analyzer.should_trade_based_on_sentiment(symbol, base_signal):
-                self.logger.info(f"{symbol}: Base strategy signal {base_signal} (AI confidence low)")
+                self.logger.info("%s: Base strategy signal %s (AI confidence low)", symbol, base_signal)
                 return base_signal
-            else:
-                self.logger.info(f"{symbol}: Base signal {base_signal} blocked by negative sentiment")
-                return None
+            self.logger.info("%s: Base signal %s blocked by negative sentiment", symbol, base_signal)
         
         return None
     
-    def calculate_position_size(self, symbol: str, signal: str) -> int:
+    def calculate_position_size(self, symbol: str, signal: str,
+                                ltp: Optional[float] = None) -> int:
         """
         Dynamic position sizing using AI confidence, sentiment, and psychology.
         """
         # Get base position size
-        base_size = super().calculate_position_size(symbol, signal)
+        base_size = super().calculate_position_size(symbol, signal, ltp=ltp)
         
         if base_size == 0:
             return 0
@@ -423,8 +744,13 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
         sentiment_adj = self.sentiment_analyzer.get_sentiment_adjustment(symbol)
         prediction_adj = self.predictive_model.get_confidence_adjustment(symbol)
         
-        # Get psychology adjustment (handles win/loss streaks)
-        psych_check = self.psychology_guard.should_allow_trade(symbol, signal, 0.5)
+        # Get psychology adjustment (handles win/loss streaks); reuse the check
+        # from _combine_signals for this signal instead of running it again
+        last_check = self._last_psych_check.pop(symbol, None)
+        if last_check is not None and last_check[0] == signal:
+            psych_check = last_check[1]
+        else:
+            psych_check = self.psychology_guard.should_allow_trade(symbol, signal, 0.5)
         psych_adj = psych_check.get('adjustment', 1.0)
         
         # Combined adjustment
@@ -434,28 +760,26 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
         adjusted_size = int(base_size * total_adjustment)
         
         self.logger.info(
-            f"{symbol} position size: {base_size} -> {adjusted_size} "
-            f"(sentiment: {sentiment_adj:.2f}x, prediction: {prediction_adj:.2f}x, "
-            f"psychology: {psych_adj:.2f}x)"
+            "%s position size: %s -> %s (sentiment: %.2fx, prediction: %.2fx, psychology: %.2fx)",
+            symbol, base_size, adjusted_size, sentiment_adj, prediction_adj, psych_adj
         )
         
         return max(1, adjusted_size)
     
-    def execute_signal(self, symbol: str, signal: str):
+    def execute_signal(self, symbol: str, signal: str, ltp: Optional[float] = None):
         """
         Execute trade and update AI models with outcome (continuous learning).
         """
         try:
             # Get entry price before execution
-            ltp_data = self.trader.get_ltp([symbol])
-            entry_price = ltp_data.get(f"NSE:{symbol}", 0)
+            entry_price = ltp if ltp is not None else self._current_price(symbol)
             
             if entry_price <= 0:
                 self.logger.error(f"Invalid entry price for {symbol}: {entry_price}")
                 return
             
             # Execute the trade
-            super().execute_signal(symbol, signal)
+            super().execute_signal(symbol, signal, ltp=ltp)
             
             # Record trade in psychology guard
             quantity = self.get_position_quantity(symbol)
@@ -464,18 +788,32 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
                     symbol, signal, entry_price, abs(quantity), None
                 )
             
-            # Track for later learning
-            if signal in ['BUY', 'SELL']:
-                if symbol not in self.entry_prices:
-                    self.entry_prices[symbol] = {
+            # Track the opening trade for later learning
+            if signal in ['BUY', 'SELL'] and self.has_position(symbol):
+                if symbol not in self.trade_entries:
+                    self.trade_entries[symbol] = {
                         'price': entry_price,
-                        'timestamp': datetime.now(),
+                        'timestamp_ns': time.monotonic_ns(),
                         'signal': signal,
                         'patterns': self.pattern_recognizer.detect_candlestick_patterns(symbol)
                     }
         except Exception as e:
             self.logger.error(f"Error executing signal for {symbol}: {e}", exc_info=True)
     
+    def _current_price(self, symbol: str) -> float:
+        """
+        Latest price for a symbol.
+        
+        Uses the price from the quote just analyzed when it is recent enough,
+        avoiding a broker round-trip; otherwise falls back to get_ltp.
+        """
+        cached = self._last_price.get(symbol)
+        if cached is not None and time.monotonic() - cached[1] <= LAST_PRICE_MAX_AGE:
+            return cached[0]
+        
+        ltp_data = self.trader.get_ltp([symbol])
+        return ltp_data.get(self._quote_keys[symbol], 0)
+    
     def _learn_from_trade(self, symbol: str, success: bool):
         """
         Continuous learning from trade outcomes.
@@ -489,8 +827,8 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
             self.ai_trades['failed'] += 1
         
         # Update pattern recognizer
-        if symbol in self.entry_prices and 'patterns' in self.entry_prices[symbol]:
-            for pattern_name in self.entry_prices[symbol]['patterns'].keys():
+        if symbol in self.trade_entries and 'patterns' in self.trade_entries[symbol]:
+            for pattern_name in self.trade_entries[symbol]['patterns'].keys():
                 self.pattern_recognizer.learn_from_pattern(pattern_name, success)
         
         # Update predictive model
@@ -514,13 +852,12 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
             super().update_position(symbol, transaction_type, quantity)
             
             # If closing a position (SELL after BUY), learn from it
-            if transaction_type == 'SELL' and symbol in self.entry_prices:
-                entry_price = self.entry_prices[symbol].get('price', 0)
+            if transaction_type == 'SELL' and symbol in self.trade_entries:
+                entry_price = self.trade_entries[symbol].get('price', 0)
                 
                 # Get current exit price
                 try:
-                    ltp_data = self.trader.get_ltp([symbol])
-                    exit_price = ltp_data.get(f"NSE:{symbol}", 0)
+                    exit_price = self._current_price(symbol)
                 except Exception as e:
                     self.logger.warning(f"Could not get exit price for {symbol}: {e}")
                     exit_price = 0
@@ -536,12 +873,7 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
                 
                     # Update capital tracking
                     try:
-                        if hasattr(self.trader, 'margins'):
-                            margins = self.trader.margins()
-                        elif hasattr(self.trader, 'kite'):
-                            margins = self.trader.kite.margins()
-                        else:
-                            margins = {}
+                        margins = self._get_margins() or {}
                         current_capital = margins.get('equity', {}).get('available', {}).get('cash', 0)
                         self.psychology_guard.update_capital(current_capital)
                     except Exception as e:
@@ -549,6 +881,10 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
                     
                     # Learn from the trade
                     self._learn_from_trade(symbol, success)
+                
+                # Position closed; the next entry starts a new record
+                if not self.has_position(symbol):
+                    del self.trade_entries[symbol]
         except Exception as e:
             self.logger.error(f"Error in update_position for {symbol}: {e}", exc_info=True)
     
@@ -568,6 +904,9 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
     def reset_daily_data(self):
         """Reset daily data including psychology guard."""
         super().reset_daily_data()
+        self._last_tick.clear()
+        self._prev_close.clear()
+        self.trade_entries.clear()
         
         # Reset psychology guard with current capital
         try:
@@ -580,6 +919,7 @@ class AIIntradayStrategy(IntradayHighLowStrategy):
     def cleanup(self):
         """Save AI models before cleanup."""
         self._save_ai_models()
+        self._save_executor.shutdown(wait=True)
         
         # Log final discipline report
         discipline_report = self.psychology_guard.get_discipline_report()
@@ -2,14 +2,53 @@
 Base strategy class that all trading strategies should inherit from.
 """
 import logging
+import time
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from kiteconnect.exceptions import KiteException
+from requests import RequestException
+
+
+# Symbols per quote call in run_iteration, and concurrent calls when there are several
+QUOTE_BATCH_SIZE = 200
+QUOTE_FETCH_WORKERS = 4
+
+# Threads (in-flight quote requests) while validating symbols
+VALIDATE_CONCURRENCY = 20
+
+# Seconds a margins() response is reused for position sizing within one iteration
+MARGINS_TTL = 1.0
+
+# Errors that cost a symbol its signal for one iteration instead of stopping
+# the loop: broker/network failures during analysis (e.g. an LTP lookup) and
+# malformed quote data. Anything else is a bug and propagates.
+ANALYZE_ERRORS = (KiteException, RequestException, KeyError, TypeError, ValueError, ZeroDivisionError)
+
+
+class _QuoteKeys(dict):
+    """Symbol -> "<EXCHANGE>:<symbol>" quote key, built on first use and reused."""
+    
+    def __init__(self, exchange: str, symbols=()):
+        super().__init__((symbol, f"{exchange}:{symbol}") for symbol in symbols)
+        self.exchange = exchange
+    
+    def __missing__(self, symbol: str) -> str:
+        key = self[symbol] = f"{self.exchange}:{symbol}"
+        return key
+
 
 class BaseStrategy(ABC):
     """Abstract base class for trading strategies."""
     
+    # Fixed attribute layout; subclasses declare their own __slots__
+    __slots__ = ('trader', 'symbols', 'name', 'logger', 'positions', 'signals',
+                 '_symbol_failures', '_quote_keys', '_bse_keys', '_pool',
+                 '_margins_cache', '_margins_ts', '_iter_now', '_active_positions')
+    
     def __init__(self, trader, symbols: List[str], name: str = "BaseStrategy"):
         """
         Initialize the strategy.
@@ -24,7 +63,16 @@ class BaseStrategy(ABC):
         self.name = name
         self.logger = logging.getLogger(f"{__name__}.{name}")
         self.positions = {}  # Track current positions
+        self._active_positions = 0  # Positions with non-zero quantity
         self.signals = {}  # Track generated signals
+        # Track symbols with consecutive failures to reduce log spam
+        self._symbol_failures: Dict[str, int] = defaultdict(int)  # symbol -> consecutive failure count
+        self._quote_keys = _QuoteKeys('NSE', symbols)
+        self._bse_keys = _QuoteKeys('BSE', symbols)
+        self._pool = None  # Quote fetch threads, created on first iteration
+        self._margins_cache = None  # Last margins() response and when it was fetched
+        self._margins_ts = 0.0
+        self._iter_now = None  # Timestamp of the iteration in progress
     
     @abstractmethod
     def analyze(self, symbol: str, market_data: Dict) -> Optional[str]:
@@ -40,33 +88,66 @@ class BaseStrategy(ABC):
         """
         pass
     
+    def analyze_batch(self, market_data: Dict,
+                      symbols: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+        """
+        Analyze several symbols from one quote snapshot.
+        
+        The default calls analyze per symbol (see _analyze_each); strategies
+        that can evaluate all symbols together override it.
+        
+        Args:
+            market_data: Quotes keyed by instrument key ("NSE:<symbol>", "BSE:<symbol>")
+            symbols: Symbols to analyze (default: all strategy symbols)
+        
+        Returns:
+            Dict of symbol -> 'BUY', 'SELL', or None
+        """
+        if symbols is None:
+            symbols = self.symbols
+        return self._analyze_each(market_data, symbols)
+    
+    def _analyze_each(self, market_data: Dict, symbols: List[str]) -> Dict[str, Optional[str]]:
+        """Analyze symbols one at a time; a symbol raising ANALYZE_ERRORS gets no signal."""
+        signals = {}
+        for symbol in symbols:
+            try:
+                signals[symbol] = self.analyze(symbol, market_data)
+            except ANALYZE_ERRORS:
+                self.logger.exception("Error analyzing %s", symbol)
+                signals[symbol] = None
+        return signals
+    
     @abstractmethod
-    def calculate_position_size(self, symbol: str, signal: str) -> int:
+    def calculate_position_size(self, symbol: str, signal: str,
+                                ltp: Optional[float] = None) -> int:
         """
         Calculate position size based on risk management rules.
         
         Args:
             symbol: Trading symbol
             signal: Trading signal (BUY/SELL)
+            ltp: Last traded price if already known (skips fetching it)
         
         Returns:
             Number of shares to trade
         """
         pass
     
-    def execute_signal(self, symbol: str, signal: str):
+    def execute_signal(self, symbol: str, signal: str, ltp: Optional[float] = None):
         """
         Execute a trading signal.
         
         Args:
             symbol: Trading symbol
             signal: Trading signal (BUY/SELL)
+            ltp: Last traded price if already known
         """
         try:
-            quantity = self.calculate_position_size(symbol, signal)
+            quantity = self.calculate_position_size(symbol, signal, ltp=ltp)
             
             if quantity <= 0:
-                self.logger.warning(f"Invalid position size for {symbol}: {quantity}")
+                self.logger.warning("Invalid position size for %s: %s", symbol, quantity)
                 return
             
             # Place the order
@@ -79,26 +160,62 @@ class BaseStrategy(ABC):
             )
             
             if order_id:
-                self.logger.info(f"Order executed: {signal} {quantity} {symbol} - Order ID: {order_id}")
+                self.logger.info("Order executed: %s %s %s - Order ID: %s", signal, quantity, symbol, order_id)
+                self._margins_cache = None  # Cash changed; next sizing must refetch
                 self.update_position(symbol, signal, quantity)
             else:
-                self.logger.error(f"Failed to execute order for {symbol}")
+                self.logger.error("Failed to execute order for %s", symbol)
                 
         except Exception as e:
-            self.logger.error(f"Error executing signal for {symbol}: {str(e)}")
+            self.logger.error("Error executing signal for %s: %s", symbol, e)
+    
+    def _get_margins(self, ttl: float = MARGINS_TTL) -> Optional[Dict]:
+        """
+        Account margins, reusing the last response for up to ttl seconds.
+        
+        Works with both the real trader and the paper trading wrapper.
+        
+        Returns:
+            Margins dict, or None if the trader has no margins() method
+        """
+        now = time.monotonic()
+        if self._margins_cache is not None and now - self._margins_ts < ttl:
+            return self._margins_cache
+        
+        if hasattr(self.trader, 'margins'):
+            margins = self.trader.margins()
+        elif hasattr(self.trader, 'kite') and hasattr(self.trader.kite, 'margins'):
+            margins = self.trader.kite.margins()
+        else:
+            return None
+        
+        self._margins_cache = margins
+        self._margins_ts = now
+        return margins
     
     def update_position(self, symbol: str, transaction_type: str, quantity: int):
         """Update internal position tracking."""
-        if symbol not in self.positions:
-            self.positions[symbol] = {'quantity': 0, 'last_action': None}
+        position = self.positions.get(symbol)
+        if position is None:
+            position = self.positions[symbol] = {'quantity': 0, 'last_action': None}
         
+        was_open = position['quantity'] != 0
         if transaction_type == "BUY":
-            self.positions[symbol]['quantity'] += quantity
+            position['quantity'] += quantity
         elif transaction_type == "SELL":
-            self.positions[symbol]['quantity'] -= quantity
+            position['quantity'] -= quantity
         
-        self.positions[symbol]['last_action'] = transaction_type
-        self.positions[symbol]['timestamp'] = datetime.now()
+        # Keep the open-position count in step when the quantity crosses zero
+        is_open = position['quantity'] != 0
+        if is_open != was_open:
+            self._active_positions += 1 if is_open else -1
+        
+        position['last_action'] = transaction_type
+        position['timestamp'] = self._now()
+    
+    def _now(self) -> datetime:
+        """Timestamp of the current run_iteration, or the wall clock outside one."""
+        return self._iter_now or datetime.now()
     
     def has_position(self, symbol: str) -> bool:
         """Check if we have an open position in the symbol."""
@@ -110,68 +227,135 @@ class BaseStrategy(ABC):
             return self.positions[symbol]['quantity']
         return 0
     
+    def _fetch_all_quotes(self) -> Dict[str, Dict]:
+        """
+        Fetch quotes for all symbols in as few broker calls as possible.
+        
+        Symbols are requested in chunks of QUOTE_BATCH_SIZE (Kite's quote
+        endpoint takes up to 500 instruments per call); when there are
+        several chunks they are fetched concurrently on a small thread pool.
+        Analysis stays on the calling thread: strategy and AI module state
+        is not thread-safe.
+        
+        Returns:
+            Dict of instrument key -> quote for everything the broker returned
+        """
+        symbols = self.symbols
+        chunks = [symbols[i:i + QUOTE_BATCH_SIZE] for i in range(0, len(symbols), QUOTE_BATCH_SIZE)]
+        
+        if len(chunks) > 1:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=QUOTE_FETCH_WORKERS,
+                                                thread_name_prefix='quote-fetch')
+            futures = [self._pool.submit(self.trader.get_quote, chunk) for chunk in chunks]
+        else:
+            futures = None
+        
+        quotes = {}
+        for i, chunk in enumerate(chunks):
+            try:
+                data = futures[i].result() if futures else self.trader.get_quote(chunk)
+            except Exception as e:
+                self.logger.error("Error fetching quotes for %d symbols: %s", len(chunk), e)
+                continue
+            if data:
+                quotes.update(data)
+        return quotes
+    
+    def _resolve_key(self, symbol: str, quote: Dict) -> Optional[str]:
+        """Return the symbol's NSE key if present in quote, else its BSE key, else None."""
+        return next((key for key in (self._quote_keys[symbol], self._bse_keys[symbol]) if key in quote), None)
+    
+    def _record_quote_failure(self, symbol: str):
+        """Count a missing quote for a symbol, warning on the 1st and every 10th miss."""
+        self._symbol_failures[symbol] += 1
+        failures = self._symbol_failures[symbol]
+        
+        # Only log warning every 10 attempts to reduce spam
+        if failures == 1 or failures % 10 == 0:
+            self.logger.warning("No quote data for %s (attempt %d)", symbol, failures)
+    
     def run_iteration(self):
         """Run one iteration of the strategy for all symbols."""
-        # Track symbols with consecutive failures to reduce log spam
-        if not hasattr(self, '_symbol_failures'):
-            self._symbol_failures = {}  # symbol -> consecutive failure count
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Starting iteration for %d symbols: %s...",
+                              len(self.symbols), ', '.join(self.symbols[:5]))
         
-        self.logger.debug(f"Starting iteration for {len(self.symbols)} symbols: {', '.join(self.symbols[:5])}...")
+        # One timestamp for everything recorded during this iteration
+        self._iter_now = datetime.now()
+        try:
+            self._run_iteration()
+        finally:
+            self._iter_now = None
+    
+    def _run_iteration(self):
+        """Fetch, analyze and execute for all symbols (see run_iteration)."""
+        # One batched fetch for every symbol
+        market_data = self._fetch_all_quotes()
         
+        quoted = []
         for symbol in self.symbols:
-            try:
-                # Fetch market data
-                quote = self.trader.get_quote([symbol])
-                
-                if not quote:
-                    # Track consecutive failures
-                    self._symbol_failures[symbol] = self._symbol_failures.get(symbol, 0) + 1
-                    
-                    # Only log warning every 10 attempts to reduce spam
-                    if self._symbol_failures[symbol] == 1 or self._symbol_failures[symbol] % 10 == 0:
-                        self.logger.warning(
-                            f"No quote data for {symbol} (attempt {self._symbol_failures[symbol]})"
-                        )
-                    continue
-                
-                # Validate that the symbol key exists in quote data
-                symbol_key = f"NSE:{symbol}"
-                if symbol_key not in quote and f"BSE:{symbol}" not in quote:
-                    # Track consecutive failures
-                    self._symbol_failures[symbol] = self._symbol_failures.get(symbol, 0) + 1
-                    
-                    # Only log warning every 10 attempts
-                    if self._symbol_failures[symbol] == 1 or self._symbol_failures[symbol] % 10 == 0:
-                        self.logger.warning(
-                            f"No quote data for {symbol} (attempt {self._symbol_failures[symbol]})"
-                        )
-                    continue
-                
-                # Success - reset failure count
-                if symbol in self._symbol_failures:
-                    del self._symbol_failures[symbol]
-                
-                # Analyze and generate signal
-                signal = self.analyze(symbol, quote)
-                
-                if signal:
-                    self.logger.info(f"Signal generated for {symbol}: {signal}")
-                    self.execute_signal(symbol, signal)
-                    
-            except Exception as e:
-                self.logger.error(f"Error in iteration for {symbol}: {str(e)}")
+            if self._resolve_key(symbol, market_data) is None:
+                self._record_quote_failure(symbol)
+                continue
+            
+            # Success - reset failure count
+            self._symbol_failures.pop(symbol, None)
+            quoted.append(symbol)
+        
+        if not quoted:
+            return
+        
+        # Phase 1: analyze every quoted symbol in one call. If one symbol's
+        # quote or broker call breaks the batch, retry symbol by symbol so
+        # only the symbols that still fail lose their signal
+        try:
+            signals = self.analyze_batch(market_data, quoted)
+        except ANALYZE_ERRORS:
+            self.logger.warning("Batch analysis of %d symbols failed, analyzing one by one",
+                                len(quoted), exc_info=True)
+            signals = None
+        if signals is None:
+            signals = self._analyze_each(market_data, quoted)
+        
+        pending_signals = []
+        for symbol in quoted:
+            signal = signals.get(symbol)
+            if signal:
+                self.logger.info("Signal generated for %s: %s", symbol, signal)
+                pending_signals.append((symbol, signal))
+        
+        if not pending_signals:
+            return
+        
+        # Phase 2: one LTP call for all signals, then size and execute each
+        # (execute_signal handles and logs its own errors)
+        ltps = self._fetch_ltps([symbol for symbol, _ in pending_signals])
+        for symbol, signal in pending_signals:
+            self.execute_signal(symbol, signal, ltp=ltps.get(self._quote_keys[symbol]))
+    
+    def _fetch_ltps(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Last traded prices for several symbols in one broker call.
+        
+        Returns:
+            Dict of "NSE:<symbol>" -> price; empty if the call fails (sizing
+            then fetches prices per symbol)
+        """
+        try:
+            return self.trader.get_ltp(symbols) or {}
+        except Exception as e:
+            self.logger.error("Error fetching LTP for %d signals: %s", len(symbols), e)
+            return {}
     
     def reset_symbol_failures(self):
         """Reset the failure counts for all symbols to retry fetching quotes."""
-        if hasattr(self, '_symbol_failures'):
-            self._symbol_failures.clear()
-            self.logger.info("Reset symbol failure tracking")
+        self._symbol_failures.clear()
+        self.logger.info("Reset symbol failure tracking")
     
     def get_failing_symbols(self):
         """Get symbols that are currently failing with their failure counts."""
-        if hasattr(self, '_symbol_failures'):
-            return self._symbol_failures.copy()
-        return {}
+        return dict(self._symbol_failures)
     
     def remove_failing_symbols(self, failure_threshold: int = 20):
         """
@@ -183,9 +367,6 @@ class BaseStrategy(ABC):
         Returns:
             List of symbols that were removed
         """
-        if not hasattr(self, '_symbol_failures'):
-            return []
-        
         symbols_to_remove = [
             symbol for symbol, count in self._symbol_failures.items()
             if count >= failure_threshold
@@ -197,17 +378,30 @@ class BaseStrategy(ABC):
                 f"{', '.join(symbols_to_remove)}"
             )
             
-            # Remove from symbol list
-            self.symbols = [s for s in self.symbols if s not in symbols_to_remove]
+            # Remove from symbol list (set lookup keeps this O(N + M))
+            removed = set(symbols_to_remove)
+            self.symbols = [s for s in self.symbols if s not in removed]
             
             # Remove from failure tracking
             for symbol in symbols_to_remove:
-                del self._symbol_failures[symbol]
+                self._symbol_failures.pop(symbol, None)
+                self._quote_keys.pop(symbol, None)
+                self._bse_keys.pop(symbol, None)
             
             self.logger.info(f"Active symbols remaining: {len(self.symbols)}")
         
         return symbols_to_remove
     
+    def _validate_one(self, symbol: str) -> bool:
+        """Check that one symbol returns quote data."""
+        try:
+            quote = self.trader.get_quote([symbol])
+        except Exception as e:
+            self.logger.debug("Failed to validate %s: %s", symbol, e)
+            return False
+        
+        return bool(quote) and self._resolve_key(symbol, quote) is not None
+    
     def validate_symbols(self, symbols_to_check: list) -> list:
         """
         Validate symbols by checking if they can get quote data.
@@ -223,17 +417,15 @@ class BaseStrategy(ABC):
         
         self.logger.info(f"Validating {len(symbols_to_check)} symbols...")
         
-        for symbol in symbols_to_check:
-            try:
-                quote = self.trader.get_quote([symbol])
-                symbol_key = f"NSE:{symbol}"
-                
-                if quote and (symbol_key in quote or f"BSE:{symbol}" in quote):
-                    valid_symbols.append(symbol)
-                else:
-                    invalid_symbols.append(symbol)
-            except Exception as e:
-                self.logger.debug(f"Failed to validate {symbol}: {e}")
+        # Quote calls are I/O-bound and release the GIL, so threads overlap them
+        workers = max(1, min(VALIDATE_CONCURRENCY, len(symbols_to_check)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='validate') as executor:
+            results = list(executor.map(self._validate_one, symbols_to_check))
+        
+        for symbol, is_valid in zip(symbols_to_check, results):
+            if is_valid:
+                valid_symbols.append(symbol)
+            else:
                 invalid_symbols.append(symbol)
         
         if invalid_symbols:
@@ -248,7 +440,10 @@ class BaseStrategy(ABC):
     def cleanup(self):
         """Cleanup operations, close positions, etc."""
         self.logger.info(f"Cleaning up strategy: {self.name}")
-        if hasattr(self, '_symbol_failures') and self._symbol_failures:
+        if self._symbol_failures:
             failing = ', '.join(f"{sym}({count})" for sym, count in sorted(self._symbol_failures.items()))
             self.logger.info(f"Symbols with quote failures: {failing}")
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
         # Implement cleanup logic as needed
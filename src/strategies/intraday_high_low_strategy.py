@@ -14,9 +14,56 @@ Logic:
 import logging
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
+
+import numpy as np
+
 from .base_strategy import BaseStrategy
 
 
+def compute_intraday_signals(prices: np.ndarray, positions: np.ndarray, highs: np.ndarray,
+                             have_position: np.ndarray, entry_prices: np.ndarray,
+                             buy_threshold: float, sell_threshold: float,
+                             min_profit_margin: float, risk_reward_ratio: float,
+                             stop_loss_pct: float):
+    """
+    Vectorized buy/sell rules of IntradayHighLowStrategy for N symbols.
+    
+    Same arithmetic as calculate_profit_potential, evaluated as array masks.
+    
+    Args:
+        prices: Current prices (all > 0)
+        positions: Price position in the day's range (0-1)
+        highs: Day highs (buy target)
+        have_position: Whether each symbol has an open position
+        entry_prices: Entry price per symbol (only read where have_position)
+        buy_threshold, sell_threshold: Price position limits for buy/sell zones
+        min_profit_margin: Minimum profit margin for both sides
+        risk_reward_ratio: Minimum risk-reward for buys
+        stop_loss_pct: Stop loss below the buy price
+    
+    Returns:
+        (buys, sells) int8 arrays: 1 = signal, -1 = in the zone but rejected
+        on profit checks, 0 = not in the zone
+    """
+    # BUY: price near lows, target is day high, stop loss below current
+    potential_profit = highs - prices
+    potential_loss = prices - prices * (1 - stop_loss_pct)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        risk_reward = np.where(potential_loss > 0, potential_profit / potential_loss, 0.0)
+    buy_zone = ~have_position & (positions <= buy_threshold)
+    buy_ok = (potential_profit / prices >= min_profit_margin) & (risk_reward >= risk_reward_ratio)
+    
+    # SELL: price near highs, profit over entry price reached
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sell_margin = np.where(entry_prices > 0, (prices - entry_prices) / entry_prices, 0.0)
+    sell_zone = have_position & (positions >= sell_threshold)
+    sell_ok = sell_margin >= min_profit_margin
+    
+    buys = np.where(buy_ok, 1, -1).astype(np.int8) * buy_zone
+    sells = np.where(sell_ok, 1, -1).astype(np.int8) * sell_zone
+    return buys, sells
+
+
 class IntradayHighLowStrategy(BaseStrategy):
     """
     Intraday trading strategy based on high/low analysis with margin calculations.
@@ -27,6 +74,11 @@ class IntradayHighLowStrategy(BaseStrategy):
     - Risk-reward ratio ensures profitable trades
     """
     
+    __slots__ = ('min_profit_margin', 'buy_threshold', 'sell_threshold', 'risk_reward_ratio',
+                 'max_position_pct', 'stop_loss_pct',
+                 '_idx', '_intraday_symbols', '_intraday_updated', '_high', '_low', '_open', '_entry',
+                 '_metrics_dirty', '_metrics_cache', '_metrics_symbols')
+    
     def __init__(self, 
                  trader,
                  symbols: List[str],
@@ -60,9 +112,23 @@ class IntradayHighLowStrategy(BaseStrategy):
         self.max_position_pct = max_position_pct
         self.stop_loss_pct = stop_loss_pct
         
-        # Track intraday metrics for each symbol
-        self.intraday_data = {}
-        self.entry_prices = {}  # Track entry prices for profit calculation
+        # Intraday high/low/open per symbol as parallel arrays (one row per
+        # symbol seen today, row number in _idx). Arrays are preallocated for
+        # the watchlist and double when full; rows past len(_intraday_symbols)
+        # are unused.
+        self._idx: Dict[str, int] = {}
+        self._intraday_symbols: List[str] = []
+        self._intraday_updated: List[datetime] = []
+        capacity = max(len(symbols), 1)
+        self._high = np.empty(capacity)
+        self._low = np.empty(capacity)
+        self._open = np.empty(capacity)
+        self._entry = np.empty(capacity)  # Entry price for profit calculation (NaN = none)
+        
+        # Per-symbol range metrics, rebuilt only after the ranges or symbol list change
+        self._metrics_dirty = True
+        self._metrics_cache: Dict[str, Dict] = {}
+        self._metrics_symbols = None
         
         self.logger.info(f"Initialized {name} with min_profit_margin={min_profit_margin}, "
                         f"risk_reward={risk_reward_ratio}")
@@ -75,34 +141,77 @@ class IntradayHighLowStrategy(BaseStrategy):
             symbol: Trading symbol
             market_data: Market data from quote API
         """
-        symbol_key = f"NSE:{symbol}"
+        symbol_key = self._quote_keys[symbol]
         
-        if symbol_key not in market_data:
-            self.logger.warning(f"No data for {symbol_key}")
+        quote = market_data.get(symbol_key)
+        if quote is None:
+            self.logger.warning("No data for %s", symbol_key)
             return
         
-        quote = market_data[symbol_key]
         current_price = quote.get('last_price', 0)
         
         # Get OHLC data
-        ohlc = quote.get('ohlc', {})
-        day_high = ohlc.get('high', current_price)
-        day_low = ohlc.get('low', current_price)
-        open_price = ohlc.get('open', current_price)
+        ohlc_get = quote.get('ohlc', {}).get
+        day_high = ohlc_get('high', current_price)
+        day_low = ohlc_get('low', current_price)
         
         # Initialize or update intraday data
-        if symbol not in self.intraday_data:
-            self.intraday_data[symbol] = {
-                'high': day_high,
-                'low': day_low,
-                'open': open_price,
-                'last_update': datetime.now()
-            }
+        i = self._idx.get(symbol)
+        if i is None:
+            self._add_intraday_row(symbol, day_high, day_low, ohlc_get('open', current_price), self._now())
+            self._metrics_dirty = True
+        else:
+            # Update high and low if needed (one array read each)
+            high, low = self._high, self._low
+            if day_high > high.item(i):
+                high[i] = day_high
+                self._metrics_dirty = True
+            if day_low < low.item(i):
+                low[i] = day_low
+                self._metrics_dirty = True
+            self._intraday_updated[i] = self._now()
+    
+    def _add_intraday_row(self, symbol: str, high: float, low: float, open_price: float,
+                          updated: datetime):
+        """Add a row for a symbol's first quote of the day, doubling the arrays when full."""
+        i = len(self._intraday_symbols)
+        if i == len(self._high):
+            capacity = 2 * i
+            self._high = np.resize(self._high, capacity)
+            self._low = np.resize(self._low, capacity)
+            self._open = np.resize(self._open, capacity)
+            self._entry = np.resize(self._entry, capacity)
+        
+        self._idx[symbol] = i
+        self._intraday_symbols.append(symbol)
+        self._intraday_updated.append(updated)
+        self._high[i] = high
+        self._low[i] = low
+        self._open[i] = open_price
+        self._entry[i] = np.nan
+    
+    def _compute_positions(self, prices: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorized calculate_price_position for several tracked symbols.
+        
+        Args:
+            prices: Current prices, one per row
+            rows: Intraday rows the prices belong to (default: every row, in _idx order)
+        
+        Returns:
+            Price positions clamped to 0-1 (0.5 where there is no range yet)
+        """
+        if rows is None:
+            n = len(self._intraday_symbols)
+            day_high, day_low = self._high[:n], self._low[:n]
         else:
-            # Update high and low if needed
-            self.intraday_data[symbol]['high'] = max(self.intraday_data[symbol]['high'], day_high)
-            self.intraday_data[symbol]['low'] = min(self.intraday_data[symbol]['low'], day_low)
-            self.intraday_data[symbol]['last_update'] = datetime.now()
+            day_high, day_low = self._high[rows], self._low[rows]
+        day_range = day_high - day_low
+        has_range = day_range != 0
+        # Divide by 1 where there is no range so no inf/nan is produced, then
+        # put the 0.5 midpoint there; clip in place
+        position = np.where(has_range, (prices - day_low) / np.where(has_range, day_range, 1.0), 0.5)
+        return np.clip(position, 0.0, 1.0, out=position)
     
     def calculate_price_position(self, symbol: str, current_price: float) -> float:
         """
@@ -119,11 +228,12 @@ class IntradayHighLowStrategy(BaseStrategy):
         Returns:
             Price position ratio (0-1)
         """
-        if symbol not in self.intraday_data:
+        i = self._idx.get(symbol)
+        if i is None:
             return 0.5  # Default to midpoint if no data
         
-        day_high = self.intraday_data[symbol]['high']
-        day_low = self.intraday_data[symbol]['low']
+        day_high = self._high.item(i)
+        day_low = self._low.item(i)
         
         if day_high == day_low:
             return 0.5  # No range yet
@@ -145,11 +255,12 @@ class IntradayHighLowStrategy(BaseStrategy):
         Returns:
             Dict with profit metrics
         """
-        if symbol not in self.intraday_data:
+        i = self._idx.get(symbol)
+        if i is None:
             return {'valid': False}
         
-        day_high = self.intraday_data[symbol]['high']
-        day_low = self.intraday_data[symbol]['low']
+        day_high = self._high.item(i)
+        day_low = self._low.item(i)
         
         if signal == "BUY":
             # For buy: target is day high, stop loss below current
@@ -175,7 +286,9 @@ class IntradayHighLowStrategy(BaseStrategy):
         
         elif signal == "SELL":
             # For sell (exit long position): calculate realized profit
-            entry_price = self.entry_prices.get(symbol, current_price)
+            entry_price = self._entry.item(i)
+            if np.isnan(entry_price):
+                entry_price = current_price
             profit = current_price - entry_price
             profit_margin = (profit / entry_price) if entry_price > 0 else 0
             
@@ -215,7 +328,7 @@ class IntradayHighLowStrategy(BaseStrategy):
         # Update intraday tracking
         self.update_intraday_data(symbol, market_data)
         
-        symbol_key = f"NSE:{symbol}"
+        symbol_key = self._quote_keys[symbol]
         if symbol_key not in market_data:
             return None
         
@@ -225,83 +338,139 @@ class IntradayHighLowStrategy(BaseStrategy):
         if current_price <= 0:
             return None
         
-        # Calculate price position in day's range
-        price_position = self.calculate_price_position(symbol, current_price)
+        return self.analyze_prices([symbol], np.array([current_price], dtype=np.float64))[symbol]
+    
+    def analyze_batch(self, market_data: Dict,
+                      symbols: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+        """
+        Analyze several symbols from one quote snapshot (see analyze).
         
-        has_position = self.has_position(symbol)
+        Intraday data is updated per symbol, then every symbol with a price
+        goes through analyze_prices together.
         
-        # BUY LOGIC: Price near lows, good profit potential
-        if not has_position and price_position <= self.buy_threshold:
-            # Calculate profit potential
-            profit_metrics = self.calculate_profit_potential(symbol, current_price, "BUY")
-            
-            if not profit_metrics['valid']:
-                return None
-            
-            # Check if trade meets criteria
-            profit_margin_ok = profit_metrics['profit_margin'] >= self.min_profit_margin
-            risk_reward_ok = profit_metrics['risk_reward'] >= self.risk_reward_ratio
+        Args:
+            market_data: Quotes keyed by "NSE:<symbol>"
+            symbols: Symbols to analyze (default: all strategy symbols)
+        
+        Returns:
+            Dict of symbol -> 'BUY', 'SELL', or None
+        """
+        if symbols is None:
+            symbols = self.symbols
+        
+        signals = dict.fromkeys(symbols)
+        priced = []
+        prices = []
+        for symbol in symbols:
+            self.update_intraday_data(symbol, market_data)
+            quote = market_data.get(self._quote_keys[symbol])
+            if quote is not None:
+                current_price = quote.get('last_price', 0)
+                if current_price > 0:
+                    priced.append(symbol)
+                    prices.append(current_price)
+        
+        if priced:
+            signals.update(self.analyze_prices(priced, np.array(prices, dtype=np.float64)))
+        return signals
+    
+    def analyze_prices(self, symbols: List[str], prices: np.ndarray) -> Dict[str, Optional[str]]:
+        """
+        Generate signals for several symbols at once (see analyze for the rules).
+        
+        Buy and sell conditions are evaluated by compute_intraday_signals over
+        the symbols' intraday rows; only symbols in a buy or sell zone are
+        visited in Python for logging and entry price tracking.
+        Intraday data must already be updated for every symbol.
+        
+        Args:
+            symbols: Trading symbols with intraday data
+            prices: Current price per symbol (all > 0)
             
-            if profit_margin_ok and risk_reward_ok:
+        Returns:
+            Dict of symbol -> 'BUY', 'SELL', or None
+        """
+        count = len(symbols)
+        rows = np.fromiter((self._idx[symbol] for symbol in symbols), dtype=np.intp, count=count)
+        have_position = np.fromiter((self.has_position(symbol) for symbol in symbols),
+                                    dtype=bool, count=count)
+        entry = self._entry[rows]
+        entry = np.where(np.isnan(entry), prices, entry)  # No entry: margin 0
+        
+        buys, sells = compute_intraday_signals(
+            prices, self._compute_positions(prices, rows), self._high[rows],
+            have_position, entry,
+            self.buy_threshold, self.sell_threshold,
+            self.min_profit_margin, self.risk_reward_ratio, self.stop_loss_pct
+        )
+        
+        signals = dict.fromkeys(symbols)
+        
+        # Per-symbol metrics are only computed for logging, and rejections
+        # (the common case near the lows) only when DEBUG is enabled
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        
+        for i in np.flatnonzero(buys).tolist():
+            symbol = symbols[i]
+            current_price = prices.item(i)
+            if buys[i] > 0:
+                profit_metrics = self.calculate_profit_potential(symbol, current_price, "BUY")
                 self.logger.info(
-                    f"{symbol} BUY signal: price={current_price:.2f}, "
-                    f"position={price_position:.2%}, "
-                    f"profit_margin={profit_metrics['profit_margin']:.2%}, "
-                    f"risk_reward={profit_metrics['risk_reward']:.2f}, "
-                    f"target={profit_metrics['target']:.2f}, "
-                    f"stop_loss={profit_metrics['stop_loss']:.2f}"
+                    "%s BUY signal: price=%.2f, position=%.2f%%, profit_margin=%.2f%%, "
+                    "risk_reward=%.2f, target=%.2f, stop_loss=%.2f",
+                    symbol, current_price,
+                    self.calculate_price_position(symbol, current_price) * 100,
+                    profit_metrics['profit_margin'] * 100, profit_metrics['risk_reward'],
+                    profit_metrics['target'], profit_metrics['stop_loss']
                 )
                 
                 # Store entry price for later profit calculation
-                self.entry_prices[symbol] = current_price
-                
-                return "BUY"
-            else:
+                self._entry[rows[i]] = current_price
+                signals[symbol] = "BUY"
+            elif debug:
+                profit_metrics = self.calculate_profit_potential(symbol, current_price, "BUY")
                 self.logger.debug(
-                    f"{symbol} BUY rejected: profit_margin={profit_metrics['profit_margin']:.2%} "
-                    f"(need {self.min_profit_margin:.2%}), "
-                    f"risk_reward={profit_metrics['risk_reward']:.2f} "
-                    f"(need {self.risk_reward_ratio:.2f})"
+                    "%s BUY rejected: profit_margin=%.2f%% (need %.2f%%), "
+                    "risk_reward=%.2f (need %.2f)",
+                    symbol, profit_metrics['profit_margin'] * 100, self.min_profit_margin * 100,
+                    profit_metrics['risk_reward'], self.risk_reward_ratio
                 )
         
-        # SELL LOGIC: Price near highs, profit target reached
-        elif has_position and price_position >= self.sell_threshold:
-            # Calculate actual profit
-            profit_metrics = self.calculate_profit_potential(symbol, current_price, "SELL")
-            
-            if not profit_metrics['valid']:
-                return None
-            
-            # Check if profit target is met
-            if profit_metrics['profit_margin'] >= self.min_profit_margin:
+        for i in np.flatnonzero(sells).tolist():
+            symbol = symbols[i]
+            current_price = prices.item(i)
+            if sells[i] > 0:
+                profit_metrics = self.calculate_profit_potential(symbol, current_price, "SELL")
                 self.logger.info(
-                    f"{symbol} SELL signal: price={current_price:.2f}, "
-                    f"position={price_position:.2%}, "
-                    f"entry={profit_metrics['entry']:.2f}, "
-                    f"profit={profit_metrics['profit']:.2f}, "
-                    f"profit_margin={profit_metrics['profit_margin']:.2%}"
+                    "%s SELL signal: price=%.2f, position=%.2f%%, entry=%.2f, "
+                    "profit=%.2f, profit_margin=%.2f%%",
+                    symbol, current_price,
+                    self.calculate_price_position(symbol, current_price) * 100,
+                    profit_metrics['entry'], profit_metrics['profit'],
+                    profit_metrics['profit_margin'] * 100
                 )
                 
                 # Clear entry price
-                if symbol in self.entry_prices:
-                    del self.entry_prices[symbol]
-                
-                return "SELL"
-            else:
+                self._entry[rows[i]] = np.nan
+                signals[symbol] = "SELL"
+            elif debug:
+                profit_metrics = self.calculate_profit_potential(symbol, current_price, "SELL")
                 self.logger.debug(
-                    f"{symbol} SELL rejected: profit_margin={profit_metrics['profit_margin']:.2%} "
-                    f"(need {self.min_profit_margin:.2%})"
+                    "%s SELL rejected: profit_margin=%.2f%% (need %.2f%%)",
+                    symbol, profit_metrics['profit_margin'] * 100, self.min_profit_margin * 100
                 )
         
-        return None
+        return signals
     
-    def calculate_position_size(self, symbol: str, signal: str) -> int:
+    def calculate_position_size(self, symbol: str, signal: str,
+                                ltp: Optional[float] = None) -> int:
         """
         Calculate position size based on available capital and risk management.
         
         Args:
             symbol: Trading symbol
             signal: Trading signal (BUY/SELL)
+            ltp: Last traded price if already known (e.g. batched by run_iteration)
             
         Returns:
             Number of shares to trade
@@ -311,35 +480,35 @@ class IntradayHighLowStrategy(BaseStrategy):
             if signal == "SELL":
                 position_qty = abs(self.get_position_quantity(symbol))
                 if position_qty == 0:
-                    self.logger.debug(f"{symbol}: No position to sell")
+                    self.logger.debug("%s: No position to sell", symbol)
                     return 0
                 return position_qty
             
-            # Get available margin - works with both real trader and paper trading wrapper
-            if hasattr(self.trader, 'margins'):
-                margins = self.trader.margins()
-            elif hasattr(self.trader, 'kite') and hasattr(self.trader.kite, 'margins'):
-                margins = self.trader.kite.margins()
-            else:
-                self.logger.error(f"Cannot get margins for {symbol} - trader has no margins() method")
+            # Get available margin (cached briefly so several signals share one call)
+            margins = self._get_margins()
+            if margins is None:
+                self.logger.error("Cannot get margins for %s - trader has no margins() method", symbol)
                 return 0
             
             available_cash = margins.get('equity', {}).get('available', {}).get('cash', 0)
             
             if available_cash <= 0:
-                self.logger.warning(f"No available cash for {symbol}")
+                self.logger.warning("No available cash for %s", symbol)
                 return 0
             
             # Get current price
             try:
-                ltp_data = self.trader.get_ltp([symbol])
-                current_price = ltp_data.get(f"NSE:{symbol}", 0)
+                if ltp is not None and ltp > 0:
+                    current_price = ltp
+                else:
+                    ltp_data = self.trader.get_ltp([symbol])
+                    current_price = ltp_data.get(self._quote_keys[symbol], 0)
             except Exception as e:
-                self.logger.error(f"Error getting LTP for {symbol}: {e}")
+                self.logger.error("Error getting LTP for %s: %s", symbol, e)
                 # Fallback to quote
                 try:
                     quotes = self.trader.get_quote([symbol])
-                    current_price = quotes.get(f"NSE:{symbol}", {}).get('last_price', 0)
+                    current_price = quotes.get(self._quote_keys[symbol], {}).get('last_price', 0)
                 except:
                     current_price = 0
             
@@ -354,15 +523,15 @@ class IntradayHighLowStrategy(BaseStrategy):
             quantity = max(1, quantity)
             
             self.logger.info(
-                f"{symbol} position size: {quantity} shares at ₹{current_price:.2f} "
-                f"= ₹{quantity * current_price:.2f} "
-                f"({(quantity * current_price / available_cash * 100):.1f}% of capital)"
+                "%s position size: %d shares at ₹%.2f = ₹%.2f (%.1f%% of capital)",
+                symbol, quantity, current_price, quantity * current_price,
+                quantity * current_price / available_cash * 100
             )
             
             return quantity
             
         except Exception as e:
-            self.logger.error(f"Error calculating position size for {symbol}: {str(e)}")
+            self.logger.error("Error calculating position size for %s: %s", symbol, e)
             return 0
     
     def get_strategy_metrics(self) -> Dict:
@@ -372,31 +541,41 @@ class IntradayHighLowStrategy(BaseStrategy):
         Returns:
             Dict with strategy metrics
         """
-        metrics = {
+        if self._metrics_dirty or self._metrics_symbols is not self.symbols:
+            self._metrics_cache = self._build_range_metrics()
+            self._metrics_symbols = self.symbols
+            self._metrics_dirty = False
+        
+        return {
             'strategy_name': self.name,
             'symbols_tracked': len(self.symbols),
-            'active_positions': len([s for s in self.positions if self.positions[s]['quantity'] != 0]),
-            'intraday_data': {}
+            'active_positions': self._active_positions,
+            'intraday_data': self._metrics_cache
+        }
+    
+    def _build_range_metrics(self) -> Dict[str, Dict]:
+        """Day high/low/range per tracked symbol with intraday data, in symbol order."""
+        tracked = [symbol for symbol in self.symbols if symbol in self._idx]
+        rows = np.fromiter((self._idx[symbol] for symbol in tracked), dtype=np.intp, count=len(tracked))
+        high = self._high[rows]
+        low = self._low[rows]
+        day_range = high - low
+        with np.errstate(divide='ignore', invalid='ignore'):
+            range_pct = np.where(low > 0, day_range / low * 100, 0.0)
+        
+        return {
+            symbol: {'high': h, 'low': l, 'range': r, 'range_pct': pct}
+            for symbol, h, l, r, pct in zip(tracked, high.tolist(), low.tolist(),
+                                             day_range.tolist(), range_pct.tolist())
         }
-        
-        for symbol in self.symbols:
-            if symbol in self.intraday_data:
-                data = self.intraday_data[symbol]
-                day_range = data['high'] - data['low']
-                metrics['intraday_data'][symbol] = {
-                    'high': data['high'],
-                    'low': data['low'],
-                    'range': day_range,
-                    'range_pct': (day_range / data['low'] * 100) if data['low'] > 0 else 0
-                }
-        
-        return metrics
     
     def reset_daily_data(self):
         """
         Reset intraday data at start of new trading day.
         Call this at market open.
         """
-        self.intraday_data.clear()
-        self.entry_prices.clear()
+        self._idx.clear()
+        self._intraday_symbols.clear()
+        self._intraday_updated.clear()
+        self._metrics_dirty = True
         self.logger.info("Daily data reset for new trading day")
@@ -4,8 +4,11 @@ Broker Health Check Utility
 Monitors broker API health and prevents trading during downtime.
 """
 import time
+import random
 import logging
-from datetime import datetime, timedelta
+import threading
+from collections import deque
+from datetime import datetime
 from typing import Dict, Optional
 
 
@@ -14,7 +17,7 @@ class BrokerHealthMonitor:
     Monitors broker API health and detects downtime.
     
     Features:
-    - Periodic health checks
+    - Periodic health checks (inline, or on a background thread)
     - Failure tracking
     - Automatic back-off on repeated failures
     - Trading halt on extended downtime
@@ -25,7 +28,8 @@ class BrokerHealthMonitor:
         trader,
         check_interval: int = 60,  # Check every minute
         failure_threshold: int = 3,  # Halt after 3 consecutive failures
-        backoff_multiplier: float = 2.0
+        backoff_multiplier: float = 2.0,
+        probe_timeout: float = 5.0  # Give up on a single probe after 5 seconds
     ):
         """
         Initialize broker health monitor.
@@ -35,29 +39,55 @@ class BrokerHealthMonitor:
             check_interval: Seconds between health checks
             failure_threshold: Consecutive failures before halting
             backoff_multiplier: Multiplier for exponential backoff
+            probe_timeout: Seconds to wait for get_profile() before counting a failure
         """
         self.trader = trader
         self.check_interval = check_interval
         self.failure_threshold = failure_threshold
         self.backoff_multiplier = backoff_multiplier
+        self.probe_timeout = probe_timeout
         
         self.logger = logging.getLogger(__name__)
         
         # Health tracking
         self.consecutive_failures = 0
-        self.last_check_time = None
+        self.last_check_time = None  # Wall-clock times, for reporting
         self.last_success_time = None
+        self.last_check_mono = None  # time.monotonic() times, for interval math
+        self.last_success_mono = None
         self.is_healthy = True
         self.current_backoff = check_interval
         
-        # Failure history
-        self.failure_history = []
+        # Last healthy result, reused for cache_ttl seconds after the probe completed
+        self.cache_ttl = check_interval
+        self._cached_result: Optional[Dict] = None
+        self._cache_completion_ts = 0.0
+        
+        # Only one get_profile() probe in flight at a time; each call runs on
+        # its own daemon thread so a hung request is abandoned after probe_timeout
+        self._probe_lock = threading.Lock()
+        
+        # Background refresh (see start_background_probe)
+        self._probe_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        
+        # Failure history (oldest entries drop off automatically)
         self.max_history = 100
+        self.failure_history = deque(maxlen=self.max_history)
     
-    def check_health(self) -> Dict:
+    def check_health(self, use_cache: bool = True) -> Dict:
         """
         Check broker API health.
         
+        A healthy result is reused for cache_ttl seconds after the probe
+        completes; failures are not cached, but the next probe waits for the
+        back-off interval. At most one probe runs at a time: while one is in
+        flight, other callers get the current status instead of waiting.
+        While the background probe is running, cached calls never probe.
+        
+        Args:
+            use_cache: False to probe the broker now (e.g. after a manual reset)
+        
         Returns:
             Dict with health status:
             {
@@ -68,61 +98,106 @@ class BrokerHealthMonitor:
                 'should_halt': bool
             }
         """
-        now = datetime.now()
+        if use_cache:
+            status = self._recent_status()
+            if status is not None:
+                return status
+            
+            # The background thread keeps the status fresh
+            if self.is_background_probe_running():
+                return self._current_status(0)
+            
+            # Another thread is probing: report the current state rather than queue
+            if not self._probe_lock.acquire(blocking=False):
+                return self._current_status(0)
+        else:
+            self._probe_lock.acquire()
+        
+        try:
+            # The probe that held the lock may have just refreshed the result
+            if use_cache:
+                status = self._recent_status()
+                if status is not None:
+                    return status
+            return self._probe()
+        finally:
+            self._probe_lock.release()
+    
+    def _recent_status(self) -> Optional[Dict]:
+        """Cached healthy result or back-off status if no probe is due yet, else None."""
+        if self._cached_result is not None:
+            age = time.monotonic() - self._cache_completion_ts
+            if age < self.cache_ttl:
+                result = dict(self._cached_result)
+                result['next_check_in'] = int(self.cache_ttl - age)
+                return result
         
         # Check if enough time has passed since last check
-        if self.last_check_time:
-            time_since_last = (now - self.last_check_time).total_seconds()
+        if self.last_check_mono is not None:
+            time_since_last = time.monotonic() - self.last_check_mono
             if time_since_last < self.current_backoff:
-                return {
-                    'is_healthy': self.is_healthy,
-                    'consecutive_failures': self.consecutive_failures,
-                    'last_error': None,
-                    'next_check_in': int(self.current_backoff - time_since_last),
-                    'should_halt': self.consecutive_failures >= self.failure_threshold
-                }
+                return self._current_status(int(self.current_backoff - time_since_last))
         
+        return None
+    
+    def _current_status(self, next_check_in: int) -> Dict:
+        """Health status from the last probe, without probing."""
+        return {
+            'is_healthy': self.is_healthy,
+            'consecutive_failures': self.consecutive_failures,
+            'last_error': None,
+            'next_check_in': next_check_in,
+            'should_halt': self.consecutive_failures >= self.failure_threshold
+        }
+    
+    def _probe(self) -> Dict:
+        """Call get_profile() and update health state (caller holds _probe_lock)."""
         # Perform health check
         try:
             # Try to fetch profile as a health check
-            profile = self.trader.get_profile()
+            profile = self._fetch_profile()
             
             if profile and profile.get('user_id'):
                 # Success
                 self.is_healthy = True
                 self.consecutive_failures = 0
-                self.last_success_time = now
+                self.last_success_mono = time.monotonic()
+                self.last_success_time = datetime.now()
                 self.current_backoff = self.check_interval  # Reset backoff
                 
                 self.logger.debug("Broker health check: OK")
                 
-                return {
+                result = {
                     'is_healthy': True,
                     'consecutive_failures': 0,
                     'last_error': None,
                     'next_check_in': self.check_interval,
                     'should_halt': False
                 }
+                
+                # Cache from when the probe finished, so a slow probe still gets the full TTL
+                self._cached_result = result
+                self._cache_completion_ts = time.monotonic()
+                return dict(result)
             else:
                 # Empty response
                 raise Exception("Empty profile response")
         
         except Exception as e:
-            # Failure
+            # Failure: drop any cached verdict
+            self._cached_result = None
+            self._cache_completion_ts = 0.0
             self.consecutive_failures += 1
             error_msg = str(e)
             
             # Record failure
             self.failure_history.append({
-                'time': now,
+                'time': datetime.now(),
+                'mono': time.monotonic(),
                 'error': error_msg,
                 'consecutive': self.consecutive_failures
             })
             
-            # Trim history
-            if len(self.failure_history) > self.max_history:
-                self.failure_history = self.failure_history[-self.max_history:]
-            
             # Update health status
             if self.consecutive_failures >= self.failure_threshold:
                 self.is_healthy = False
@@ -152,16 +227,78 @@ class BrokerHealthMonitor:
             }
         
         finally:
-            self.last_check_time = now
+            # Back-off runs from when the probe finished, not when it started
+            self.last_check_mono = time.monotonic()
+            self.last_check_time = datetime.now()
+    
+    def _fetch_profile(self) -> Optional[Dict]:
+        """
+        Call trader.get_profile(), raising TimeoutError after probe_timeout seconds.
+        
+        The call runs on a fresh daemon thread, so a request that never
+        returns is left behind and cannot hold up later probes.
+        """
+        outcome = {}
+        
+        def call():
+            try:
+                outcome['profile'] = self.trader.get_profile()
+            except Exception as e:
+                outcome['error'] = e
+        
+        worker = threading.Thread(target=call, name="BrokerProfileRequest", daemon=True)
+        worker.start()
+        worker.join(self.probe_timeout)
+        if worker.is_alive():
+            raise TimeoutError(f"Profile request timed out after {self.probe_timeout}s")
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome.get('profile')
+    
+    def start_background_probe(self):
+        """
+        Probe on a daemon thread at the check/back-off interval (no-op if running).
+        
+        check_health() then only reads the latest result, so callers never wait
+        on the broker. Sleeps get +/-10% jitter so several monitors do not
+        probe in lockstep.
+        """
+        if self.is_background_probe_running():
+            return
+        self._stop_event.clear()
+        self._probe_thread = threading.Thread(
+            target=self._probe_loop, name="BrokerHealthProbe", daemon=True
+        )
+        self._probe_thread.start()
+    
+    def stop_background_probe(self, timeout: Optional[float] = None):
+        """Stop the background probe thread, waiting up to timeout seconds for it."""
+        self._stop_event.set()
+        if self._probe_thread is not None:
+            self._probe_thread.join(timeout)
+            self._probe_thread = None
+    
+    def is_background_probe_running(self) -> bool:
+        """Whether the background probe thread is active."""
+        return self._probe_thread is not None and self._probe_thread.is_alive()
+    
+    def _probe_loop(self):
+        """Background target for start_background_probe."""
+        while not self._stop_event.is_set():
+            with self._probe_lock:
+                self._probe()
+            interval = self.current_backoff * (1 + random.uniform(-0.1, 0.1))
+            self._stop_event.wait(interval)
     
     def get_status(self) -> Dict:
         """Get current health status without performing check."""
+        cutoff = time.monotonic() - 3600
         return {
             'is_healthy': self.is_healthy,
             'consecutive_failures': self.consecutive_failures,
             'last_check': self.last_check_time.isoformat() if self.last_check_time else None,
             'last_success': self.last_success_time.isoformat() if self.last_success_time else None,
-            'recent_failures': len([f for f in self.failure_history if (datetime.now() - f['time']).total_seconds() < 3600])
+            'recent_failures': sum(1 for f in self.failure_history if f['mono'] > cutoff)
         }
     
     def reset(self):
@@ -169,4 +306,6 @@ class BrokerHealthMonitor:
         self.consecutive_failures = 0
         self.is_healthy = True
         self.current_backoff = self.check_interval
+        self._cached_result = None
+        self._cache_completion_ts = 0.0
         self.logger.info("Broker health monitor reset")
@@ -45,6 +45,11 @@ class CapitalRecoveryManager:
         # Load capital history
         self.history = self._load_history()
         
+        # ISO date -> index in daily_records (latest record wins for a repeated date)
+        self._records_by_date: Dict[str, int] = {
+            record['date']: i for i, record in enumerate(self.history['daily_records'])
+        }
+        
         # Calculate today's available capital
         self.current_available_capital = self._calculate_available_capital()
         
@@ -102,9 +107,9 @@ class CapitalRecoveryManager:
         today = date.today().isoformat()
         
         # Check if we already have a record for today
-        for record in reversed(self.history['daily_records']):
-            if record['date'] == today:
-                return record['starting_capital']
+        index = self._records_by_date.get(today)
+        if index is not None:
+            return self.history['daily_records'][index]['starting_capital']
         
         # No record for today - calculate from yesterday
         if not self.history['daily_records']:
@@ -161,24 +166,21 @@ class CapitalRecoveryManager:
         }
         
         # Check if we already have a record for today (update it)
-        updated = False
-        for i, record in enumerate(self.history['daily_records']):
-            if record['date'] == today:
-                self.history['daily_records'][i] = day_record
-                updated = True
-                break
-        
-        if not updated:
-            self.history['daily_records'].append(day_record)
-        
-        # Update summary statistics
-        self.history['total_pnl'] = sum(r['daily_pnl'] for r in self.history['daily_records'])
-        self.history['total_trades'] += trades_count
+        previous_pnl = None
+        records = self.history['daily_records']
+        index = self._records_by_date.get(today)
+        if index is not None:
+            previous_pnl = records[index]['daily_pnl']
+            records[index] = day_record
+        else:
+            self._records_by_date[today] = len(records)
+            records.append(day_record)
         
-        if daily_pnl > 0:
-            self.history['winning_days'] = sum(1 for r in self.history['daily_records'] if r['daily_pnl'] > 0)
-        elif daily_pnl < 0:
-            self.history['losing_days'] = sum(1 for r in self.history['daily_records'] if r['daily_pnl'] < 0)
+        # Update summary statistics by delta: back out the replaced record, add the new one
+        if previous_pnl is not None:
+            self._count_day(previous_pnl, -1)
+        self._count_day(daily_pnl, 1)
+        self.history['total_trades'] += trades_count
         
         # Save to file
         self._save_history()
@@ -213,6 +215,14 @@ class CapitalRecoveryManager:
         
         return ending_capital
     
+    def _count_day(self, daily_pnl: float, sign: int):
+        """Add (sign=1) or remove (sign=-1) one day's P&L from the running totals."""
+        self.history['total_pnl'] += sign * daily_pnl
+        if daily_pnl > 0:
+            self.history['winning_days'] += sign
+        elif daily_pnl < 0:
+            self.history['losing_days'] += sign
+    
     def get_performance_summary(self) -> Dict:
         """Get overall performance summary."""
         if not self.history['daily_records']:
@@ -292,6 +302,7 @@ class CapitalRecoveryManager:
         self.current_available_capital = new_amount
         
         today = date.today().isoformat()
+        self._records_by_date[today] = len(self.history['daily_records'])
         self.history['daily_records'].append({
             'date': today,
             'starting_capital': new_amount,
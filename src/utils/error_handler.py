@@ -10,7 +10,6 @@ import time
 import logging
 from functools import wraps
 from typing import Callable, Optional, Tuple, Type
-from datetime import datetime, timedelta
 
 
 class CircuitBreaker:
@@ -34,21 +33,17 @@ class CircuitBreaker:
         self.failure_threshold = failure_threshold
         self.timeout = timeout
         self.failure_count = 0
-        self.last_failure_time = None
+        self.last_failure_time = None  # time.monotonic() of last failure
         self.state = "CLOSED"
         self.logger = logging.getLogger(__name__)
     
     def call(self, func: Callable, *args, **kwargs):
         """Execute function with circuit breaker protection."""
-        if self.state == "OPEN":
-            if self._should_attempt_reset():
-                self.state = "HALF_OPEN"
-                self.logger.info("Circuit breaker entering HALF_OPEN state")
-            else:
-                raise CircuitBreakerOpenError(
-                    f"Circuit breaker is OPEN. Too many failures. "
-                    f"Wait {self.timeout}s before retry."
-                )
+        if self.is_open():
+            raise CircuitBreakerOpenError(
+                f"Circuit breaker is OPEN. Too many failures. "
+                f"Wait {self.timeout}s before retry."
+            )
         
         try:
             result = func(*args, **kwargs)
@@ -58,11 +53,34 @@ class CircuitBreaker:
             self._on_failure()
             raise
     
+    def is_open(self) -> bool:
+        """
+        Check whether calls should be rejected right now.
+        
+        Moves OPEN -> HALF_OPEN once the timeout has passed so one trial
+        call can go through.
+        """
+        if self.state != "OPEN":
+            return False
+        if self._should_attempt_reset():
+            self.state = "HALF_OPEN"
+            self.logger.info("Circuit breaker entering HALF_OPEN state")
+            return False
+        return True
+    
+    def record_success(self):
+        """Record a successful call made outside call()."""
+        self._on_success()
+    
+    def record_failure(self):
+        """Record a failed call made outside call()."""
+        self._on_failure()
+    
     def _should_attempt_reset(self) -> bool:
         """Check if enough time has passed to attempt reset."""
         if self.last_failure_time is None:
             return True
-        return datetime.now() - self.last_failure_time > timedelta(seconds=self.timeout)
+        return time.monotonic() - self.last_failure_time > self.timeout
     
     def _on_success(self):
         """Handle successful call."""
@@ -74,7 +92,7 @@ class CircuitBreaker:
     def _on_failure(self):
         """Handle failed call."""
         self.failure_count += 1
-        self.last_failure_time = datetime.now()
+        self.last_failure_time = time.monotonic()
         
         if self.failure_count >= self.failure_threshold:
             self.state = "OPEN"
@@ -854,13 +854,9 @@ def run_training_background(symbols: List[str], lookback_days: int):
         
         # Collect per-stock performance and paper trading summary
         try:
-            import json
-            from pathlib import Path
-            paper_file = Path('ai_data/paper_trading_state.json')
-            if paper_file.exists():
-                with open(paper_file, 'r') as f:
-                    paper_data = json.load(f)
-                    
+            from src.paper_trading.paper_trader import PaperTrader
+            paper_data = PaperTrader.read_state('ai_data')
+            if paper_data is not None:
                 # Extract paper trading summary
                 training_status['stats']['paper_trading'] = {
                     'current_capital': paper_data.get('current_capital', 0),
@@ -1035,14 +1031,11 @@ async def stop_paper_trading() -> Dict:
 async def get_paper_trading_status() -> Dict:
     """Get current paper trading status"""
     try:
-        # Load paper trading state from file
-        from pathlib import Path
-        paper_file = Path('ai_data/paper_trading_state.json')
+        # Load the latest paper trading state (hot state + log tails or full snapshot)
+        from src.paper_trading.paper_trader import PaperTrader
+        paper_data = PaperTrader.read_state('ai_data', history=20)
         
-        if paper_file.exists():
-            with open(paper_file, 'r') as f:
-                paper_data = json.load(f)
-            
+        if paper_data is not None:
             return {
                 "success": True,
                 "status": paper_trading_status,
@@ -1098,6 +1091,7 @@ def run_paper_trading_background(symbols: list, initial_capital: float):
     """Run paper trading in background thread"""
     global paper_trading_status
     
+    paper_trader = None
     try:
         import time
         import logging
@@ -1169,7 +1163,7 @@ def run_paper_trading_background(symbols: list, initial_capital: float):
                         s: quotes.get(f"NSE:{s}", {}).get('last_price', 0)
                         for s in symbols
                     }
-                    portfolio_value = paper_trader.get_portfolio_value(current_prices)
+                    portfolio_value = paper_trader.mark_to_market(current_prices)
                     paper_trader.current_capital = portfolio_value
                     
                     # Log summary
@@ -1220,6 +1214,10 @@ def run_paper_trading_background(symbols: list, initial_capital: float):
         add_paper_trading_log('ERROR', f'Paper trading error: {str(e)}')
         paper_trading_status['state'] = 'error'
         paper_trading_status['error'] = str(e)
+    
+    finally:
+        if paper_trader is not None:
+            paper_trader.close()
 
 
 @app.get("/api/funds")
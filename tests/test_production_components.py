@@ -7,6 +7,11 @@ Tests for:
 - Cost calculator
 - Order manager
 - Position reconciler
+- Quote batcher
+- orjson response parsing
+- Broker health monitor
+- Capital recovery manager
+- Paper trader
 """
 import unittest
 import time
@@ -120,6 +125,23 @@ class TestErrorHandler(unittest.TestCase):
         result = breaker.call(sometimes_fails)
         self.assertEqual(result, "success")
         self.assertEqual(breaker.failure_count, 0)
+    
+    def test_circuit_breaker_manual_recording(self):
+        """Test is_open/record_* for calls made outside call()."""
+        breaker = CircuitBreaker(failure_threshold=2, timeout=0.1)
+        
+        breaker.record_failure()
+        self.assertFalse(breaker.is_open())
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open())
+        
+        # After the timeout one trial call is allowed
+        time.sleep(0.15)
+        self.assertFalse(breaker.is_open())
+        self.assertEqual(breaker.state, "HALF_OPEN")
+        
+        breaker.record_success()
+        self.assertEqual(breaker.state, "CLOSED")
 
 
 class TestRateLimiter(unittest.TestCase):
@@ -290,6 +312,18 @@ class TestOrderManager(unittest.TestCase):
         self.assertEqual(self.order_manager.order_timeout, 5)
         self.assertEqual(self.order_manager.poll_interval, 0.5)
         self.assertEqual(len(self.order_manager.active_orders), 0)
+
+    def test_place_order_permanent_error_not_retried(self):
+        """Test permanent placement errors raise OrderError without retrying."""
+        import asyncio
+        from src.utils.error_handler import OrderError
+        self.mock_trader.kite.place_order.side_effect = Exception("Invalid token")
+
+        with self.assertRaises(OrderError):
+            asyncio.run(self.order_manager.place_and_verify_order(
+                'RELIANCE', 'BUY', 10, price=1450.0
+            ))
+        self.assertEqual(self.mock_trader.kite.place_order.call_count, 1)
     
     def test_get_stats(self):
         """Test order manager statistics."""
@@ -299,6 +333,26 @@ class TestOrderManager(unittest.TestCase):
         self.assertIn('failed_orders', stats)
         self.assertIn('success_rate', stats)
 
+    def test_place_and_verify_order_completes(self):
+        """Test async order placement resolves once broker reports COMPLETE."""
+        import asyncio
+        self.mock_trader.kite.place_order.return_value = 'ORD1'
+        self.mock_trader.kite.orders.return_value = [
+            {
+                'order_id': 'ORD1',
+                'status': 'COMPLETE',
+                'filled_quantity': 10,
+                'average_price': 1450.0
+            }
+        ]
+
+        result = asyncio.run(self.order_manager.place_and_verify_order(
+            'RELIANCE', 'BUY', 10, price=1450.0
+        ))
+        self.assertEqual(result['status'], 'COMPLETE')
+        self.assertEqual(result['filled_quantity'], 10)
+        self.assertEqual(len(self.order_manager.active_orders), 0)
+
 
 class TestPositionReconciler(unittest.TestCase):
     """Test position reconciler (with mocked KiteTrader)."""
@@ -376,6 +430,424 @@ class TestPositionReconciler(unittest.TestCase):
         self.assertEqual(len(result['discrepancies']), 1)
         self.assertEqual(result['discrepancies'][0]['type'], 'QUANTITY_MISMATCH')
 
+    def test_reconcile_missing_positions(self):
+        """Test reconciliation detects positions missing on either side."""
+        self.mock_trader.get_positions.return_value = {
+            'net': [
+                {
+                    'tradingsymbol': 'TCS',
+                    'quantity': 3,
+                    'average_price': 3500.0
+                }
+            ]
+        }
+        
+        tracked = {
+            'RELIANCE': {
+                'quantity': 10,
+                'average_price': 1450.0
+            }
+        }
+        
+        result = self.reconciler.reconcile_positions(tracked)
+        types = {d['symbol']: d['type'] for d in result['discrepancies']}
+        self.assertEqual(types, {
+            'RELIANCE': 'MISSING_IN_BROKER',
+            'TCS': 'MISSING_IN_SYSTEM'
+        })
+        self.assertTrue(result['should_halt'])
+    
+    def test_reconcile_adapts_interval(self):
+        """Test polling interval shrinks on mismatch and grows when quiet."""
+        self.mock_trader.get_positions.return_value = {
+            'net': [
+                {
+                    'tradingsymbol': 'RELIANCE',
+                    'quantity': 10,
+                    'average_price': 1450.0
+                }
+            ]
+        }
+        start = self.reconciler.next_interval
+        
+        self.reconciler.reconcile_positions({'RELIANCE': {'quantity': 5, 'average_price': 1450.0}})
+        self.assertLess(self.reconciler.next_interval, start)
+        
+        shrunk = self.reconciler.next_interval
+        self.reconciler.reconcile_positions({'RELIANCE': {'quantity': 10, 'average_price': 1450.0}})
+        self.assertGreater(self.reconciler.next_interval, shrunk)
+
+
+class TestQuoteBatcher(unittest.TestCase):
+    """Test quote request batching."""
+    
+    def test_concurrent_requests_share_one_call(self):
+        """Test requests arriving while a fetch is in flight are fetched together."""
+        import threading
+        from src.kite_trader.quote_batcher import QuoteBatcher
+        
+        first_started = threading.Event()
+        release_first = threading.Event()
+        
+        def fetch_quotes(keys):
+            if keys == ['NSE:A']:
+                first_started.set()
+                release_first.wait(1)
+            return {k: {'last_price': 100.0} for k in keys}
+        
+        fetch = Mock(side_effect=fetch_quotes)
+        batcher = QuoteBatcher(fetch, flush_interval_ms=200)
+        results = {}
+        
+        def request(key):
+            results.update(batcher.get([key]))
+        
+        first = threading.Thread(target=request, args=('NSE:A',))
+        first.start()
+        first_started.wait(1)
+        
+        threads = [threading.Thread(target=request, args=(k,)) for k in ('NSE:B', 'NSE:C')]
+        for t in threads:
+            t.start()
+        release_first.set()
+        for t in [first] + threads:
+            t.join()
+        
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(sorted(fetch.call_args_list[1].args[0]), ['NSE:B', 'NSE:C'])
+        self.assertEqual(set(results), {'NSE:A', 'NSE:B', 'NSE:C'})
+    
+    def test_lone_request_fetches_immediately(self):
+        """Test a request with nothing else in flight skips the flush window."""
+        from src.kite_trader.quote_batcher import QuoteBatcher
+        
+        fetch = Mock(return_value={'NSE:A': {'last_price': 100.0}})
+        batcher = QuoteBatcher(fetch, flush_interval_ms=1000)
+        
+        start = time.monotonic()
+        batcher.get(['NSE:A'])
+        self.assertLess(time.monotonic() - start, 0.5)
+        
+        batcher.get(['NSE:A'], use_cache=False)
+        self.assertEqual(fetch.call_count, 2)
+    
+    def test_cached_quotes_skip_fetch(self):
+        """Test repeated lookups within the TTL are served from memory."""
+        from src.kite_trader.quote_batcher import QuoteBatcher
+        
+        fetch = Mock(return_value={'NSE:A': {'last_price': 100.0}})
+        batcher = QuoteBatcher(fetch, flush_interval_ms=0, cache_ttl=60)
+        
+        batcher.get(['NSE:A'])
+        batcher.get(['NSE:A'])
+        self.assertEqual(fetch.call_count, 1)
+    
+    def test_large_batches_are_split(self):
+        """Test a merged batch is fetched in calls of at most 500 keys."""
+        from src.kite_trader.quote_batcher import QuoteBatcher
+        
+        fetch = Mock(side_effect=lambda keys: {k: {'last_price': 100.0} for k in keys})
+        batcher = QuoteBatcher(fetch, flush_interval_ms=0)
+        keys = [f'NSE:S{i}' for i in range(800)]
+        
+        results = batcher.get(keys)
+        
+        self.assertEqual(len(results), 800)
+        self.assertEqual(fetch.call_count, 2)
+        self.assertTrue(all(len(call.args[0]) <= 500 for call in fetch.call_args_list))
+
+
+class TestOrjsonResponseHook(unittest.TestCase):
+    """Test orjson parsing of Kite HTTP responses."""
+    
+    def test_hooked_response_parses_with_orjson(self):
+        """Test response.json() goes through orjson once the hook is installed."""
+        from src.kite_trader import fast_json
+        
+        class FakeResponse:
+            content = b'{"status": "success", "data": {"NSE:INFY": {"last_price": 1500.5}}}'
+            
+            def json(self, **kwargs):
+                raise AssertionError("stdlib json path used")
+        
+        session = Mock()
+        session.hooks = {'response': []}
+        fast_json.install_orjson_parser(session)
+        fast_json.install_orjson_parser(session)
+        self.assertEqual(session.hooks['response'], [fast_json.orjson_response_hook])
+        
+        response = FakeResponse()
+        for hook in session.hooks['response']:
+            response = hook(response)
+        
+        with patch.object(fast_json.orjson, 'loads', wraps=fast_json.orjson.loads) as loads:
+            data = response.json()
+        
+        loads.assert_called_once_with(FakeResponse.content)
+        self.assertEqual(data['data']['NSE:INFY']['last_price'], 1500.5)
+
+
+class TestBrokerHealthMonitor(unittest.TestCase):
+    """Test broker health checks."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        from src.utils.broker_health import BrokerHealthMonitor
+        
+        self.trader = Mock()
+        self.trader.get_profile.return_value = {'user_id': 'AB1234'}
+        self.monitor = BrokerHealthMonitor(self.trader, check_interval=60)
+    
+    def test_healthy_result_is_cached(self):
+        """Test a healthy verdict is reused within the TTL."""
+        first = self.monitor.check_health()
+        second = self.monitor.check_health()
+        
+        self.assertTrue(first['is_healthy'])
+        self.assertTrue(second['is_healthy'])
+        self.assertEqual(self.trader.get_profile.call_count, 1)
+        
+        self.monitor.check_health(use_cache=False)
+        self.assertEqual(self.trader.get_profile.call_count, 2)
+    
+    def test_failure_is_not_cached(self):
+        """Test a failed probe clears the cached verdict."""
+        self.monitor.check_health()
+        self.trader.get_profile.side_effect = Exception("Connection refused")
+        
+        status = self.monitor.check_health(use_cache=False)
+        self.assertFalse(status['is_healthy'])
+        self.assertEqual(status['consecutive_failures'], 1)
+        self.assertIsNone(self.monitor._cached_result)
+        self.assertEqual(self.monitor.get_status()['recent_failures'], 1)
+    
+    def test_concurrent_checks_share_one_probe(self):
+        """Test only one get_profile() runs while others report current status."""
+        import threading
+        
+        started = threading.Event()
+        release = threading.Event()
+        
+        def slow_profile():
+            started.set()
+            release.wait(1)
+            return {'user_id': 'AB1234'}
+        
+        self.trader.get_profile.side_effect = slow_profile
+        prober = threading.Thread(target=self.monitor.check_health)
+        prober.start()
+        started.wait(1)
+        
+        status = self.monitor.check_health()
+        release.set()
+        prober.join()
+        
+        self.assertTrue(status['is_healthy'])
+        self.assertEqual(self.trader.get_profile.call_count, 1)
+
+    def test_hung_probe_times_out(self):
+        """Test a get_profile() call past probe_timeout counts as a failure."""
+        import threading
+        
+        release = threading.Event()
+        self.trader.get_profile.side_effect = lambda: release.wait(1)
+        self.monitor.probe_timeout = 0.05
+        
+        status = self.monitor.check_health()
+        release.set()
+        
+        self.assertFalse(status['is_healthy'])
+        self.assertIn('timed out', status['last_error'])
+        self.assertEqual(self.monitor.consecutive_failures, 1)
+    
+    def test_probe_recovers_after_hung_call(self):
+        """Test a still-hung earlier call does not block the next probe."""
+        import threading
+        
+        release = threading.Event()
+        self.trader.get_profile.side_effect = lambda: release.wait(1)
+        self.monitor.probe_timeout = 0.05
+        self.monitor.check_health()
+        
+        self.trader.get_profile.side_effect = None
+        status = self.monitor.check_health(use_cache=False)
+        release.set()
+        
+        self.assertTrue(status['is_healthy'])
+        self.assertEqual(self.monitor.consecutive_failures, 0)
+    
+    def test_background_probe_refreshes_status(self):
+        """Test check_health() reads the background result without probing."""
+        self.monitor.start_background_probe()
+        try:
+            deadline = time.time() + 1
+            while self.monitor.last_check_mono is None and time.time() < deadline:
+                time.sleep(0.01)
+            
+            status = self.monitor.check_health()
+        finally:
+            self.monitor.stop_background_probe(timeout=1)
+        
+        self.assertTrue(status['is_healthy'])
+        self.assertEqual(self.trader.get_profile.call_count, 1)
+        self.assertFalse(self.monitor.is_background_probe_running())
+
+
+class TestCapitalRecoveryManager(unittest.TestCase):
+    """Test capital recovery bookkeeping."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        import tempfile
+        from src.utils.capital_manager import CapitalRecoveryManager
+        
+        self.data_dir = tempfile.mkdtemp()
+        self.manager = CapitalRecoveryManager(max_initial_capital=1000.0, data_dir=self.data_dir)
+    
+    def tearDown(self):
+        """Remove the temporary history directory."""
+        import shutil
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+    
+    def test_rerecording_a_day_replaces_its_totals(self):
+        """Test a second end-of-day record for the same date replaces the first."""
+        self.manager.record_day_end(50.0, trades_count=2)
+        self.manager.record_day_end(-30.0, trades_count=1)
+        
+        history = self.manager.history
+        self.assertEqual(len(history['daily_records']), 1)
+        self.assertAlmostEqual(history['total_pnl'], -30.0)
+        self.assertEqual(history['winning_days'], 0)
+        self.assertEqual(history['losing_days'], 1)
+
+
+class TestPaperTrader(unittest.TestCase):
+    """Test paper trading bookkeeping."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        import tempfile
+        from src.paper_trading.paper_trader import PaperTrader
+        
+        self.data_dir = tempfile.mkdtemp()
+        self.trader = PaperTrader(initial_capital=100000.0, data_dir=self.data_dir)
+    
+    def tearDown(self):
+        """Remove the temporary state directory."""
+        import shutil
+        self.trader.close()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+    
+    def test_buy_sell_round_trip(self):
+        """Test capital, P&L and brokerage over a BUY/SELL round trip."""
+        buy = self.trader.execute_order('INFY', 'BUY', 10, 100.0)
+        self.assertEqual(buy['status'], 'COMPLETE')
+        self.assertAlmostEqual(self.trader.available_capital, 100000.0 - 1000.0 - 20.0)
+        self.assertEqual(self.trader.position_view('INFY')['quantity'], 10)
+        
+        sell = self.trader.execute_order('INFY', 'SELL', 10, 105.5)
+        self.assertEqual(sell['status'], 'COMPLETE')
+        
+        # ₹20 brokerage on each side
+        self.assertAlmostEqual(self.trader.available_capital, 100000.0 - 1020.0 + 1055.0 - 20.0)
+        self.assertIsNone(self.trader.position_view('INFY'))
+        
+        trade = self.trader.trade_history[-1]
+        self.assertAlmostEqual(trade['pnl'], 55.0)
+        self.assertAlmostEqual(trade['brokerage'], 20.0)
+        self.assertAlmostEqual(trade['value'], 1035.0)
+        
+        summary = self.trader.get_performance_summary()
+        self.assertEqual(summary['total_trades'], 1)
+        self.assertEqual(summary['winning_trades'], 1)
+        self.assertAlmostEqual(summary['total_profit'], 55.0)
+        self.assertEqual(summary['closed_positions'], 1)
+    
+    def test_rejects_oversized_orders(self):
+        """Test BUY beyond capital and SELL beyond holdings are rejected."""
+        self.assertEqual(self.trader.execute_order('INFY', 'BUY', 10000, 100.0)['status'], 'REJECTED')
+        self.assertEqual(self.trader.execute_order('INFY', 'SELL', 1, 100.0)['status'], 'REJECTED')
+        self.assertEqual(self.trader.execute_order('INFY', 'HOLD', 1, 100.0)['status'], 'REJECTED')
+        self.assertAlmostEqual(self.trader.available_capital, 100000.0)
+    
+    def test_state_survives_reload(self):
+        """Test saved state is restored by a new trader on the same directory."""
+        from src.paper_trading.paper_trader import PaperTrader
+        
+        self.trader.execute_order('INFY', 'BUY', 10, 100.0)
+        self.trader.execute_order('TCS', 'BUY', 4, 250.25)
+        self.trader.execute_order('INFY', 'SELL', 4, 110.0)
+        self.trader.close()
+        
+        reloaded = PaperTrader(initial_capital=100000.0, data_dir=self.data_dir)
+        try:
+            self.assertEqual(reloaded.positions, self.trader.positions)
+            self.assertAlmostEqual(reloaded.available_capital, self.trader.available_capital)
+            self.assertEqual(reloaded.total_trades, 1)
+            self.assertEqual(list(reloaded.trade_history), list(self.trader.trade_history))
+        finally:
+            reloaded.close()
+    
+    def test_reset_daily_closes_positions_and_records_stats(self):
+        """Test EOD reset force-closes positions and persists the day's stats."""
+        from src.paper_trading.paper_trader import PaperTrader
+        
+        self.trader.execute_order('INFY', 'BUY', 10, 100.0)
+        self.trader.execute_order('TCS', 'BUY', 5, 200.0)
+        self.trader.execute_order('INFY', 'SELL', 10, 102.0)
+        
+        self.trader.reset_daily({'TCS': 190.0})
+        self.trader.close()
+        
+        self.assertEqual(self.trader.positions, {})
+        self.assertEqual(self.trader.closed_count, 2)
+        self.assertAlmostEqual(self.trader.trade_history[-1]['pnl'], -50.0)
+        
+        # Day statistics are taken before the forced EOD closes
+        day = self.trader.daily_stats[-1]
+        self.assertEqual(day['trades'], 1)
+        self.assertEqual(day['wins'], 1)
+        self.assertAlmostEqual(day['pnl'], 20.0)
+        
+        reloaded = PaperTrader(initial_capital=100000.0, data_dir=self.data_dir)
+        try:
+            self.assertEqual(reloaded.positions, {})
+            self.assertEqual(reloaded.daily_stats, self.trader.daily_stats)
+        finally:
+            reloaded.close()
+    
+    def test_sell_after_mark_to_market_counts_gain_once(self):
+        """Test portfolio value after a marked-up position is sold equals cash."""
+        self.trader.execute_order('INFY', 'BUY', 10, 100.0)
+        self.assertAlmostEqual(self.trader.mark_to_market({'INFY': 110.0}), 100080.0)
+        
+        self.trader.execute_order('INFY', 'SELL', 10, 110.0)
+        
+        self.assertAlmostEqual(self.trader.available_capital, 100060.0)
+        self.assertAlmostEqual(self.trader.trade_history[-1]['portfolio_value'], 100060.0)
+    
+    def test_read_state_sees_latest_trade(self):
+        """Test the dashboard reader returns per-trade state, not the periodic snapshot."""
+        from src.paper_trading.paper_trader import PaperTrader
+        
+        self.trader.execute_order('INFY', 'BUY', 10, 100.0)
+        self.trader.flush()
+        
+        state = PaperTrader.read_state(self.data_dir, history=20)
+        
+        self.assertEqual(state['positions']['INFY']['quantity'], 10)
+        self.assertAlmostEqual(state['available_capital'], 98980.0)
+        self.assertEqual([t['type'] for t in state['trade_history']], ['BUY'])
+    
+    def test_close_writes_pending_saves_and_stops_writer(self):
+        """Test close() drains queued saves and joins the writer thread."""
+        self.trader.execute_order('INFY', 'BUY', 10, 100.0)
+        self.trader.close()
+        self.trader.close()
+        
+        self.assertFalse(self.trader._save_thread.is_alive())
+        self.assertTrue(os.path.exists(self.trader.hot_state_file))
+
 
 def run_tests():
     """Run all tests."""
@@ -389,6 +861,11 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestCostCalculator))
     suite.addTests(loader.loadTestsFromTestCase(TestOrderManager))
     suite.addTests(loader.loadTestsFromTestCase(TestPositionReconciler))
+    suite.addTests(loader.loadTestsFromTestCase(TestQuoteBatcher))
+    suite.addTests(loader.loadTestsFromTestCase(TestOrjsonResponseHook))
+    suite.addTests(loader.loadTestsFromTestCase(TestBrokerHealthMonitor))
+    suite.addTests(loader.loadTestsFromTestCase(TestCapitalRecoveryManager))
+    suite.addTests(loader.loadTestsFromTestCase(TestPaperTrader))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)